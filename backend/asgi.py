@@ -0,0 +1,216 @@
+"""
+asgi.py
+───────
+Async serving mode.  The I/O-bound routes are served natively on an event
+loop, with the async Gemini client (`client.aio`) and httpx:
+
+  POST /api/roadmap/generate     Gemini enrichment
+  POST /api/swot/analyze         Gemini
+  POST /api/github/scrape        GitHub API + Gemini
+  POST /api/resume/parse         Gemini (PyMuPDF extraction runs in a thread)
+
+An in-flight request is then a suspended coroutine rather than a blocked
+worker thread, so one process can hold hundreds of concurrent LLM calls.
+Every other route — the CPU-bound ones (skill gap, career match, grading,
+skill queries) and the streaming batch scrape — is the unchanged Flask app
+from run.py, run on a bounded thread pool (ASGI_WSGI_THREADS, default 10).
+
+Both modes share their request building and reply handling
+(services/career_advisor.py, services/resume_parser.py,
+services/repo_scraper.py), so payloads are identical.
+
+    uvicorn asgi:application --app-dir backend --host 0.0.0.0 --port 5000
+
+`python run.py` (sync Flask) keeps working as before;
+benchmarks/load_test_async.py compares the two modes.
+"""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from flask_jwt_extended import decode_token
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from run import app as flask_app, CORS_OPTIONS, pdf_upload_error, resume_response
+from services import repo_scraper
+from services.career_advisor import RoadmapJob, SwotJob
+from services.roadmap_generator import inputs_error
+from services.skill_index import skill_index
+from utils.admission import AdmissionRejected, get_admission
+from utils.genai_client import agenerate_content
+from utils.metrics import ASGIMetricsMiddleware
+
+WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '10'))
+
+
+async def _json_body(request: Request) -> dict:
+    """Like Flask's get_json(force=True) or {}; invalid JSON becomes {}."""
+    try:
+        body = await request.json()
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+def _optional_identity(request: Request) -> str | None:
+    """JWT identity from the Authorization header, if a valid one is sent."""
+    auth = request.headers.get('authorization', '')
+    if not auth.lower().startswith('bearer '):
+        return None
+    try:
+        with flask_app.app_context():
+            return decode_token(auth[7:].strip())[flask_app.config['JWT_IDENTITY_CLAIM']]
+    except Exception:
+        return None
+
+
+def _client_identity(request: Request, uid: str | None = None) -> str:
+    """Admission-control key, as run.client_identity."""
+    uid = uid or _optional_identity(request)
+    return f'user:{uid}' if uid else f'ip:{request.client.host if request.client else None}'
+
+
+async def _admission_rejected(request: Request, exc: AdmissionRejected):
+    return JSONResponse(exc.payload(), status_code=429, headers={'Retry-After': str(exc.retry_after)})
+
+
+# ----------------------------------------
+# Async routes
+# ----------------------------------------
+
+async def roadmap_generate(request: Request):
+    """Async twin of run.roadmap_generate (same body, same response)."""
+    body = await _json_body(request)
+    enrich = bool(body.get('enrich')) or request.query_params.get('enrich') == '1'
+    invalid = inputs_error(body.get('skill_results'), body.get('test_scores'))
+    if invalid:
+        return JSONResponse({'error': invalid}, status_code=400)
+    uid = _optional_identity(request)
+
+    with get_admission().admit('roadmap_enrich' if enrich else 'roadmap', _client_identity(request, uid)):
+        # Local build + stored-roadmap lookup touch storage: keep them off the loop
+        job = await asyncio.to_thread(RoadmapJob, body, uid, enrich)
+
+        if job.needs_gemini():
+            try:
+                response = await agenerate_content('roadmap', job.contents, job.system_prompt, api_key=job.api_key)
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+        return JSONResponse(await asyncio.to_thread(job.finish))
+
+
+async def swot_analyze(request: Request):
+    """Async twin of run.swot_analyze."""
+    body = await _json_body(request)
+    invalid = inputs_error(body.get('skill_results'), body.get('test_scores'))
+    if invalid:
+        return JSONResponse({'error': invalid}, status_code=400)
+    job = SwotJob(body)
+    if job.needs_gemini():
+        with get_admission().admit('swot', _client_identity(request)):
+            try:
+                response = await agenerate_content('swot', job.contents, job.system_prompt, api_key=job.api_key)
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+    return JSONResponse(job.finish())
+
+
+async def github_scrape(request: Request):
+    """Async twin of run.github_scrape_route."""
+    body = await _json_body(request)
+    url = str(body.get('url', '')).strip()
+    if not url:
+        return JSONResponse({'error': 'GitHub URL is required.'}, status_code=400)
+
+    try:
+        with get_admission().admit('github_scrape', _client_identity(request)):
+            return JSONResponse(await repo_scraper.scrape_github_repo_async(url))
+    except AdmissionRejected:
+        raise
+    except repo_scraper.RateLimitExceeded as e:
+        return JSONResponse({'error': str(e)}, status_code=429, headers={'Retry-After': str(e.retry_after)})
+    except ValueError as e:
+        return JSONResponse({'error': str(e)}, status_code=400)
+    except Exception as e:
+        return JSONResponse({'error': f'Scraping failed: {str(e)}'}, status_code=500)
+
+
+async def resume_parse(request: Request):
+    """Async twin of run.parse_resume_route."""
+    if int(request.headers.get('content-length') or 0) > flask_app.config['MAX_CONTENT_LENGTH']:
+        return JSONResponse({'error': 'File too large.'}, status_code=413)
+
+    form = await request.form()
+    file = form.get('resume')
+    if file is None or isinstance(file, str):
+        return JSONResponse({'error': "No file uploaded. Use key 'resume'."}, status_code=400)
+    if not file.filename:
+        return JSONResponse({'error': 'No file selected.'}, status_code=400)
+
+    rejected = pdf_upload_error(file.filename, file.content_type)
+    if rejected:
+        return JSONResponse(rejected, status_code=415)
+
+    try:
+        from services.resume_parser import parse_resume_async
+        pdf_bytes = await file.read()
+        uid = _optional_identity(request)
+        with get_admission().admit('resume_parse', _client_identity(request, uid)):
+            parsed = await parse_resume_async(pdf_bytes, filename=file.filename, owner=uid)
+    except ImportError:
+        return JSONResponse({'error': 'Resume parser not available. Install pymupdf: pip install pymupdf'}, status_code=500)
+    except AdmissionRejected:
+        raise
+    except Exception as exc:
+        return JSONResponse({'error': f'PDF parsing failed: {str(exc)}'}, status_code=500)
+    if uid:
+        skill_index.set_resume_skills(uid, parsed.get('skills', []))
+    return JSONResponse(resume_response(parsed))
+
+
+ASYNC_ROUTES = [
+    Route('/api/roadmap/generate', roadmap_generate, methods=['POST']),
+    Route('/api/swot/analyze',     swot_analyze,     methods=['POST']),
+    Route('/api/github/scrape',    github_scrape,    methods=['POST']),
+    Route('/api/resume/parse',     resume_parse,     methods=['POST']),
+]
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await repo_scraper.aclose()
+
+
+async_app = Starlette(
+    routes=ASYNC_ROUTES,
+    lifespan=lifespan,
+    exception_handlers={AdmissionRejected: _admission_rejected},
+    middleware=[Middleware(
+        CORSMiddleware,
+        allow_origins=CORS_OPTIONS['origins'],
+        allow_methods=CORS_OPTIONS['methods'],
+        allow_headers=CORS_OPTIONS['allow_headers'],
+    )],
+)
+wsgi_app = WSGIMiddleware(flask_app, workers=WSGI_THREADS)
+_async_paths = {route.path for route in ASYNC_ROUTES}
+# The Flask side records its own request metrics (instrument_flask in run.py)
+async_app = ASGIMetricsMiddleware(async_app, _async_paths)
+
+
+async def application(scope, receive, send):
+    """Route the async paths (and lifespan events) to Starlette, the rest to Flask."""
+    if scope['type'] == 'http' and scope['path'] not in _async_paths:
+        await wsgi_app(scope, receive, send)
+    else:
+        await async_app(scope, receive, send)
@@ -0,0 +1,344 @@
+"""
+bench_endpoints.py
+──────────────────
+Offline latency / throughput benchmark of every API endpoint.
+
+Requests go through the Flask test client in-process.  Gemini and GitHub
+are local fake servers and Firestore is the in-memory client
+(benchmarks/fakes.py), each with a configurable per-call latency.  Request
+bodies come from a seeded synthetic corpus of profiles and resume PDFs
+(benchmarks/corpus.py), so runs are repeatable.  The SQL database is an
+in-memory SQLite and the GitHub / analysis caches start empty in a temp dir.
+
+Per endpoint: p50 / p95 / p99 latency, mean, throughput and non-2xx count.
+Flask routes without a scenario here are listed at the end, so a new
+endpoint is noticed.
+
+Baselines:
+    --save [PATH]     write the results as JSON (default benchmarks/baselines/endpoints.json)
+    --compare [PATH]  compare against a saved baseline; exits 1 when an endpoint's
+                      p50 or p95 is more than --tolerance slower (and > 1 ms slower)
+
+Usage (from backend/):
+    python benchmarks/bench_endpoints.py
+    python benchmarks/bench_endpoints.py --iterations 200 --only skill_gap career_match
+    python benchmarks/bench_endpoints.py --gemini-ms 800 --github-ms 120 --firestore-ms 15
+    python benchmarks/bench_endpoints.py --compare
+"""
+
+import io
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import tempfile
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import corpus
+from fakes import FakeGemini, FakeGitHub, fake_storage
+from services.roadmap_generator import derive_skill_results
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baselines', 'endpoints.json')
+NOISE_FLOOR_MS = 1.0
+BENCH_USER = 'bench@bench.local'
+
+
+class Endpoint:
+    """One benchmarked request; `build(client, i)` returns test-client kwargs and is not timed."""
+
+    def __init__(self, name: str, method: str, path: str, build=None, auth: bool = False):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.build = build or (lambda client, i: {})
+        self.auth = auth
+
+
+# ─── Scenarios ────────────────────────────────────────────────────────────────
+
+def endpoints(ctx: dict) -> list[Endpoint]:
+    people, pdfs = ctx['profiles'], ctx['pdfs']
+    person = lambda i: people[i % len(people)]
+    run_id = ctx['run_id']
+
+    def skill_gap(client, i):
+        p = person(i)
+        return {'json': {'domain': p['domain'], 'scores': p['test_scores']}}
+
+    def simulate(client, i):
+        p = person(i)
+        grid = [{s: min(1.0, v + 0.1)} for s, v in p['test_scores'].items()] * 20
+        return {'json': {'domain': p['domain'], 'scores': p['test_scores'], 'skills': p['skills'],
+                         'interests': p['interests'], 'steps': [0.05, 0.1, 0.2], 'scenarios': grid}}
+
+    def gap_row(i):
+        p = person(i)
+        return {'domain': p['domain'], 'role': p['role'],
+                'totals': {'readiness': round(sum(p['test_scores'].values()) / len(p['test_scores']) * 100, 2),
+                           'total_gap': 0.3},
+                # /api/skill-gap/calculate rows, limited to the tested skills
+                'skill_results': {s: info for s, info in derive_skill_results(p['role'], p['test_scores']).items()
+                                  if s in p['test_scores']}}
+
+    def mcq_submit(client, i):
+        session = client.get('/api/mcq').get_json()
+        answers = [q['options'][i % len(q['options'])] for q in session['questions']]
+        return {'json': {'session_id': session['session_id'], 'answers': answers}}
+
+    def user_test(client, i):
+        p = person(i)
+        return {'query_string': {'domain': p['domain'], 'skills': ','.join(p['test_scores'])}}
+
+    def roadmap(client, i, enrich=False):
+        p = person(i)
+        body = {'role': p['role'], 'test_scores': p['test_scores'],
+                'profile': {'name': p['name'], 'skills': p['skills']}}
+        return {'json': {**body, 'enrich': True} if enrich else body}
+
+    def roadmap_update(client, i):
+        # Same student retaking one skill: the stored roadmap is updated incrementally
+        p = person(0)
+        scores = dict(p['test_scores'])
+        skill = sorted(scores)[i % len(scores)]
+        scores[skill] = round((scores[skill] + 0.37) % 1, 2)
+        return {'json': {'role': p['role'], 'test_scores': scores}}
+
+    def career_match(client, i):
+        p = person(i)
+        return {'json': {'skills': p['skills'], 'interests': p['interests'], 'test_scores': p['test_scores']}}
+
+    def career_match_revalidate(client, i):
+        # Client already holds the response: answered 304 from the ETag
+        kwargs = career_match(client, i)
+        etag = client.post('/api/career/match', **kwargs).headers['ETag']
+        return {**kwargs, 'headers': {'If-None-Match': etag}}
+
+    def swot(client, i):
+        p = person(i)
+        return {'json': {'profile': {'name': p['name'], 'domain': p['domain'], 'role': p['role'], 'skills': p['skills']},
+                         'skill_results': gap_row(i)['skill_results'], 'totals': gap_row(i)['totals']}}
+
+    def resume(client, i):
+        name, data = pdfs[i % len(pdfs)]
+        return {'data': {'resume': (io.BytesIO(data), name, 'application/pdf')},
+                'content_type': 'multipart/form-data'}
+
+    def skills_query(client, i):
+        p = person(i)
+        return {'json': {'has': list(p['test_scores'])[:2], 'readiness': {'min': 20}, 'limit': 20}}
+
+    return [
+        Endpoint('health',             'GET',  '/api/health'),
+        Endpoint('health_ready',       'GET',  '/api/health/ready'),
+        Endpoint('metrics',            'GET',  '/api/metrics'),
+        Endpoint('mcq',                'GET',  '/api/mcq'),
+        Endpoint('mcq_user_test',      'GET',  '/api/mcq/user-test', user_test),
+        Endpoint('mcq_submit',         'POST', '/api/mcq/submit', mcq_submit),
+        Endpoint('skill_gap',          'POST', '/api/skill-gap/calculate', skill_gap),
+        Endpoint('skill_gap_simulate', 'POST', '/api/skill-gap/simulate', simulate),
+        Endpoint('career_match',       'POST', '/api/career/match', career_match),
+        Endpoint('career_match_304',   'POST', '/api/career/match', career_match_revalidate),
+        Endpoint('roadmap_local',      'POST', '/api/roadmap/generate', roadmap),
+        Endpoint('roadmap_enrich',     'POST', '/api/roadmap/generate', lambda c, i: roadmap(c, i, enrich=True)),
+        Endpoint('roadmap_update',     'POST', '/api/roadmap/generate', roadmap_update, auth=True),
+        Endpoint('swot',               'POST', '/api/swot/analyze', swot),
+        Endpoint('resume_parse',       'POST', '/api/resume/parse', resume),
+        Endpoint('github_scrape',      'POST', '/api/github/scrape',
+                 lambda c, i: {'json': {'url': f'https://github.com/{run_id}/repo-{i}'}}),
+        Endpoint('github_scrape_batch', 'POST', '/api/github/scrape-batch',
+                 lambda c, i: {'json': {'username': f'{run_id}-user{i}'}}),
+        Endpoint('history_record',     'POST', '/api/history/gaps', lambda c, i: {'json': {'rows': [gap_row(i)]}}, auth=True),
+        Endpoint('history_progress',   'GET',  '/api/history/gaps/progress', auth=True),
+        Endpoint('history_latest',     'GET',  '/api/history/gaps/latest', auth=True),
+        Endpoint('skills_query',       'POST', '/api/skills/query', skills_query, auth=True),
+        Endpoint('skills_index_stats', 'GET',  '/api/skills/index/stats', auth=True),
+    ]
+
+
+# ─── Runner ───────────────────────────────────────────────────────────────────
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return float('nan')
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))]
+
+
+def _one(app, endpoint: Endpoint, i: int, headers: dict) -> tuple[float, int]:
+    client = app.test_client()
+    kwargs = endpoint.build(client, i)
+    if endpoint.auth:
+        kwargs['headers'] = {**kwargs.get('headers', {}), **headers}
+    started = time.perf_counter()
+    resp = client.open(endpoint.path, method=endpoint.method, **kwargs)
+    resp.get_data()   # drain streamed responses inside the timing
+    elapsed = (time.perf_counter() - started) * 1000
+    resp.close()
+    return elapsed, resp.status_code
+
+
+def run_endpoint(app, endpoint: Endpoint, iterations: int, warmup: int, concurrency: int, headers: dict) -> dict:
+    for i in range(warmup):
+        _one(app, endpoint, iterations + i, headers)
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda i: _one(app, endpoint, i, headers), range(iterations)))
+    else:
+        results = [_one(app, endpoint, i, headers) for i in range(iterations)]
+
+    latencies = sorted(ms for ms, _ in results)
+    mean = sum(latencies) / len(latencies)
+    return {
+        'n':       iterations,
+        'p50_ms':  round(_percentile(latencies, 0.50), 3),
+        'p95_ms':  round(_percentile(latencies, 0.95), 3),
+        'p99_ms':  round(_percentile(latencies, 0.99), 3),
+        'mean_ms': round(mean, 3),
+        # Little's law over the timed requests only (untimed setup calls excluded)
+        'rps':     round(concurrency * 1000 / mean, 2),
+        'errors':  sum(1 for _, status in results if status >= 400),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Human-readable regressions of `results` against a saved baseline."""
+    regressions = []
+    for name, current in results['endpoints'].items():
+        base = baseline.get('endpoints', {}).get(name)
+        if not base:
+            continue
+        for key in ('p50_ms', 'p95_ms'):
+            limit = base[key] * (1 + tolerance)
+            if current[key] > limit and current[key] - base[key] > NOISE_FLOOR_MS:
+                regressions.append(f'{name}: {key} {base[key]:.2f} -> {current[key]:.2f} ms '
+                                   f'(+{(current[key] / base[key] - 1) * 100:.0f}%)')
+        if current['errors'] > base.get('errors', 0):
+            regressions.append(f"{name}: errors {base.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def _configure_env(gemini: FakeGemini, github: FakeGitHub, cache_dir: str) -> None:
+    os.environ.update({
+        'DATABASE_URL':        'sqlite://',
+        'STORAGE_BACKEND':     'memory',
+        'GEMINI_API_KEY':      'offline-benchmark',
+        'GEMINI_BASE_URL':     gemini.url,
+        'GITHUB_API_URL':      github.url,
+        'HTTP_CACHE_PATH':     os.path.join(cache_dir, 'http_cache.db'),
+        'ANALYSIS_CACHE_PATH': os.path.join(cache_dir, 'analysis_cache.db'),
+        'RESUME_PAGES_PATH':   os.path.join(cache_dir, 'resume_pages.db'),
+        'WARMUP':              '0',
+        'ADMISSION_CONTROL':   '0',   # measure the routes, not the rate limiter
+    })
+    os.environ.setdefault('JWT_SECRET_KEY', 'offline-benchmark-jwt-secret-0123456789')
+    os.environ.pop('GITHUB_TOKEN', None)
+    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50, help='timed requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=3, help='untimed requests per endpoint first')
+    parser.add_argument('--concurrency', type=int, default=1, help='client threads per endpoint')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='run only these endpoints')
+    parser.add_argument('--gemini-ms', type=float, default=50.0, help='fake Gemini latency per call')
+    parser.add_argument('--github-ms', type=float, default=10.0, help='fake GitHub latency per call')
+    parser.add_argument('--firestore-ms', type=float, default=2.0, help='fake Firestore latency per round trip')
+    parser.add_argument('--corpus', type=int, default=40, help='synthetic profiles / resumes')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE, metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before a regression')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    gemini = FakeGemini(args.gemini_ms / 1000).start()
+    github = FakeGitHub(args.github_ms / 1000).start()
+    cache_dir = tempfile.mkdtemp(prefix='skillbridge-bench-')
+    _configure_env(gemini, github, cache_dir)
+
+    from flask_jwt_extended import create_access_token
+    from run import app, db
+    from storage import set_storage
+
+    set_storage(fake_storage(args.firestore_ms / 1000))
+    with app.app_context():
+        db.create_all()
+        # The bench user is also a placement officer, for the /api/skills routes
+        token = create_access_token(identity=BENCH_USER, additional_claims={'role': 'placement_officer'})
+        headers = {'Authorization': f'Bearer {token}'}
+
+    ctx = {
+        'profiles': corpus.profiles(args.corpus, args.seed),
+        'pdfs':     corpus.resume_pdfs(args.corpus, args.seed),
+        'run_id':   f'bench{int(time.time())}',
+    }
+    scenarios = endpoints(ctx)
+    if args.only:
+        unknown = set(args.only) - {e.name for e in scenarios}
+        if unknown:
+            parser.error(f"unknown endpoint(s): {', '.join(sorted(unknown))}")
+        scenarios = [e for e in scenarios if e.name in args.only]
+
+    print(f"{args.iterations} requests per endpoint, concurrency {args.concurrency}; fake latency: "
+          f"gemini {args.gemini_ms:g} ms, github {args.github_ms:g} ms, firestore {args.firestore_ms:g} ms\n")
+    print(f"{'endpoint':<22}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'mean ms':>9}{'req/s':>9}{'errors':>8}")
+
+    results = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'machine': {'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count()},
+        'config':  {'iterations': args.iterations, 'concurrency': args.concurrency, 'gemini_ms': args.gemini_ms,
+                    'github_ms': args.github_ms, 'firestore_ms': args.firestore_ms, 'corpus': args.corpus,
+                    'seed': args.seed},
+        'endpoints': {},
+    }
+    try:
+        for endpoint in scenarios:
+            r = run_endpoint(app, endpoint, args.iterations, args.warmup, args.concurrency, headers)
+            results['endpoints'][endpoint.name] = r
+            print(f"{endpoint.name:<22}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+                  f"{r['mean_ms']:>9.2f}{r['rps']:>9.1f}{r['errors']:>8}")
+    finally:
+        gemini.stop()
+        github.stop()
+
+    adapter = app.url_map.bind('localhost')
+    covered = {adapter.match(e.path, method=e.method, return_rule=True)[0].rule for e in endpoints(ctx)}
+    uncovered = sorted({rule.rule for rule in app.url_map.iter_rules()
+                        if rule.rule.startswith('/api/') and rule.rule not in covered})
+    if uncovered and not args.only:
+        print(f"\nroutes without a scenario: {', '.join(uncovered)}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print(f'\nbaseline saved to {args.save}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('config') != results['config']:
+            print(f"\nnote: baseline was recorded with a different config: {baseline.get('config')}")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) against {args.compare}:')
+            for line in regressions:
+                print(f'  {line}')
+            sys.exit(1)
+        print(f'\nno regressions against {args.compare} (tolerance {args.tolerance:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+bench_password_hashing.py
+─────────────────────────
+Logins per second per core for the password-hashing pool.
+
+Runs `verify()` (the CPU cost of one login) through PasswordHasher with an
+increasing number of workers and reports total and per-worker throughput,
+plus the inline single-thread baseline the routes used before.
+
+Usage (from backend/):
+    python benchmarks/bench_password_hashing.py
+    python benchmarks/bench_password_hashing.py --method pbkdf2:sha256:600000 --logins 64
+"""
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash, check_password_hash
+from utils.password_pool import PasswordHasher
+
+
+def _run(hasher: PasswordHasher, pw_hash: str, logins: int) -> float:
+    """Fire `logins` concurrent verifications and return logins/sec."""
+    start = time.perf_counter()
+    # Enough client threads to keep every worker busy
+    with ThreadPoolExecutor(max_workers=hasher.workers * 2) as clients:
+        results = list(clients.map(lambda _: hasher.verify(pw_hash, 'Passw0rd!'), range(logins)))
+    elapsed = time.perf_counter() - start
+    assert all(results)
+    return logins / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--method', default=os.getenv('PASSWORD_HASH_METHOD', 'scrypt'))
+    parser.add_argument('--logins', type=int, default=32)
+    args = parser.parse_args()
+
+    pw_hash = generate_password_hash('Passw0rd!', method=args.method)
+    cores = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    for _ in range(args.logins // 4 or 1):
+        check_password_hash(pw_hash, 'Passw0rd!')
+    inline = (args.logins // 4 or 1) / (time.perf_counter() - start)
+
+    print(f"method={pw_hash.split('$', 1)[0]}  cores={cores}  logins/run={args.logins}")
+    print(f"{'mode':<14}{'workers':>8}{'logins/s':>12}{'per worker':>12}")
+    print(f"{'inline':<14}{1:>8}{inline:>12.1f}{inline:>12.1f}")
+
+    workers = 1
+    while workers <= cores:
+        hasher = PasswordHasher(method=args.method, workers=workers, max_queue=args.logins)
+        rate = _run(hasher, pw_hash, args.logins)
+        print(f"{'pool':<14}{workers:>8}{rate:>12.1f}{rate / workers:>12.1f}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+bench_resume_incremental.py
+───────────────────────────
+Cost of re-parsing a resume after a one-word fix on one page: a full parse
+versus the page-level incremental parse (services/resume_parser.py), which
+reuses the pages unchanged since the student's last upload.
+
+For each trial a multi-page resume from the benchmark corpus is uploaded,
+then one word on one page is corrected and the PDF re-uploaded.  Gemini is
+the fake from benchmarks/fakes.py.  Reported:
+
+  • latency of the re-upload parse (extraction + fake Gemini round trip)
+  • pages re-extracted with PyMuPDF and Gemini calls per re-upload
+  • resume text sent to Gemini (approx. tokens = chars / 4)
+
+Usage (from backend/):
+    python benchmarks/bench_resume_incremental.py
+    python benchmarks/bench_resume_incremental.py --trials 100 --gemini-ms 800
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import _resume_lines, profiles
+from benchmarks.fakes import FakeGemini
+
+LINES_PER_PAGE = 18
+
+
+class _CountingGemini(FakeGemini):
+    def __init__(self, latency: float):
+        super().__init__(latency)
+        self.prompt_chars = 0
+
+    def respond(self, path, headers, body):
+        text = json.loads(body)['contents'][0]['parts'][0]['text']
+        self.prompt_chars += len(text[text.find('Resume Pages:'):])
+        return super().respond(path, headers, body)
+
+
+def _pdf(lines: list[str]) -> bytes:
+    from services.resume_parser import load_pymupdf
+    doc = load_pymupdf().open()
+    for start in range(0, len(lines), LINES_PER_PAGE):
+        doc.new_page().insert_text((50, 60), '\n'.join(lines[start:start + LINES_PER_PAGE]), fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _typo_fix(lines: list[str], rng: random.Random) -> list[str]:
+    """Change one word in one line with some text."""
+    edited = list(lines)
+    n = rng.choice([i for i, line in enumerate(lines) if len(line.split()) > 2])
+    words = edited[n].split(' ')
+    k = rng.randrange(len(words))
+    words[k] = words[k][::-1] if len(words[k]) > 1 else words[k] + 's'
+    edited[n] = ' '.join(words)
+    return edited
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trials', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--gemini-ms', type=float, default=200, help='fake Gemini response time')
+    args = parser.parse_args()
+
+    gemini = _CountingGemini(args.gemini_ms / 1000).start()
+    os.environ.update(
+        GEMINI_API_KEY='bench-key',
+        GEMINI_BASE_URL=f'http://127.0.0.1:{gemini._server.server_address[1]}',
+        RESUME_PAGES_PATH=os.path.join(tempfile.mkdtemp(prefix='skillbridge-bench-'), 'resume_pages.db'),
+        SINGLE_FLIGHT='0',
+    )
+    import services.resume_parser as resume_parser
+
+    extracted = []
+    page_text = resume_parser._page_text
+    resume_parser._page_text = lambda page: extracted.append(1) or page_text(page)
+
+    def timed(pdf_bytes, owner):
+        extracted.clear()
+        calls, chars = gemini.requests, gemini.prompt_chars
+        started = time.perf_counter()
+        resume_parser.parse_resume(pdf_bytes=pdf_bytes, owner=owner)
+        return ((time.perf_counter() - started) * 1000, len(extracted),
+                gemini.requests - calls, (gemini.prompt_chars - chars) // 4)
+
+    rng = random.Random(args.seed)
+    full, incr, pages = [], [], []
+    for i, profile in enumerate(profiles(args.trials, args.seed)):
+        lines = _resume_lines(profile, rng)
+        original, edited = _pdf(lines), _pdf(_typo_fix(lines, rng))
+        pages.append(-(-len(lines) // LINES_PER_PAGE))
+        owner = f'bench-{i}'
+        timed(original, owner)                       # first upload stores the pages
+        full.append(timed(edited, None))
+        incr.append(timed(edited, owner))
+    gemini.stop()
+
+    def row(label, k, fmt):
+        f, n = statistics.mean(r[k] for r in full), statistics.mean(r[k] for r in incr)
+        ratio = f'{f / n:5.1f}x' if n else '    –'
+        print(f'{label:<28}{fmt.format(f):>12}{fmt.format(n):>14}{ratio:>10}')
+
+    print(f'{args.trials} re-uploads with one word fixed, {statistics.mean(pages):.1f} pages on average, '
+          f'fake Gemini {args.gemini_ms:.0f} ms\n')
+    print(f'{"":<28}{"full":>12}{"incremental":>14}{"saving":>10}')
+    row('re-upload latency (ms)', 0, '{:.1f}')
+    row('pages re-extracted', 1, '{:.2f}')
+    row('Gemini calls', 2, '{:.2f}')
+    row('resume tokens sent', 3, '{:.0f}')
+    print(f'\nre-uploads skipping Gemini: {sum(1 for r in incr if r[2] == 0)}/{args.trials}')
+
+
+if __name__ == '__main__':
+    main()
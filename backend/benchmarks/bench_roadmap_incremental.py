@@ -0,0 +1,91 @@
+"""
+bench_roadmap_incremental.py
+────────────────────────────
+Cost of refreshing a roadmap after a single skill retake: full regeneration
+versus update_roadmap(), which rebuilds only the phases whose skills changed.
+
+For each trial a student gets random test scores for a role, a roadmap is
+generated, then one tested skill is retaken with a new score.  Reported:
+
+  • local latency of generate_roadmap() vs update_roadmap()
+  • phases rebuilt per update
+  • the phase payload an enrichment pass sends to Gemini and gets back
+    (approx. tokens = chars / 4; the student-context block is the same
+    either way and is left out)
+
+Usage (from backend/):
+    python benchmarks/bench_roadmap_incremental.py
+    python benchmarks/bench_roadmap_incremental.py --trials 500
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.roadmap_generator import generate_roadmap, update_roadmap
+from utils.data_loader import load_data
+
+ROLES = ['data scientist', 'web developer', 'ai engineer', 'software engineer', 'data analyst']
+
+
+def _tokens(phases: list) -> int:
+    payload = [{k: v for k, v in p.items() if k != 'skill_keys'} for p in phases]
+    return len(json.dumps(payload, ensure_ascii=False)) // 4
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--trials', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    benchmarks = {b['role'].lower(): list(b['skills']) for b in load_data('skill_gap_benchmark.json')}
+    roles = [r for r in ROLES if r in benchmarks] or list(benchmarks)
+    full_ms, incr_ms, rebuilt, full_tok, incr_tok = [], [], [], [], []
+
+    for _ in range(args.trials):
+        role = rng.choice(roles)
+        skills = [s.lower() for s in benchmarks[role]]
+        scores = {s: round(rng.random(), 2) for s in skills}
+        previous = generate_roadmap(role, test_scores=scores)
+
+        retake = rng.choice(skills)
+        scores = {**scores, retake: round(rng.random(), 2)}
+
+        full, ms = _timed(generate_roadmap, role, None, scores)
+        full_ms.append(ms)
+        full_tok.append(_tokens(full['phases']))
+
+        (roadmap, regenerated), ms = _timed(update_roadmap, previous, role, None, scores)
+        incr_ms.append(ms)
+        rebuilt.append(len(regenerated))
+        incr_tok.append(_tokens([p for p in roadmap['phases'] if p['phase_number'] in regenerated]))
+
+    def row(label, full_vals, incr_vals, fmt):
+        f, i = statistics.mean(full_vals), statistics.mean(incr_vals)
+        ratio = f'{f / i:5.1f}x' if i else '    –'
+        print(f'{label:<28}{fmt.format(f):>12}{fmt.format(i):>14}{ratio:>10}')
+
+    print(f'{args.trials} single-skill retakes\n')
+    print(f'{"":<28}{"full":>12}{"incremental":>14}{"saving":>10}')
+    row('local latency (ms)', full_ms, incr_ms, '{:.3f}')
+    row('phases rebuilt', [4.0] * len(rebuilt), rebuilt, '{:.2f}')
+    row('enrichment tokens (each way)', full_tok, incr_tok, '{:.0f}')
+    print(f'\nupdates needing no rebuild: {sum(1 for n in rebuilt if n == 0)}/{args.trials}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+bench_skill_query.py
+────────────────────
+Placement-query latency of the skill inverted index.
+
+Builds a synthetic population (resume skills, test scores, readiness),
+checks a few queries against a brute-force scan of the same profiles, and
+reports per-query latency for the index versus the scan.
+
+Usage (from backend/):
+    python benchmarks/bench_skill_query.py
+    python benchmarks/bench_skill_query.py --students 50000 --repeat 200
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.skill_index import SkillIndex, KNOWN_SCORE
+
+SKILLS = [
+    'python', 'sql', 'statistics', 'pandas', 'numpy', 'machine learning', 'react', 'javascript',
+    'typescript', 'html and css', 'docker', 'kubernetes', 'aws', 'git', 'linux', 'java', 'c++',
+    'system design', 'tableau', 'power bi', 'deep learning', 'mlops', 'rest api design', 'testing',
+]
+
+QUERIES = [
+    dict(has=['python', 'sql'], missing=['statistics'], min_readiness=60),
+    dict(has=['react'], any_of=['typescript', 'javascript'], rank_by='react'),
+    dict(missing=['git'], max_readiness=40),
+    dict(has=['python', 'pandas', 'numpy', 'machine learning'], min_readiness=75, rank_by='python'),
+]
+
+
+def _population(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    people = []
+    for i in range(n):
+        people.append({
+            'uid':       f'student{i}@uni.edu',
+            'skills':    rng.sample(SKILLS, rng.randint(3, 10)),
+            'scores':    {s: round(rng.random(), 2) for s in rng.sample(SKILLS, rng.randint(0, 6))},
+            'readiness': round(rng.uniform(0, 100), 2),
+        })
+    return people
+
+
+def _scan(people, has=(), missing=(), any_of=(), min_readiness=None, max_readiness=None,
+          rank_by='readiness', limit=20):
+    """What answering the query costs without the index: look at every profile."""
+    hits = []
+    for p in people:
+        known = set(p['skills']) | {s for s, v in p['scores'].items() if v >= KNOWN_SCORE}
+        if not all(s in known for s in has) or any(s in known for s in missing):
+            continue
+        if any_of and not any(s in known for s in any_of):
+            continue
+        if min_readiness is not None and p['readiness'] < min_readiness:
+            continue
+        if max_readiness is not None and p['readiness'] > max_readiness:
+            continue
+        hits.append(p)
+    key = (lambda p: p['readiness']) if rank_by == 'readiness' else (lambda p: p['scores'].get(rank_by, -1))
+    hits.sort(key=key, reverse=True)
+    return len(hits), hits[:limit]
+
+
+def _time(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--students', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=100)
+    args = parser.parse_args()
+
+    people = _population(args.students)
+    index = SkillIndex()
+    start = time.perf_counter()
+    for p in people:
+        index.set_resume_skills(p['uid'], p['skills'])
+        index.set_test_scores(p['uid'], p['scores'])
+        index.set_readiness(p['uid'], p['readiness'])
+    build_s = time.perf_counter() - start
+
+    stats = index.stats()
+    print(f"students={stats['students']}  skills={stats['skills']}  "
+          f"index={stats['index_bytes'] / 1024:.0f} KiB  build={build_s:.2f}s "
+          f"({build_s / args.students * 1e6:.0f} µs/profile)\n")
+    print(f"{'query':<72}{'hits':>7}{'index ms':>10}{'scan ms':>10}")
+
+    for q in QUERIES:
+        got = index.query(**q)
+        total, expected = _scan(people, **q)
+        assert got['total'] == total, (q, got['total'], total)
+        rank_key = q.get('rank_by', 'readiness')
+        if rank_key == 'readiness':
+            assert [r['readiness'] for r in got['results']] == [p['readiness'] for p in expected], q
+        index_ms = _time(lambda: index.query(**q), args.repeat)
+        scan_ms = _time(lambda: _scan(people, **q), max(1, args.repeat // 20))
+        label = ', '.join(f"{k}={v}" for k, v in q.items())
+        print(f"{label[:70]:<72}{total:>7}{index_ms:>10.3f}{scan_ms:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+corpus.py
+─────────
+Synthetic, seeded inputs for the endpoint benchmarks:
+
+  resume_pdfs()   one- to three-page resume PDFs written with PyMuPDF
+                  (contact line, skills, experience, projects, education)
+  profiles()      student profiles drawn from data/skill_gap_benchmark.json:
+                  domain, role, resume skills, interests and test scores
+
+The same seed always produces the same corpus.  Write it out for
+inspection with:
+    python benchmarks/corpus.py --out /tmp/skillbridge-corpus
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_loader import load_data
+
+FIRST_NAMES = ['Aarav', 'Diya', 'Kabir', 'Meera', 'Rohan', 'Sara', 'Vihaan', 'Anaya', 'Ishaan', 'Tara']
+LAST_NAMES = ['Patil', 'Sharma', 'Kulkarni', 'Iyer', 'Deshmukh', 'Nair', 'Joshi', 'Rao']
+COMPANIES = ['Acme Analytics', 'Northwind Labs', 'Globex Systems', 'Initech', 'Umbrella Data']
+EXTRA_SKILLS = ['git', 'linux', 'docker', 'rest apis', 'agile', 'communication', 'excel']
+
+
+def _benchmarks() -> list[dict]:
+    return load_data('skill_gap_benchmark.json')
+
+
+def profiles(count: int, seed: int = 42) -> list[dict]:
+    """Student profiles; `test_scores` covers a random subset of the role's skills."""
+    rng = random.Random(seed)
+    benchmarks = _benchmarks()
+    out = []
+    for i in range(count):
+        bench = rng.choice(benchmarks)
+        role_skills = [s.lower() for s in bench['skills']]
+        known = rng.sample(role_skills, rng.randint(1, len(role_skills)))
+        tested = rng.sample(role_skills, rng.randint(max(1, len(role_skills) // 2), len(role_skills)))
+        out.append({
+            'name':        f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'email':       f'student{i}@bench.local',
+            'domain':      bench['domain'].lower(),
+            'role':        bench['role'].lower(),
+            'skills':      known + rng.sample(EXTRA_SKILLS, rng.randint(0, 3)),
+            'interests':   [bench['domain'].lower()] + rng.sample([b['domain'].lower() for b in benchmarks], 1),
+            'test_scores': {s: round(rng.random(), 2) for s in tested},
+        })
+    return out
+
+
+def _resume_lines(profile: dict, rng: random.Random) -> list[str]:
+    lines = [profile['name'], f"{profile['email']} | +91 98{rng.randint(10000000, 99999999)} | Pune, India", '',
+             'SKILLS', ', '.join(s.title() for s in profile['skills']), '', 'EXPERIENCE']
+    for _ in range(rng.randint(1, 4)):
+        year = rng.randint(2019, 2024)
+        lines += [f"{profile['role'].title()} Intern - {rng.choice(COMPANIES)} (Jun {year} - Aug {year})"]
+        lines += [f"- Worked with {', '.join(rng.sample(profile['skills'], min(3, len(profile['skills']))))} "
+                  f"on production features and reporting." for _ in range(rng.randint(2, 5))]
+    lines += ['', 'PROJECTS']
+    for n in range(rng.randint(2, 6)):
+        lines += [f"Project {n + 1}: {profile['domain'].title()} toolkit",
+                  f"- Built with {', '.join(rng.sample(profile['skills'], min(2, len(profile['skills']))))}; "
+                  f"deployed with Docker and documented on GitHub."]
+    lines += ['', 'EDUCATION', 'B.E. Computer Engineering, Savitribai Phule Pune University, 2025']
+    return lines
+
+
+def resume_pdfs(count: int, seed: int = 42) -> list[tuple[str, bytes]]:
+    """(filename, PDF bytes) pairs; long resumes spill onto extra pages."""
+    from services.resume_parser import load_pymupdf
+    pymupdf = load_pymupdf()
+    rng = random.Random(seed)
+    out = []
+    for i, profile in enumerate(profiles(count, seed)):
+        doc = pymupdf.open()
+        lines = _resume_lines(profile, rng)
+        per_page = 48
+        for start in range(0, len(lines), per_page):
+            page = doc.new_page()
+            page.insert_text((50, 60), '\n'.join(lines[start:start + per_page]), fontsize=10)
+        out.append((f'resume_{i:03d}.pdf', doc.tobytes()))
+        doc.close()
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', required=True, help='directory to write the corpus to')
+    parser.add_argument('--count', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, data in resume_pdfs(args.count, args.seed):
+        with open(os.path.join(args.out, name), 'wb') as f:
+            f.write(data)
+    with open(os.path.join(args.out, 'profiles.json'), 'w', encoding='utf-8') as f:
+        json.dump(profiles(args.count, args.seed), f, indent=2)
+    print(f'wrote {args.count} resumes and profiles.json to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,215 @@
+"""
+fakes.py
+────────
+Deterministic local stand-ins for the external services, for the offline
+benchmarks:
+
+  FakeGemini     HTTP server answering POST …/models/<model>:generateContent
+                 (point GEMINI_BASE_URL at .url).  The reply is picked from
+                 the prompt — resume JSON, roadmap phases, SWOT JSON or a
+                 plain-text repo analysis — so every route runs its normal
+                 success path.
+  FakeGitHub     HTTP server for the REST calls repo_scraper makes (repo,
+                 languages, README, user repo listing), with ETags and 304s
+                 (point GITHUB_API_URL at .url).
+  fake_storage   FirestoreStorage over utils.memory_firestore.InMemoryFirestore
+                 with a per-round-trip latency.
+
+Each server sleeps `latency` seconds per request on its own thread, so
+concurrent calls overlap like they do against the real services.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class _FakeServer:
+    """ThreadingHTTPServer on 127.0.0.1:<free port>, served from a daemon thread."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True   # header and body go out as separate writes
+
+            def do_GET(self):
+                fake._handle(self, None)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                fake._handle(self, self.rfile.read(length) if length else b'')
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}'
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> '_FakeServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler, body: bytes | None) -> None:
+        with self._count_lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        status, headers, payload = self.respond(handler.path, dict(handler.headers), body)
+        if not isinstance(payload, bytes):
+            payload = (payload if isinstance(payload, str) else json.dumps(payload)).encode()
+        handler.send_response(status)
+        for key, value in headers.items():
+            handler.send_header(key, value)
+        handler.send_header('Content-Length', str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def respond(self, path: str, headers: dict, body: bytes | None):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ─── Gemini ───────────────────────────────────────────────────────────────────
+
+RESUME_REPLY = {
+    'skills': ['Python', 'SQL', 'Pandas', 'Machine Learning', 'Docker'],
+    'experience': [{'title': 'Data Intern', 'company': 'Acme Analytics', 'duration': 'Jun 2024 - Aug 2024',
+                    'description': 'Built reporting pipelines in Python and SQL.'}],
+    'projects': [{'name': 'Churn Predictor', 'technologies': ['Python', 'scikit-learn'],
+                  'description': 'Gradient-boosted churn model with a Flask API.'}],
+}
+
+# Strengths / weaknesses are computed locally; the model only adds these two quadrants
+SWOT_REPLY = {
+    key: [{'title': f'{key.title()} {i}', 'explanation': 'Deterministic benchmark reply.'} for i in range(1, 4)]
+    for key in ('opportunities', 'threats')
+}
+
+ROADMAP_REPLY = {
+    'summary': 'Benchmark roadmap summary.',
+    'phases': [{
+        'phase_number': n,
+        'title': f'Phase {n}',
+        'goals': ['Goal one', 'Goal two'],
+        'projects': [{'name': f'Project {n}', 'description': 'Build it.', 'tech_stack': ['python']}],
+        'resources': [{'title': 'Official docs', 'type': 'docs', 'url_or_platform': 'docs.python.org'}],
+    } for n in range(1, 9)],
+}
+
+ANALYSIS_REPLY = 'A small Python web service with tests; shows working knowledge of REST APIs and packaging.'
+
+
+class FakeGemini(_FakeServer):
+    """generateContent endpoint; the reply shape follows the system instruction / prompt."""
+
+    def respond(self, path, headers, body):
+        request = json.loads(body or b'{}')
+        prompt = json.dumps(request.get('systemInstruction', '')) + json.dumps(request.get('contents', ''))
+        if 'resume parser' in prompt:
+            # One fragment per page sent; the first page carries the whole fixture
+            pages = re.findall(r'--- Page (\d+) ---', prompt) or ['1']
+            text = json.dumps({'pages': {n: RESUME_REPLY if k == 0 else {'skills': [f'Skill from page {n}']}
+                                         for k, n in enumerate(pages)}})
+        elif 'career guide' in prompt:
+            text = json.dumps(ROADMAP_REPLY)
+        elif 'SWOT' in prompt:
+            text = json.dumps(SWOT_REPLY)
+        else:
+            text = ANALYSIS_REPLY
+        return 200, {'Content-Type': 'application/json'}, {
+            'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'finishReason': 'STOP'}],
+            'usageMetadata': {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': len(text) // 4},
+        }
+
+
+# ─── GitHub ───────────────────────────────────────────────────────────────────
+
+_LANGUAGES = ['Python', 'JavaScript', 'TypeScript', 'Go', 'Java']
+_TOPICS = ['flask', 'react', 'docker', 'machine-learning', 'fastapi', 'postgresql', 'pandas']
+
+
+class FakeGitHub(_FakeServer):
+    """Repo metadata, languages, README and user listings, derived from the names."""
+
+    def __init__(self, latency: float = 0.0, repos_per_user: int = 6, readme_chars: int = 6000):
+        super().__init__(latency)
+        self.repos_per_user = repos_per_user
+        self.readme_chars = readme_chars
+
+    @staticmethod
+    def _seed(*parts) -> int:
+        return int(hashlib.sha1('/'.join(parts).encode()).hexdigest()[:8], 16)
+
+    def repo(self, owner: str, name: str) -> dict:
+        seed = self._seed(owner, name)
+        return {
+            'name': name, 'full_name': f'{owner}/{name}', 'owner': {'login': owner},
+            'html_url': f'https://github.com/{owner}/{name}', 'fork': False,
+            'description': f'{name} — benchmark fixture repository',
+            'language': _LANGUAGES[seed % len(_LANGUAGES)],
+            'topics': [_TOPICS[(seed >> i) % len(_TOPICS)] for i in range(3)],
+            'stargazers_count': seed % 500,
+            'pushed_at': '2025-01-15T10:00:00Z',
+        }
+
+    def respond(self, path, headers, body):
+        parts = [p for p in urlsplit(path).path.split('/') if p]
+        json_headers = {'Content-Type': 'application/json', 'X-RateLimit-Limit': '5000',
+                        'X-RateLimit-Remaining': '4999', 'X-RateLimit-Reset': str(int(time.time()) + 3600)}
+
+        if len(parts) == 3 and parts[0] == 'users' and parts[2] == 'repos':
+            payload = [self.repo(parts[1], f'project-{i}') for i in range(self.repos_per_user)]
+        elif len(parts) >= 3 and parts[0] == 'repos':
+            owner, name, rest = parts[1], parts[2], parts[3:]
+            if not rest:
+                payload = self.repo(owner, name)
+            elif rest == ['languages']:
+                seed = self._seed(owner, name)
+                payload = {_LANGUAGES[(seed + i) % len(_LANGUAGES)]: 10000 // (i + 1) for i in range(3)}
+            elif rest == ['readme']:
+                line = f'# {name}\n\nSetup: pip install -r requirements.txt, then run the Flask app.\n'
+                payload = (line * (self.readme_chars // len(line) + 1))[:self.readme_chars]
+                json_headers['Content-Type'] = 'text/plain'
+            else:
+                return 404, json_headers, {'message': 'Not Found'}
+        else:
+            return 404, json_headers, {'message': 'Not Found'}
+
+        raw = payload if isinstance(payload, str) else json.dumps(payload)
+        etag = '"' + hashlib.sha1(raw.encode()).hexdigest()[:16] + '"'
+        if headers.get('If-None-Match') == etag:
+            return 304, {'ETag': etag}, b''
+        return 200, {**json_headers, 'ETag': etag}, raw
+
+
+# ─── Firestore ────────────────────────────────────────────────────────────────
+
+def fake_storage(latency: float = 0.0):
+    """FirestoreStorage on an in-memory client that sleeps `latency` s per round trip."""
+    from storage import FirestoreStorage
+    from utils.memory_firestore import InMemoryFirestore
+    return FirestoreStorage(InMemoryFirestore(latency=latency), server_timestamps=False)
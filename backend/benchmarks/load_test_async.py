@@ -0,0 +1,208 @@
+"""
+load_test_async.py
+──────────────────
+Sync (Flask, thread-per-request) vs async (asgi.py) serving under many
+concurrent LLM-bound requests.
+
+A stub Gemini endpoint answers every generateContent call after a fixed
+delay (--latency), so the routes spend their time waiting exactly like
+they do on the real API.  Each mode is started in its own process:
+
+  sync   run.app on a WSGI server with a fixed pool of --threads worker
+         threads (the gunicorn gthread model)
+  async  asgi:application under uvicorn (one process, one event loop)
+
+and hit with bursts of --concurrency simultaneous POST /api/swot/analyze
+requests.  Reported per burst: throughput, p50 / p95 / max latency, errors.
+
+Usage (from backend/; needs uvicorn, starlette and a2wsgi):
+    python benchmarks/load_test_async.py
+    python benchmarks/load_test_async.py --concurrency 50 200 500 --latency 1.0 --threads 16
+    python benchmarks/load_test_async.py --route /api/roadmap/generate?enrich=1
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+SWOT_REPLY = json.dumps({
+    key: [{'title': f'{key} {i}', 'explanation': 'Stub analysis.'} for i in range(3)]
+    for key in ('opportunities', 'threats')
+})
+
+BODIES = {
+    '/api/swot/analyze': {
+        'profile': {'name': 'Load Test', 'domain': 'data science', 'role': 'data scientist', 'skills': ['python', 'sql']},
+        'skill_results': {'python': {'required': 0.9, 'user_score': 0.67, 'gap': 0.23, 'status': 'moderate'}},
+        'totals': {'readiness': 69.0, 'total_gap': 0.31},
+    },
+    '/api/roadmap/generate': {
+        'role': 'data scientist',
+        'test_scores': {'python': 0.7, 'sql': 0.4, 'statistics': 0.3},
+        'enrich': True,
+    },
+}
+
+
+# ─── Servers (run in child processes) ─────────────────────────────────────────
+
+def _gemini_stub(latency: float):
+    """ASGI app imitating POST …/models/<model>:generateContent."""
+    reply = json.dumps({
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': SWOT_REPLY}]}, 'finishReason': 'STOP'}],
+    }).encode()
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        while (await receive()).get('more_body'):
+            pass
+        await asyncio.sleep(latency)
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/json')]})
+        await send({'type': 'http.response.body', 'body': reply})
+    return app
+
+
+def _serve_sync(port: int, threads: int):
+    from werkzeug.serving import BaseWSGIServer
+    from run import app
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """Fixed worker-thread pool; further connections queue for a free thread."""
+        pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self._handle, request, client_address)
+
+        def _handle(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    server = PooledWSGIServer('127.0.0.1', port, app)
+    server.socket.listen(1024)
+    server.serve_forever()
+
+
+def serve(mode: str, port: int, args):
+    import uvicorn
+    if mode == 'gemini-stub':
+        uvicorn.run(_gemini_stub(args.latency), host='127.0.0.1', port=port, log_level='error', backlog=4096)
+    elif mode == 'async':
+        from asgi import application
+        uvicorn.run(application, host='127.0.0.1', port=port, log_level='error', backlog=4096, lifespan='on')
+    else:
+        _serve_sync(port, args.threads)
+
+
+# ─── Load generator ───────────────────────────────────────────────────────────
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _start(mode: str, port: int, args, env: dict) -> subprocess.Popen:
+    cmd = [sys.executable, os.path.abspath(__file__), '--serve', mode, '--port', str(port),
+           '--latency', str(args.latency), '--threads', str(args.threads)]
+    proc = subprocess.Popen(cmd, cwd=BACKEND, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f'{mode} server did not start')
+
+
+async def _burst(base: str, route: str, concurrency: int, timeout: float) -> dict:
+    import httpx
+    body = BODIES[route.split('?')[0]]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, timeout=timeout, limits=limits) as client:
+        async def one():
+            started = time.perf_counter()
+            try:
+                resp = await client.post(route, json=body)
+                ok = resp.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            return ok, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one() for _ in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies = sorted(t for ok, t in results if ok)
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else float('nan')
+    return {
+        'rps':    len(latencies) / wall,
+        'p50':    pct(0.50),
+        'p95':    pct(0.95),
+        'max':    latencies[-1] if latencies else float('nan'),
+        'errors': concurrency - len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 200, 500])
+    parser.add_argument('--latency', type=float, default=1.0, help='stub Gemini response time (s)')
+    parser.add_argument('--threads', type=int, default=16, help='worker threads in sync mode')
+    parser.add_argument('--route', default='/api/swot/analyze', choices=[*BODIES, '/api/roadmap/generate?enrich=1'])
+    parser.add_argument('--timeout', type=float, default=120.0)
+    parser.add_argument('--serve', choices=['gemini-stub', 'sync', 'async'], help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve, args.port, args)
+
+    stub_port = _free_port()
+    env = {
+        **os.environ,
+        'GEMINI_API_KEY':  'load-test',
+        'GEMINI_BASE_URL': f'http://127.0.0.1:{stub_port}',
+        'STORAGE_BACKEND': 'memory',
+        'DATABASE_URL':    'sqlite://',
+        'WARMUP':          '0',
+        'ADMISSION_CONTROL': '0',
+    }
+    stub = _start('gemini-stub', stub_port, args, env)
+    print(f"route {args.route}, stub Gemini latency {args.latency:.2f}s, sync mode with {args.threads} threads\n")
+    print(f"{'mode':<7}{'concurrent':>11}{'req/s':>9}{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'errors':>8}")
+    try:
+        for mode in ('sync', 'async'):
+            port = _free_port()
+            server = _start(mode, port, args, env)
+            try:
+                asyncio.run(_burst(f'http://127.0.0.1:{port}', args.route, 2, args.timeout))   # warm up
+                for c in args.concurrency:
+                    r = asyncio.run(_burst(f'http://127.0.0.1:{port}', args.route, c, args.timeout))
+                    print(f"{mode:<7}{c:>11}{r['rps']:>9.1f}{r['p50']:>8.2f}{r['p95']:>8.2f}{r['max']:>8.2f}{r['errors']:>8}")
+            finally:
+                server.terminate()
+                server.wait()
+    finally:
+        stub.terminate()
+        stub.wait()
+
+
+if __name__ == '__main__':
+    main()
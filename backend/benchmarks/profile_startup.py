@@ -0,0 +1,78 @@
+"""
+profile_startup.py
+──────────────────
+Import-time profile of backend startup.
+
+Imports run.py in a fresh interpreter under `python -X importtime`, then
+prints the total boot time and the slowest imports by cumulative time.
+Pass --warmup to include the WARMUP=1 phase, and --check to list which
+heavy SDKs were loaded at import (they should all be lazy).
+
+Usage (from backend/):
+    python benchmarks/profile_startup.py
+    python benchmarks/profile_startup.py --top 30 --warmup
+"""
+
+import os
+import sys
+import argparse
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ('google.genai', 'pymupdf', 'fitz', 'firebase_admin', 'google.generativeai')
+
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import run\n"
+    "print('BOOT_MS', round((time.perf_counter() - start) * 1000, 1))\n"
+    f"print('HEAVY', ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+)
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """(self_us, cumulative_us, module) rows from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--top', type=int, default=20, help='rows to show')
+    parser.add_argument('--warmup', action='store_true', help='run the WARMUP=1 phase as part of boot')
+    args = parser.parse_args()
+
+    env = {**os.environ, 'WARMUP': '1' if args.warmup else '0'}
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    boot_ms, heavy = None, ''
+    for line in proc.stdout.splitlines():
+        if line.startswith('BOOT_MS'):
+            boot_ms = line.split()[1]
+        elif line.startswith('HEAVY'):
+            heavy = line[len('HEAVY'):].strip()
+    if boot_ms is None:
+        print(proc.stdout + proc.stderr[-2000:])
+        sys.exit(1)
+
+    rows = _parse_importtime(proc.stderr)
+    print(f"import run: {boot_ms} ms  (warm-up {'on' if args.warmup else 'off'})")
+    print(f"heavy SDKs loaded at boot: {heavy or 'none'}\n")
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+models
+──────
+SQLAlchemy models for server-side assessment and analysis history.
+
+`db` is created unbound here and attached to the app in run.py with
+db.init_app(app), so model modules can import it without a cycle.
+"""
+
+from datetime import datetime
+
+from flask_sqlalchemy import SQLAlchemy
+
+db = SQLAlchemy()
+
+
+def parse_datetime(value) -> datetime:
+    """Naive-UTC datetime from an ISO string (or now, when empty)."""
+    if not value:
+        return datetime.utcnow()
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+from models.assessment import AssessmentAttempt, SkillScore, AssessmentSession  # noqa: E402
+from models.skill_model import GapSnapshot                      # noqa: E402
+from models.role_model import MatchResult                       # noqa: E402
+
+__all__ = ['db', 'AssessmentAttempt', 'SkillScore', 'AssessmentSession', 'GapSnapshot', 'MatchResult']
@@ -0,0 +1,118 @@
+"""
+Assessment attempts and their per-skill scores.
+
+Every row carries (user_id, domain, created_at) so the composite index
+answers "progress over time" and "latest result per domain" without
+touching other users' rows.
+"""
+
+from datetime import datetime
+
+from models import db, parse_datetime
+
+
+class AssessmentAttempt(db.Model):
+    __tablename__ = 'assessment_attempts'
+    __table_args__ = (
+        db.Index('ix_attempts_user_domain_created', 'user_id', 'domain', 'created_at', 'id'),
+    )
+
+    id             = db.Column(db.Integer, primary_key=True)
+    user_id        = db.Column(db.String(255), nullable=False)
+    domain         = db.Column(db.String(100), nullable=False)
+    total_score    = db.Column(db.Float, nullable=False)
+    question_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at     = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    skill_scores = db.relationship('SkillScore', backref='attempt', lazy='selectin',
+                                   cascade='all, delete-orphan')
+
+    def to_dict(self) -> dict:
+        return {
+            'id':             self.id,
+            'domain':         self.domain,
+            'total_score':    self.total_score,
+            'question_count': self.question_count,
+            'scores':         {s.skill: s.score for s in self.skill_scores},
+            'created_at':     self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def bulk_create(cls, user_id: str, rows: list[dict]) -> list['AssessmentAttempt']:
+        """
+        Insert many attempts (with their per-skill scores) in one flush.
+        Row shape: { domain, scores: {skill: 0..1}, total_score?, question_count?, created_at? }
+        """
+        attempts = []
+        for row in rows:
+            scores = {k.lower(): float(v) for k, v in (row.get('scores') or {}).items()}
+            created_at = parse_datetime(row.get('created_at'))
+            total = row.get('total_score')
+            if total is None:
+                total = round(sum(scores.values()) / len(scores), 4) if scores else 0.0
+            attempt = cls(
+                user_id=user_id,
+                domain=row['domain'].lower().strip(),
+                total_score=float(total),
+                question_count=int(row.get('question_count', 0)),
+                created_at=created_at,
+            )
+            attempt.skill_scores = [
+                SkillScore(user_id=user_id, domain=attempt.domain, skill=skill,
+                           score=score, created_at=created_at)
+                for skill, score in scores.items()
+            ]
+            attempts.append(attempt)
+        db.session.add_all(attempts)
+        db.session.flush()
+        return attempts
+
+
+class SkillScore(db.Model):
+    __tablename__ = 'skill_scores'
+    __table_args__ = (
+        db.Index('ix_skill_scores_user_domain_created', 'user_id', 'domain', 'created_at', 'id'),
+        db.Index('ix_skill_scores_user_skill_created', 'user_id', 'skill', 'created_at'),
+    )
+
+    id         = db.Column(db.Integer, primary_key=True)
+    attempt_id = db.Column(db.Integer, db.ForeignKey('assessment_attempts.id', ondelete='CASCADE'),
+                           nullable=False, index=True)
+    user_id    = db.Column(db.String(255), nullable=False)
+    domain     = db.Column(db.String(100), nullable=False)
+    skill      = db.Column(db.String(100), nullable=False)
+    score      = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'id':         self.id,
+            'attempt_id': self.attempt_id,
+            'domain':     self.domain,
+            'skill':      self.skill,
+            'score':      self.score,
+            'created_at': self.created_at.isoformat(),
+        }
+
+
+
+class AssessmentSession(db.Model):
+    """
+    An issued test: which bank and which question ids, in order.
+    Answers are never sent to the client; /api/mcq/submit grades against
+    the bank using this row, then marks it submitted.
+    """
+    __tablename__ = 'assessment_sessions'
+
+    id           = db.Column(db.String(32), primary_key=True)
+    user_id      = db.Column(db.String(255), nullable=True, index=True)
+    bank         = db.Column(db.String(100), nullable=False)
+    domain       = db.Column(db.String(100), nullable=False)
+    question_ids = db.Column(db.String(2000), nullable=False)    # "12,3,40,…"
+    created_at   = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at   = db.Column(db.DateTime, nullable=False, index=True)
+    submitted_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def question_id_list(self) -> list[int]:
+        return [int(q) for q in self.question_ids.split(',') if q]
@@ -0,0 +1,53 @@
+"""
+Career-match results: one row per role scored by /api/career/match.
+"""
+
+from datetime import datetime
+
+from models import db, parse_datetime
+
+
+class MatchResult(db.Model):
+    __tablename__ = 'match_results'
+    __table_args__ = (
+        db.Index('ix_match_results_user_domain_created', 'user_id', 'domain', 'created_at', 'id'),
+    )
+
+    id           = db.Column(db.Integer, primary_key=True)
+    user_id      = db.Column(db.String(255), nullable=False)
+    domain       = db.Column(db.String(100), nullable=False)
+    role         = db.Column(db.String(100), nullable=False)
+    match_pct    = db.Column(db.Float, nullable=False)
+    career_score = db.Column(db.Float, nullable=False)
+    created_at   = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'id':           self.id,
+            'domain':       self.domain,
+            'role':         self.role,
+            'match_pct':    self.match_pct,
+            'career_score': self.career_score,
+            'created_at':   self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def bulk_create(cls, user_id: str, rows: list[dict]) -> list['MatchResult']:
+        """
+        Insert many results in one flush.  Rows take the shape of a
+        /api/career/match `top_matches` entry: { role, domain, match_pct, career_score, created_at? }
+        """
+        results = [
+            cls(
+                user_id=user_id,
+                domain=row['domain'].lower().strip(),
+                role=row['role'],
+                match_pct=float(row.get('match_pct', 0.0)),
+                career_score=float(row.get('career_score', 0.0)),
+                created_at=parse_datetime(row.get('created_at')),
+            )
+            for row in rows
+        ]
+        db.session.add_all(results)
+        db.session.flush()
+        return results
@@ -0,0 +1,56 @@
+"""
+Skill-gap snapshots: one row per /api/skill-gap/calculate result a user keeps.
+"""
+
+from datetime import datetime
+
+from models import db, parse_datetime
+
+
+class GapSnapshot(db.Model):
+    __tablename__ = 'gap_snapshots'
+    __table_args__ = (
+        db.Index('ix_gap_snapshots_user_domain_created', 'user_id', 'domain', 'created_at', 'id'),
+    )
+
+    id            = db.Column(db.Integer, primary_key=True)
+    user_id       = db.Column(db.String(255), nullable=False)
+    domain        = db.Column(db.String(100), nullable=False)
+    role          = db.Column(db.String(100), nullable=False)
+    readiness     = db.Column(db.Float, nullable=False)
+    total_gap     = db.Column(db.Float, nullable=False)
+    skill_results = db.Column(db.JSON, nullable=False, default=dict)
+    created_at    = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        return {
+            'id':            self.id,
+            'domain':        self.domain,
+            'role':          self.role,
+            'readiness':     self.readiness,
+            'total_gap':     self.total_gap,
+            'skill_results': self.skill_results,
+            'created_at':    self.created_at.isoformat(),
+        }
+
+    @classmethod
+    def bulk_create(cls, user_id: str, rows: list[dict]) -> list['GapSnapshot']:
+        """
+        Insert many snapshots in one flush.  Rows take the /api/skill-gap/calculate
+        response shape: { domain, role, totals: {readiness, total_gap}, skill_results, created_at? }
+        """
+        snapshots = [
+            cls(
+                user_id=user_id,
+                domain=row['domain'].lower().strip(),
+                role=row.get('role', ''),
+                readiness=float(row.get('totals', {}).get('readiness', 0.0)),
+                total_gap=float(row.get('totals', {}).get('total_gap', 0.0)),
+                skill_results=row.get('skill_results', {}),
+                created_at=parse_datetime(row.get('created_at')),
+            )
+            for row in rows
+        ]
+        db.session.add_all(snapshots)
+        db.session.flush()
+        return snapshots
@@ -3,21 +3,23 @@ from flask_jwt_extended import (
     create_access_token, create_refresh_token,
     jwt_required, get_jwt_identity
 )
-from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 import re
 
-# Firestore client — initialised via firebase_admin in app.py / main entry point.
-# Import it lazily so the module doesn't crash if firebase_admin isn't set up yet.
-def _get_db():
+from utils.doc_cache import doc_cache
+from utils.password_pool import get_hasher, HashPoolSaturated
+
+# Storage backend (Firestore by default, see storage/__init__.py).
+# Resolve it lazily so the module doesn't crash if the backend isn't set up yet.
+def _get_storage():
     try:
-        from firebase_admin import firestore
-        return firestore.client()
+        from storage import get_storage
+        return get_storage()
     except Exception as e:
         raise RuntimeError(
-            "Firestore is not initialised. "
-            "Make sure firebase_admin.initialize_app() has been called "
-            "with valid credentials before using auth routes. "
+            "Storage is not initialised. "
+            "Check STORAGE_BACKEND and, for Firestore, that valid credentials "
+            "are available before using auth routes. "
             f"Original error: {e}"
         )
 
@@ -40,6 +42,13 @@ def validate_password(password: str):
     return True, "Password is valid"
 
 
+def _busy_response():
+    """503 returned when the password-hashing pool is saturated."""
+    response = jsonify({'error': 'Server is busy, please retry shortly'})
+    response.headers['Retry-After'] = str(HashPoolSaturated.retry_after)
+    return response, 503
+
+
 def _user_doc_to_dict(doc_data: dict) -> dict:
     """Return a safe public representation of a Firestore user document."""
     return {
@@ -54,7 +63,7 @@ def _user_doc_to_dict(doc_data: dict) -> dict:
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
     """
-    Register a new user and store them in Firestore.
+    Register a new user and store them in the configured storage backend.
     Body: { "email", "password", "full_name" }
     """
     try:
@@ -77,12 +86,10 @@ def signup():
         if len(full_name) < 2:
             return jsonify({'error': 'Full name must be at least 2 characters'}), 400
 
-        db = _get_db()
-        users_ref = db.collection('users')
+        storage = _get_storage()
 
         # Check duplicate email
-        existing = users_ref.where('email', '==', email).limit(1).get()
-        if len(existing) > 0:
+        if storage.user_exists(email):
             return jsonify({'error': 'Email already registered'}), 409
 
         # Create user document
@@ -90,10 +97,11 @@ def signup():
             'id': email,          # use email as the document ID
             'email': email,
             'full_name': full_name,
-            'password_hash': generate_password_hash(password),
+            'password_hash': get_hasher().hash(password),
             'created_at': datetime.utcnow().isoformat(),
         }
-        users_ref.document(email).set(user_data)
+        storage.create_user(user_data)
+        doc_cache.invalidate('users', email)   # drop any cached "not found"
 
         access_token = create_access_token(identity=email)
         refresh_token = create_refresh_token(identity=email)
@@ -105,6 +113,8 @@ def signup():
             'refresh_token': refresh_token,
         }), 201
 
+    except HashPoolSaturated:
+        return _busy_response()
     except Exception as e:
         return jsonify({'error': 'Registration failed', 'details': str(e)}), 500
 
@@ -112,7 +122,7 @@ def signup():
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """
-    Authenticate user via Firestore lookup.
+    Authenticate user via a storage-backend lookup.
     Body: { "email", "password" }
     """
     try:
@@ -124,16 +134,21 @@ def login():
         email = data['email'].lower().strip()
         password = data['password']
 
-        db = _get_db()
-        doc = db.collection('users').document(email).get()
+        storage = _get_storage()
+        user_data = storage.get_user(email)
 
-        if not doc.exists:
+        if user_data is None:
             return jsonify({'error': 'Invalid email or password'}), 401
 
-        user_data = doc.to_dict()
-        if not check_password_hash(user_data.get('password_hash', ''), password):
+        hasher = get_hasher()
+        pw_hash = user_data.get('password_hash', '')
+        if not hasher.verify(pw_hash, password):
             return jsonify({'error': 'Invalid email or password'}), 401
 
+        # Upgrade hashes made with older parameters, off the request path
+        if hasher.needs_rehash(pw_hash):
+            hasher.rehash_async(password, lambda new_hash: storage.update_user(email, {'password_hash': new_hash}))
+
         access_token = create_access_token(identity=email)
         refresh_token = create_refresh_token(identity=email)
 
@@ -144,6 +159,8 @@ def login():
             'refresh_token': refresh_token,
         }), 200
 
+    except HashPoolSaturated:
+        return _busy_response()
     except Exception as e:
         return jsonify({'error': 'Login failed', 'details': str(e)}), 500
 
@@ -177,13 +194,12 @@ def verify_token():
     """Verify the current JWT and return the user's public profile."""
     try:
         email = get_jwt_identity()
-        db = _get_db()
-        doc = db.collection('users').document(email).get()
+        user_data = doc_cache.get('users', email, lambda: _get_storage().get_user(email))
 
-        if not doc.exists:
+        if user_data is None:
             return jsonify({'error': 'User not found'}), 404
 
-        return jsonify({'message': 'Token is valid', 'user': _user_doc_to_dict(doc.to_dict())}), 200
+        return jsonify({'message': 'Token is valid', 'user': _user_doc_to_dict(user_data)}), 200
 
     except Exception as e:
         return jsonify({'error': 'Verification failed', 'details': str(e)}), 500
@@ -198,27 +214,29 @@ def change_password():
     """
     try:
         email = get_jwt_identity()
-        db = _get_db()
-        doc_ref = db.collection('users').document(email)
-        doc = doc_ref.get()
+        storage = _get_storage()
+        user_data = storage.get_user(email)
 
-        if not doc.exists:
+        if user_data is None:
             return jsonify({'error': 'User not found'}), 404
 
         data = request.get_json()
         if not data or not all(k in data for k in ['current_password', 'new_password']):
             return jsonify({'error': 'Missing required fields'}), 400
 
-        user_data = doc.to_dict()
-        if not check_password_hash(user_data.get('password_hash', ''), data['current_password']):
+        hasher = get_hasher()
+        if not hasher.verify(user_data.get('password_hash', ''), data['current_password']):
             return jsonify({'error': 'Current password is incorrect'}), 401
 
         is_valid, message = validate_password(data['new_password'])
         if not is_valid:
             return jsonify({'error': message}), 400
 
-        doc_ref.update({'password_hash': generate_password_hash(data['new_password'])})
+        storage.update_user(email, {'password_hash': hasher.hash(data['new_password'])})
+        doc_cache.invalidate('users', email)
         return jsonify({'message': 'Password changed successfully'}), 200
 
+    except HashPoolSaturated:
+        return _busy_response()
     except Exception as e:
         return jsonify({'error': 'Password change failed', 'details': str(e)}), 500
\ No newline at end of file
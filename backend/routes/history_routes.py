@@ -0,0 +1,172 @@
+"""
+history_routes.py
+─────────────────
+Flask Blueprint: /api/history
+
+Server-side history of assessment attempts, skill-gap snapshots and career
+matches, stored with SQLAlchemy (models/).  All reads are indexed on
+(user_id, domain, created_at, id) and paginated by keyset, never by offset.
+
+POST /api/history/<kind>            bulk-record rows     kind ∈ attempts | gaps | matches
+GET  /api/history/<kind>/progress   ?domain=&limit=&cursor=   newest first
+GET  /api/history/<kind>/latest     latest result per domain
+"""
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy import and_, or_
+
+from models import db, parse_datetime, AssessmentAttempt, GapSnapshot, MatchResult
+from services.skill_index import skill_index
+
+history_bp = Blueprint("history", __name__)
+
+KINDS = {
+    "attempts": AssessmentAttempt,
+    "gaps":     GapSnapshot,
+    "matches":  MatchResult,
+}
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_BULK_ROWS = 500
+
+
+def _model_or_404(kind: str):
+    model = KINDS.get(kind)
+    if model is None:
+        return None, (jsonify({"error": f"Unknown history kind '{kind}'.", "allowed": list(KINDS)}), 404)
+    return model, None
+
+
+def _encode_cursor(row) -> str:
+    return f"{row.created_at.isoformat()}_{row.id}"
+
+
+def _decode_cursor(cursor: str):
+    created_at, _, row_id = cursor.rpartition("_")
+    return parse_datetime(created_at), int(row_id)
+
+
+# ─── POST /api/history/<kind> ─────────────────────────────────────────────────
+@history_bp.route("/<kind>", methods=["POST"])
+@jwt_required()
+def record(kind):
+    """
+    Body: a single row object or { "rows": [...] } (max 500 per call).
+    Rows without created_at share one timestamp, so a batch of career
+    matches is recorded as one result set.
+    """
+    model, error = _model_or_404(kind)
+    if error:
+        return error
+
+    body = request.get_json(force=True) or {}
+    rows = body.get("rows") if isinstance(body, dict) and "rows" in body else [body]
+    if not rows or not all(isinstance(r, dict) and isinstance(r.get("domain"), str) and r["domain"].strip()
+                           for r in rows):
+        return jsonify({"error": "Every row needs at least a 'domain' string."}), 400
+    if len(rows) > MAX_BULK_ROWS:
+        return jsonify({"error": f"At most {MAX_BULK_ROWS} rows per request."}), 413
+
+    batch_time = parse_datetime(None).isoformat()
+    rows = [{**r, "created_at": r.get("created_at") or batch_time} for r in rows]
+
+    uid = get_jwt_identity()
+    try:
+        created = model.bulk_create(uid, rows)
+        db.session.commit()
+    except (KeyError, ValueError, TypeError) as exc:
+        db.session.rollback()
+        return jsonify({"error": f"Invalid row: {exc}"}), 400
+
+    # Keep the placement-query index current (oldest first, so the newest wins)
+    for row in sorted(created, key=lambda r: (r.created_at, r.id)):
+        if model is AssessmentAttempt:
+            skill_index.set_test_scores(uid, {s.skill: s.score for s in row.skill_scores}, row.domain)
+        elif model is GapSnapshot:
+            skill_index.set_readiness(uid, row.readiness, row.domain)
+
+    return jsonify({"created": len(created), "ids": [r.id for r in created]}), 201
+
+
+# ─── GET /api/history/<kind>/progress ─────────────────────────────────────────
+@history_bp.route("/<kind>/progress", methods=["GET"])
+@jwt_required()
+def progress(kind):
+    """
+    Newest-first page of results, optionally for one domain.
+    Pass the returned `next_cursor` back as ?cursor= for the next page.
+    """
+    model, error = _model_or_404(kind)
+    if error:
+        return error
+
+    uid = get_jwt_identity()
+    domain = request.args.get("domain", "").lower().strip()
+    try:
+        limit = min(max(int(request.args.get("limit", DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+
+    query = db.select(model).where(model.user_id == uid)
+    if domain:
+        query = query.where(model.domain == domain)
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            created_at, row_id = _decode_cursor(cursor)
+        except ValueError:
+            return jsonify({"error": "Malformed cursor."}), 400
+        query = query.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < row_id),
+        ))
+
+    rows = db.session.scalars(
+        query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return jsonify({
+        "items":       [r.to_dict() for r in rows],
+        "next_cursor": _encode_cursor(rows[-1]) if has_more else None,
+    }), 200
+
+
+# ─── GET /api/history/<kind>/latest ───────────────────────────────────────────
+@history_bp.route("/<kind>/latest", methods=["GET"])
+@jwt_required()
+def latest(kind):
+    """
+    Latest result per domain: { "<domain>": [rows...] }.
+    For attempts and gaps the list has one row; for matches it holds every
+    role scored in the most recent batch.
+    """
+    model, error = _model_or_404(kind)
+    if error:
+        return error
+
+    uid = get_jwt_identity()
+    newest = (
+        db.select(model.domain, db.func.max(model.created_at).label("created_at"))
+        .where(model.user_id == uid)
+        .group_by(model.domain)
+        .subquery()
+    )
+    rows = db.session.scalars(
+        db.select(model)
+        .join(newest, and_(model.domain == newest.c.domain, model.created_at == newest.c.created_at))
+        .where(model.user_id == uid)
+        .order_by(model.domain, model.id.desc())
+    ).all()
+
+    by_domain = {}
+    for row in rows:
+        group = by_domain.setdefault(row.domain, [])
+        if model is MatchResult or not group:
+            group.append(row.to_dict())
+
+    return jsonify(by_domain), 200
@@ -6,12 +6,14 @@ Flask Blueprint: /api/resume
 POST /api/resume/parse
   - Accepts PDF only (validated server-side)
   - Calls resume_parser.parse_resume_from_bytes()
-  - Saves result to Firestore `resumes` collection keyed by uid
+  - Saves result to the `resumes` collection keyed by uid via the storage
+    backend (on Firestore, the response does not wait for the commit)
   - Returns JSON: { uid, fullName, skills, experience, projects, metadata }
 """
 
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 
@@ -19,10 +21,15 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from services.resume_parser import parse_resume_from_bytes
-from utils.firebase_config import db
+from services.skill_index import skill_index
+from storage import get_storage
+from utils.doc_cache import doc_cache
 
 resume_bp = Blueprint("resume", __name__)
 
+# Runs the users-doc lookup while the PDF is being parsed
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="resume-io")
+
 ALLOWED_MIME_TYPES = {"application/pdf"}
 ALLOWED_EXTENSIONS = {".pdf"}
 
@@ -31,13 +38,23 @@ def _get_ext(filename: str) -> str:
     return os.path.splitext(filename.lower())[1]
 
 
+def _fetch_full_name(uid: str) -> str:
+    try:
+        user = doc_cache.get("users", uid, lambda: get_storage().get_user(uid), fields=["fullName"])
+        if user:
+            return user.get("fullName", "")
+    except Exception:
+        pass   # fullName is optional
+    return ""
+
+
 # ─── POST /api/resume/parse ───────────────────────────────────────────────────
 @resume_bp.route("/parse", methods=["POST"])
 @jwt_required()
 def parse_resume():
     """
     Accepts a multipart/form-data upload with key 'resume'.
-    Validates that the file is a PDF, parses it, saves to Firestore,
+    Validates that the file is a PDF, parses it, saves it via the storage backend,
     and returns the extracted data as JSON.
     """
     uid = get_jwt_identity()
@@ -65,23 +82,18 @@ def parse_resume():
             "received_mime": mime,
         }), 415   # 415 Unsupported Media Type
 
-    # ── 3. Parse the PDF ──────────────────────────────────────────────────────
+    # ── 3. Parse the PDF (user profile for fullName is fetched meanwhile) ────
+    full_name_future = _io_pool.submit(_fetch_full_name, uid)
     try:
         pdf_bytes = file.read()
-        parsed = parse_resume_from_bytes(pdf_bytes, filename=file.filename)
+        parsed = parse_resume_from_bytes(pdf_bytes, filename=file.filename, owner=uid)
     except Exception as exc:
         return jsonify({"error": f"PDF parsing failed: {str(exc)}"}), 500
 
-    # ── 4. Fetch user profile for fullName ────────────────────────────────────
-    full_name = ""
-    try:
-        user_doc = db.collection("users").document(uid).get()
-        if user_doc.exists:
-            full_name = user_doc.to_dict().get("fullName", "")
-    except Exception:
-        pass   # fullName is optional
+    # ── 4. Collect fullName ───────────────────────────────────────────────────
+    full_name = full_name_future.result()
 
-    # ── 5. Save to Firestore `resumes` collection (keyed by uid) ─────────────
+    # ── 5. Save to `resumes` collection (keyed by uid) ───────────────────────
     resume_payload = {
         "uid":        uid,
         "fullName":   full_name,
@@ -89,16 +101,18 @@ def parse_resume():
         "experience": parsed.get("experience", []),
         "projects":   parsed.get("projects",   []),
         "metadata":   parsed.get("metadata",   {}),
-        "parsedAt":   db.SERVER_TIMESTAMP if hasattr(db, "SERVER_TIMESTAMP") else None,
     }
 
     try:
-        from google.cloud import firestore as gfs
-        resume_payload["parsedAt"] = gfs.SERVER_TIMESTAMP
-        db.collection("resumes").document(uid).set(resume_payload, merge=True)
+        storage = get_storage()
+        resume_payload["parsedAt"] = storage.timestamp()
+        storage.save_resume(uid, resume_payload)
+        doc_cache.invalidate("resumes", uid)
     except Exception as exc:
-        # Don't fail the whole request just because Firestore write failed
-        print(f"[resume_routes] Firestore write error: {exc}")
+        # Don't fail the whole request just because the write failed
+        print(f"[resume_routes] Storage write error: {exc}")
+
+    skill_index.set_resume_skills(uid, resume_payload["skills"])
 
     # ── 6. Return extracted data (omit raw_text to keep response small) ───────
     return jsonify({
@@ -116,14 +130,13 @@ def parse_resume():
 @jwt_required()
 def get_resume():
     """
-    Fetch the current user's saved resume data from Firestore.
+    Fetch the current user's saved resume data.
     """
     uid = get_jwt_identity()
     try:
-        doc = db.collection("resumes").document(uid).get()
-        if not doc.exists:
+        data = doc_cache.get("resumes", uid, lambda: get_storage().get_resume(uid))
+        if not data:
             return jsonify({"message": "No resume uploaded yet."}), 404
-        data = doc.to_dict()
         data.pop("parsedAt", None)   # remove server timestamp (not JSON-serialisable)
         return jsonify(data), 200
     except Exception as exc:
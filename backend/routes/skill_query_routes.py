@@ -0,0 +1,99 @@
+"""
+skill_query_routes.py
+─────────────────────
+Flask Blueprint: /api/skills
+
+Placement queries over every student's skill profile, answered from the
+in-memory inverted index (services/skill_index.py) without reading any
+resume or score documents.
+
+POST /api/skills/query
+  Body: {
+    "has":      ["python", "sql"],        every one required
+    "missing":  ["statistics"],           none of these
+    "any":      ["pandas", "numpy"],      at least one (optional)
+    "readiness": {"min": 60, "max": 100}, percent, optional
+    "rank_by":  "readiness" | "<skill>",  default readiness
+    "limit":    20                        max 200
+  }
+  Returns { total, results: [{ uid, domain, readiness, skills, scores }], took_ms }
+
+GET /api/skills/index/stats
+
+Both routes are for placement officers only: the JWT must carry a `role`
+claim of placement_officer or admin, or its identity must be listed in
+PLACEMENT_OFFICERS (comma-separated).  Anyone else gets 403.
+"""
+
+import os
+import time
+from functools import wraps
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
+
+from services.skill_index import skill_index
+
+skill_query_bp = Blueprint("skill_query", __name__)
+
+MAX_LIMIT = 200
+PLACEMENT_ROLES = {"placement_officer", "admin"}
+
+
+def _is_placement_officer() -> bool:
+    if get_jwt().get("role") in PLACEMENT_ROLES:
+        return True
+    allowed = {u.strip() for u in os.getenv("PLACEMENT_OFFICERS", "").split(",") if u.strip()}
+    return get_jwt_identity() in allowed
+
+
+def placement_officer_required(fn):
+    """jwt_required(), plus 403 unless the caller is a placement officer (see module docstring)."""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not _is_placement_officer():
+            return jsonify({"error": "Placement officer access required."}), 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def _skill_list(body: dict, key: str):
+    value = body.get(key) or []
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"'{key}' must be a list of skill names.")
+    return value
+
+
+# ─── POST /api/skills/query ───────────────────────────────────────────────────
+@skill_query_bp.route("/query", methods=["POST"])
+@placement_officer_required
+def query_skills():
+    body = request.get_json(force=True) or {}
+    try:
+        has, missing, any_of = (_skill_list(body, k) for k in ("has", "missing", "any"))
+        readiness = body.get("readiness") or {}
+        min_r, max_r = readiness.get("min"), readiness.get("max")
+        min_r = float(min_r) if min_r is not None else None
+        max_r = float(max_r) if max_r is not None else None
+        limit = min(max(int(body.get("limit", 20)), 0), MAX_LIMIT)
+    except (TypeError, ValueError, AttributeError) as exc:
+        return jsonify({"error": f"Invalid query: {exc}"}), 400
+
+    start = time.perf_counter()
+    result = skill_index.query(
+        has=has, missing=missing, any_of=any_of,
+        min_readiness=min_r, max_readiness=max_r,
+        rank_by=str(body.get("rank_by", "readiness")), limit=limit,
+    )
+    result["took_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return jsonify(result), 200
+
+
+# ─── GET /api/skills/index/stats ──────────────────────────────────────────────
+@skill_query_bp.route("/index/stats", methods=["GET"])
+@placement_officer_required
+def index_stats():
+    return jsonify(skill_index.stats()), 200
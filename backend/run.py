@@ -1,14 +1,13 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
-from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, verify_jwt_in_request, get_jwt_identity
 from dotenv import load_dotenv
 import os
-from datetime import timedelta
+from datetime import datetime, timedelta
 import random
 import json
-from google import genai
-from google.genai import types
+import uuid
+import threading
 
 # Load environment variables
 load_dotenv()
@@ -28,22 +27,40 @@ class Config:
 app.config.from_object(Config)
 
 # Initialize extensions
-db = SQLAlchemy(app)
+from models import db, AssessmentAttempt, AssessmentSession
+from services.assessment_engine import bank_for_domain, get_bank, register_bank
+from services.skill_index import skill_index
+from services.gap_engine import (
+    MAX_SCENARIOS, MAX_STEPS, STEP_MODES, W_INTEREST, W_SKILL, W_TEST, get_benchmark_matrix, match_benchmark,
+)
+from services.career_advisor import RoadmapJob, SwotJob
+from services.roadmap_generator import inputs_error
+from utils.data_loader import load_data
+from utils.genai_client import generate_content
+from utils.metrics import instrument_flask, render as render_metrics
+from utils.profiling import install_profiler
+from utils.responses import compute_etag, json_response, not_modified
+from utils.admission import AdmissionRejected, get_admission
+from utils.warmup import readiness, warm_up
+db.init_app(app)
+# The MCQ routes keep assessment sessions in the database, so its tables must exist
+# under every server (flask run, gunicorn, uvicorn), not only `python run.py`
+with app.app_context():
+    db.create_all()
 jwt = JWTManager(app)
-CORS(app, resources={
-    r"/api/*": {
-        "origins": [
-            "http://localhost:3000",
-            "http://localhost:5000",
-            "http://localhost:5173",   # Vite dev server
-            "http://127.0.0.1:5173",
-            "https://localhost:5174",
-            "https://localhost:5174"
-        ],
-        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
-    }
-})
+CORS_OPTIONS = {
+    "origins": [
+        "http://localhost:3000",
+        "http://localhost:5000",
+        "http://localhost:5173",   # Vite dev server
+        "http://127.0.0.1:5173",
+        "https://localhost:5174",
+        "https://localhost:5174"
+    ],
+    "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    "allow_headers": ["Content-Type", "Authorization"]
+}
+CORS(app, resources={r"/api/*": CORS_OPTIONS})
 
 # ----------------------------------------
 # Sample MCQ Data (You can later move this to DB)
@@ -80,28 +97,159 @@ MCQ_DATA = [
     },
 ]
 
+# ----------------------------------------
+# Assessment sessions
+# ----------------------------------------
+# Issuing a test stores only the bank name and question ids; answers stay
+# on the server and /api/mcq/submit grades the sheet against the bank.
+ASSESSMENT_SESSION_TTL = timedelta(seconds=int(os.getenv('ASSESSMENT_SESSION_TTL', 2 * 3600)))
+# Expired sessions are swept at most this often, not on every issued test
+ASSESSMENT_SESSION_SWEEP = timedelta(seconds=int(os.getenv('ASSESSMENT_SESSION_SWEEP', 600)))
+_session_sweep = {'next': datetime.min}
+_session_sweep_lock = threading.Lock()
+
+register_bank('sample', MCQ_DATA)
+
+
+def _optional_identity():
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def client_identity() -> str:
+    """Admission-control key (utils/admission.py): the signed-in user, else the client address."""
+    uid = _optional_identity()
+    return f'user:{uid}' if uid else f'ip:{request.remote_addr}'
+
+
+def _sweep_expired_sessions(now: datetime) -> None:
+    """Delete expired assessment sessions once per ASSESSMENT_SESSION_SWEEP (per process)."""
+    if now < _session_sweep['next'] or not _session_sweep_lock.acquire(blocking=False):
+        return
+    try:
+        if now >= _session_sweep['next']:
+            _session_sweep['next'] = now + ASSESSMENT_SESSION_SWEEP
+            db.session.execute(db.delete(AssessmentSession).where(AssessmentSession.expires_at < now))
+    finally:
+        _session_sweep_lock.release()
+
+
+def _issue_session(bank, domain: str, question_ids: list[int]) -> AssessmentSession:
+    now = datetime.utcnow()
+    _sweep_expired_sessions(now)
+    session = AssessmentSession(
+        id=uuid.uuid4().hex,
+        user_id=_optional_identity(),
+        bank=bank.name,
+        domain=domain,
+        question_ids=','.join(str(q) for q in question_ids),
+        created_at=now,
+        expires_at=now + ASSESSMENT_SESSION_TTL,
+    )
+    db.session.add(session)
+    db.session.commit()
+    return session
+
+
+def _session_payload(session: AssessmentSession, questions: list[dict]) -> dict:
+    return {
+        'session_id': session.id,
+        'domain':     session.domain,
+        'expires_at': session.expires_at.isoformat(),
+        'questions':  questions,
+    }
+
+
 # ----------------------------------------
 # MCQ API Route
 # ----------------------------------------
 @app.route('/api/mcq', methods=['GET'])
 def get_mcq_questions():
     """
-    Returns MCQ questions with shuffled options
+    Returns the sample MCQ questions with shuffled options, plus the
+    session_id to submit answers to /api/mcq/submit
     """
-    shuffled_questions = []
+    bank = get_bank('sample')
+    question_ids = list(range(len(bank.questions)))
 
-    for question in MCQ_DATA:
-        options = question["options"].copy()
-        random.shuffle(options)
+    questions = []
+    for qid in question_ids:
+        question = bank.public_question(qid)
+        question['options'] = random.sample(question['options'], len(question['options']))
+        questions.append(question)
 
-        shuffled_questions.append({
-            "id": question["id"],
-            "question": question["question"],
-            "options": options,
-            "correct_answer": question["correct_answer"]
-        })
+    session = _issue_session(bank, 'general', question_ids)
+    return jsonify(_session_payload(session, questions)), 200
+
+
+# ----------------------------------------
+# MCQ Submission Route
+# ----------------------------------------
+@app.route('/api/mcq/submit', methods=['POST', 'OPTIONS'])
+def submit_mcq():
+    """
+    POST /api/mcq/submit
+    Body: { "session_id": "…", "answers": ["Option text", null, …] }
+          (or { "0": "Option text", … } keyed by question position)
+    Returns { domain, scores, total_score, … }: `domain` and `scores` are
+    exactly the body /api/skill-gap/calculate takes.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+
+    body    = request.get_json(force=True) or {}
+    session = db.session.get(AssessmentSession, str(body.get('session_id', '')))
+    if session is None:
+        return jsonify({'error': 'Unknown assessment session.'}), 404
+    if session.submitted_at is not None:
+        return jsonify({'error': 'This assessment was already submitted.'}), 409
+    if session.expires_at < datetime.utcnow():
+        return jsonify({'error': 'This assessment session has expired. Start a new test.'}), 410
+
+    question_ids = session.question_id_list
+    answers = body.get('answers') or []
+    if isinstance(answers, dict):
+        answers = [answers.get(str(i)) for i in range(len(question_ids))]
+    if not isinstance(answers, list):
+        return jsonify({'error': 'answers must be a list or an object keyed by question position.'}), 400
+    answers = (answers + [None] * len(question_ids))[:len(question_ids)]
 
-    return jsonify(shuffled_questions), 200
+    try:
+        bank = get_bank(session.bank)
+    except FileNotFoundError:
+        return jsonify({'error': f'Question bank not found: {session.bank}'}), 404
+    graded = bank.grade(question_ids, answers)
+
+    # Claim the session atomically: of two concurrent submits only one matches the row
+    claimed = db.session.execute(
+        db.update(AssessmentSession)
+        .where(AssessmentSession.id == session.id, AssessmentSession.submitted_at.is_(None))
+        .values(submitted_at=datetime.utcnow())
+    )
+    if claimed.rowcount != 1:
+        db.session.rollback()
+        return jsonify({'error': 'This assessment was already submitted.'}), 409
+    user_id = session.user_id or _optional_identity()
+    if user_id:
+        AssessmentAttempt.bulk_create(user_id, [{
+            'domain':         session.domain,
+            'scores':         graded['scores'],
+            'total_score':    graded['total_score'],
+            'question_count': len(question_ids),
+        }])
+    db.session.commit()
+    if user_id:
+        skill_index.set_test_scores(user_id, graded['scores'], session.domain)
+
+    return jsonify({
+        'session_id':      session.id,
+        'domain':          session.domain,
+        'total_questions': len(question_ids),
+        **graded,
+    }), 200
 
 
 # ----------------------------------------
@@ -121,23 +269,19 @@ def calculate_skill_gap():
     domain       = body.get('domain', '').lower().strip()
     user_scores  = {k.lower(): float(v) for k, v in body.get('scores', {}).items()}
 
+    etag = compute_etag('skill-gap', {'domain': domain, 'scores': user_scores}, 'skill_gap_benchmark.json')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     # ── Load benchmark ────────────────────────────────────────────────────────
-    benchmark_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skill_gap_benchmark.json'
-    )
     try:
-        with open(benchmark_file, 'r', encoding='utf-8') as f:
-            benchmarks = json.load(f)
+        benchmarks = load_data('skill_gap_benchmark.json')
     except FileNotFoundError:
         return jsonify({'error': 'Benchmark file not found.'}), 404
 
-    # ── Match domain to role (exact then fuzzy) ───────────────────────────────
-    matched = next((b for b in benchmarks if b['domain'].lower() == domain), None)
-    if not matched:
-        matched = next((b for b in benchmarks
-                        if domain in b['domain'].lower() or b['domain'].lower() in domain), None)
-    if not matched:
-        matched = benchmarks[0]  # safe fallback
+    # ── Match domain to role (exact, then fuzzy, then the first as fallback) ──
+    matched = benchmarks[match_benchmark(benchmarks, domain)]
 
     role             = matched['role']
     benchmark_skills = {k.lower(): float(v) for k, v in matched['skills'].items()}
@@ -186,7 +330,7 @@ def calculate_skill_gap():
     total_gap    = round(sum_w_gaps / sum_weights, 4) if sum_weights else 0.0
     readiness    = round((1 - total_gap) * 100, 1)
 
-    return jsonify({
+    return json_response({
         'role':    role,
         'domain':  domain,
         'skill_results': skill_results,
@@ -203,7 +347,62 @@ def calculate_skill_gap():
             'total_gap':      f'total_gap   = Σ w_gaps / Σ weights  =  {sum_w_gaps} / {sum_weights}  =  {total_gap}',
             'readiness':      f'readiness   = (1 − {total_gap}) × 100  =  {readiness}%',
         },
-    }), 200
+    }, etag=etag)
+
+
+# ----------------------------------------
+# What-if Simulator Route
+# ----------------------------------------
+@app.route('/api/skill-gap/simulate', methods=['POST', 'OPTIONS'])
+def simulate_skill_gap():
+    """
+    POST /api/skill-gap/simulate
+    Body: {
+      "scores":    { "python": 0.67, "sql": 0.8 },
+      "skills":    ["python", "sql"],                 (career match, optional)
+      "interests": ["data science"],                  (career match, optional)
+      "domain":    "data science",                    (rank gains for this role, optional)
+      "steps":     [0.1, 0.2],                        (default [0.1])
+      "mode":      "add" | "scale",                   (+step, or ×(1+step); capped at 1.0)
+      "scenarios": [{ "python": 0.9 }, …]             (score overrides, optional)
+    }
+    Returns readiness and career-match % for every role, the gain from
+    raising each skill by each step in turn, and each scenario's scores.
+    Per-role values are lists in the order of `roles`.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+
+    body = request.get_json(force=True) or {}
+    try:
+        scores    = {k.lower().strip(): float(v) for k, v in (body.get('scores') or body.get('test_scores') or {}).items()}
+        skills    = [str(s).lower().strip() for s in body.get('skills') or []]
+        interests = [str(i).lower().strip() for i in body.get('interests') or []]
+        domain    = str(body.get('domain') or '').lower().strip()
+        steps     = [float(s) for s in body.get('steps') or [0.1]]
+        mode      = str(body.get('mode') or 'add')
+        scenarios = [{k.lower().strip(): float(v) for k, v in sc.items()} for sc in body.get('scenarios') or []]
+    except (TypeError, ValueError, AttributeError) as exc:
+        return jsonify({'error': f'Invalid simulation request: {exc}'}), 400
+    if mode not in STEP_MODES:
+        return jsonify({'error': f"mode must be one of {', '.join(STEP_MODES)}."}), 400
+    if not 0 < len(steps) <= MAX_STEPS or not all(0 < s <= 1 for s in steps):
+        return jsonify({'error': f'steps must be 1–{MAX_STEPS} numbers in (0, 1].'}), 400
+    if len(scenarios) > MAX_SCENARIOS:
+        return jsonify({'error': f'At most {MAX_SCENARIOS} scenarios per request.'}), 400
+
+    inputs = {'scores': scores, 'skills': skills, 'interests': interests, 'domain': domain,
+              'steps': steps, 'mode': mode, 'scenarios': scenarios}
+    etag = compute_etag('skill-gap-simulate', inputs, 'skill_gap_benchmark.json')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    try:
+        matrix = get_benchmark_matrix()
+    except FileNotFoundError:
+        return jsonify({'error': 'Benchmark file not found.'}), 404
+    return json_response(matrix.simulate(**inputs), etag=etag)
 
 
 # ----------------------------------------
@@ -213,7 +412,8 @@ def calculate_skill_gap():
 def get_user_test():
     """
     GET /api/mcq/user-test?domain=data+science&skills=python,pandas,sql
-    Returns 3 questions per matched skill from the domain JSON file.
+    Returns 3 questions per matched skill from the domain JSON file, without
+    answers, and the session_id to submit them to /api/mcq/submit.
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
@@ -222,80 +422,20 @@ def get_user_test():
     skills_param = request.args.get('skills', '')
     skills  = [s.strip().lower() for s in skills_param.split(',') if s.strip()]
 
-    # Map domain/interest name → JSON filename
-    DOMAIN_FILES = {
-        'web development':    'WebDevelopment.json',
-        'web developer':      'WebDevelopment.json',
-        'frontend':           'WebDevelopment.json',
-        'full-stack':         'WebDevelopment.json',
-        'full stack':         'WebDevelopment.json',
-        'data science':       'DataScience.json',
-        'data scientist':     'DataScience.json',
-        'machine learning':   'DataScience.json',
-        'ai engineer':        'AIEngineer.json',
-        'ai engineering':     'AIEngineer.json',
-        'artificial intelligence': 'AIEngineer.json',
-        'software engineer':  'SoftwareEngineering.json',
-        'software engineering': 'SoftwareEngineering.json',
-        'data analyst':       'DataAnalyst.json',
-        'business analyst':   'DataAnalyst.json',
-    }
-
-    filename = DOMAIN_FILES.get(domain)
-    if not filename:
-        for key, val in DOMAIN_FILES.items():
-            if key in domain or domain in key:
-                filename = val
-                break
-    if not filename:
-        filename = 'WebDevelopment.json'  # sensible default
-
-    data_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', filename
-    )
-
+    filename = bank_for_domain(domain)
     try:
-        with open(data_file, 'r', encoding='utf-8') as f:
-            all_questions = json.load(f)
+        bank = get_bank(filename)
     except FileNotFoundError:
         return jsonify({'error': f'Question bank not found: {filename}'}), 404
     except json.JSONDecodeError as e:
         return jsonify({'error': f'Malformed JSON in {filename}: {str(e)}'}), 500
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 500
 
-    # Group questions by skill (handle both 'language' and 'skill' field)
-    by_skill = {}
-    for q in all_questions:
-        skill_key = q.get('language', q.get('skill', 'general')).lower()
-        by_skill.setdefault(skill_key, []).append(q)
-
-    # Match user skills to available skill groups (substring matching)
-    if skills:
-        matched = []
-        for user_skill in skills:
-            for bank_skill in by_skill:
-                if user_skill in bank_skill or bank_skill in user_skill:
-                    if bank_skill not in matched:
-                        matched.append(bank_skill)
-        if not matched:
-            matched = list(by_skill.keys())[:5]
-    else:
-        matched = list(by_skill.keys())
-
-    # Pick 3 questions per matched skill (easy → medium → advanced preference)
-    result = []
-    for skill in matched:
-        pool = by_skill[skill].copy()
-        random.shuffle(pool)
-        for q in pool[:3]:
-            result.append({
-                'skill':      q.get('language', q.get('skill', skill)),
-                'difficulty': q.get('difficulty', 'medium'),
-                'question':   q['question'],
-                'options':    q['options'],
-                'answer':     q.get('answer', q.get('correct_answer', '')),
-            })
-
-    return jsonify(result), 200
+    # 3 questions per matched skill; answers stay on the server
+    question_ids = bank.select(skills)
+    session = _issue_session(bank, domain, question_ids)
+    return jsonify(_session_payload(session, [bank.public_question(q) for q in question_ids])), 200
 
 
 # ----------------------------------------
@@ -308,6 +448,8 @@ def parse_resume_route():
     Accepts: multipart/form-data with key 'resume' (PDF only)
     Returns: JSON with extracted skills, experience, projects, metadata
     Firestore saving is handled client-side via Firebase SDK.
+    For a signed-in user, pages unchanged since their last upload are
+    reused; metadata.reparsed_pages lists the pages sent to Gemini.
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
@@ -320,33 +462,49 @@ def parse_resume_route():
     if not file or file.filename == '':
         return jsonify({'error': 'No file selected.'}), 400
 
-    # Validate PDF — extension + MIME type
-    import os as _os
-    ext = _os.path.splitext(file.filename.lower())[1]
-    mime = file.content_type or ''
-    if ext != '.pdf' or 'pdf' not in mime:
-        rejected = ext.lstrip('.').upper() or mime
-        return jsonify({
-            'error': f'Invalid file type ({rejected}). Only PDF resumes are accepted.',
-            'allowed': ['PDF'],
-        }), 415
+    rejected = pdf_upload_error(file.filename, file.content_type)
+    if rejected:
+        return jsonify(rejected), 415
 
     # Parse PDF with PyMuPDF
     try:
         from services.resume_parser import parse_resume_from_bytes
         pdf_bytes = file.read()
-        parsed = parse_resume_from_bytes(pdf_bytes, filename=file.filename)
+        with get_admission().admit('resume_parse', client_identity()):
+            owner = _optional_identity()
+            parsed = parse_resume_from_bytes(pdf_bytes, filename=file.filename, owner=owner)
     except ImportError:
         return jsonify({'error': 'Resume parser not available. Install pymupdf: pip install pymupdf'}), 500
+    except AdmissionRejected:
+        raise
     except Exception as exc:
         return jsonify({'error': f'PDF parsing failed: {str(exc)}'}), 500
 
-    return jsonify({
+    if owner:
+        skill_index.set_resume_skills(owner, parsed.get('skills', []))
+    return jsonify(resume_response(parsed)), 200
+
+
+def pdf_upload_error(filename: str, content_type: str) -> dict | None:
+    """Error payload (HTTP 415) unless the upload is a PDF by extension and MIME type."""
+    ext = os.path.splitext(filename.lower())[1]
+    mime = content_type or ''
+    if ext != '.pdf' or 'pdf' not in mime:
+        rejected = ext.lstrip('.').upper() or mime
+        return {
+            'error': f'Invalid file type ({rejected}). Only PDF resumes are accepted.',
+            'allowed': ['PDF'],
+        }
+    return None
+
+
+def resume_response(parsed: dict) -> dict:
+    return {
         'skills':     parsed.get('skills',     []),
         'experience': parsed.get('experience', []),
         'projects':   parsed.get('projects',   []),
         'metadata':   parsed.get('metadata',   {}),
-    }), 200
+    }
 
 
 # ----------------------------------------
@@ -357,7 +515,9 @@ def github_scrape_route():
     """
     POST /api/github/scrape
     Body: { "url": "https://github.com/user/repo" }
-    Returns: JSON with repo metadata and AI analysis
+    Returns: JSON with repo metadata and AI analysis; 429 with Retry-After
+    when the GitHub quota would hold the request longer than the scraper's
+    rate-limit wait budget
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
@@ -368,15 +528,73 @@ def github_scrape_route():
     if not url:
         return jsonify({'error': 'GitHub URL is required.'}), 400
 
+    from services.repo_scraper import scrape_github_repo, RateLimitExceeded
     try:
-        from services.repo_scraper import scrape_github_repo
-        result = scrape_github_repo(url)
+        with get_admission().admit('github_scrape', client_identity()):
+            result = scrape_github_repo(url)
         return jsonify(result), 200
+    except AdmissionRejected:
+        raise
+    except RateLimitExceeded as e:
+        return jsonify({'error': str(e)}), 429, {'Retry-After': str(e.retry_after)}
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Scraping failed: {str(e)}'}), 500
+
+
+# ----------------------------------------
+# GitHub Batch Scrape Route
+# ----------------------------------------
+@app.route('/api/github/scrape-batch', methods=['POST', 'OPTIONS'])
+def github_scrape_batch_route():
+    """
+    POST /api/github/scrape-batch
+    Body: { "username": "octocat" }  or  { "urls": ["https://github.com/user/repo", ...] }
+    Streams newline-delimited JSON: one {"type": "repo", "data": {...}} line per
+    repo as soon as it is scraped, then a final {"type": "profile", "data": {...}}
+    line with the aggregated tech-stack summary.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({}), 200
+
+    body = request.get_json(force=True) or {}
+    username = (body.get('username') or '').strip()
+    urls = [u for u in body.get('urls', []) if isinstance(u, str) and u.strip()]
+
+    if not username and not urls:
+        return jsonify({'error': 'A GitHub username or a list of repo URLs is required.'}), 400
+
+    from services.repo_scraper import scrape_github_profile, GitHubHTTPError
+    # Held until the stream ends (released in generate() or on any early return)
+    ticket = get_admission().admit('github_batch', client_identity())
+    try:
+        events = scrape_github_profile(username=username or None, urls=urls or None)
+        first = next(events)   # surface bad input / listing errors as a normal JSON error
     except ValueError as e:
+        ticket.release()
         return jsonify({'error': str(e)}), 400
+    except GitHubHTTPError as e:
+        ticket.release()
+        if e.code == 404:
+            return jsonify({'error': f"GitHub user '{username}' not found."}), 404
+        return jsonify({'error': f'Could not list repositories (HTTP {e.code})'}), 502
     except Exception as e:
+        ticket.release()
         return jsonify({'error': f'Scraping failed: {str(e)}'}), 500
 
+    def generate():
+        try:
+            yield json.dumps(first) + '\n'
+            for event in events:
+                yield json.dumps(event) + '\n'
+        except Exception as e:
+            yield json.dumps({'type': 'error', 'error': f'Scraping failed: {str(e)}'}) + '\n'
+        finally:
+            ticket.release()
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson'), 200
+
 
 # ----------------------------------------
 # Error handlers
@@ -393,6 +611,10 @@ def unauthorized(error):
 def not_found(error):
     return jsonify({'error': 'Not found', 'message': 'Resource not found'}), 404
 
+@app.errorhandler(AdmissionRejected)
+def admission_rejected(error):
+    return jsonify(error.payload()), 429, {'Retry-After': str(error.retry_after)}
+
 @app.errorhandler(500)
 def internal_error(error):
     db.session.rollback()
@@ -403,12 +625,31 @@ def internal_error(error):
 # ----------------------------------------
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    """Liveness: the process is up and serving requests."""
     return jsonify({
         'status': 'healthy',
         'service': 'SkillBridge API',
-        'version': '1.0.0'
+        'version': '1.0.0',
+        'ready': readiness.ready,
     }), 200
 
+@app.route('/api/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness: warm-up finished (or was not requested), 503 otherwise."""
+    report = readiness.to_dict()
+    return jsonify(report), 200 if report['ready'] else 503
+
+# ----------------------------------------
+# Metrics (Prometheus text format, see utils/metrics.py)
+# ----------------------------------------
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    rendered = render_metrics()
+    if rendered is None:
+        return jsonify({'error': 'prometheus_client is not installed'}), 503
+    body, content_type = rendered
+    return Response(body, content_type=content_type)
+
 # ----------------------------------------
 # Request Logging
 # ----------------------------------------
@@ -416,6 +657,9 @@ def health_check():
 def before_request():
     app.logger.info(f'{request.method} {request.path}')
 
+instrument_flask(app)
+install_profiler(app)
+
 # ----------------------------------------
 # Register blueprints
 # ----------------------------------------
@@ -440,6 +684,16 @@ except Exception as e:
     print(f"\u26a0 Blueprint registration error: {e}")
     traceback.print_exc()
 
+try:
+    from routes.history_routes import history_bp
+    from routes.skill_query_routes import skill_query_bp
+    app.register_blueprint(history_bp,     url_prefix='/api/history')
+    app.register_blueprint(skill_query_bp, url_prefix='/api/skills')
+except Exception as e:
+    import traceback
+    print(f"\u26a0 History blueprint registration error: {e}")
+    traceback.print_exc()
+
 # ----------------------------------------
 # Database CLI Commands
 # ----------------------------------------
@@ -454,6 +708,11 @@ def drop_db():
         db.drop_all()
         print('✓ Database dropped')
 
+@app.cli.command('warmup')
+def warmup_command():
+    """Run the warm-up phase once and print the step timings."""
+    print(json.dumps(warm_up(app), indent=2))
+
 # ----------------------------------------
 # Run Server
 # ----------------------------------------
@@ -472,143 +731,40 @@ def roadmap_generate():
       "test_scores": { "python": 0.67, ... },
       "skill_results": { "python": { gap:0.23, status:"moderate", user_score:0.67, required:0.9 } },
       "totals":      { readiness:69, total_gap:0.31 },
-      "swot":        { strengths:[...], weaknesses:[...], opportunities:[...], threats:[...] }
+      "swot":        { strengths:[...], weaknesses:[...], opportunities:[...], threats:[...] },
+      "enrich":      false,     // optional: let Gemini refine the local roadmap
+      "previous_roadmap": {...} // optional: roadmap to update incrementally
     }
-    Returns structured roadmap JSON.
+    Returns structured roadmap JSON, built locally by services/roadmap_generator.py
+    ("source": "local").  With "enrich": true (or ?enrich=1) and a configured
+    GEMINI_API_KEY, Gemini refines that draft ("source": "gemini"); if it is
+    unavailable or fails, the local roadmap is returned with an "enrichment" note.
+
+    Roadmaps are stored per signed-in user and role.  When a previous roadmap
+    exists (stored, or sent as "previous_roadmap"), only the phases whose
+    skills changed are rebuilt and, when enriching, only those are sent to
+    Gemini; "regenerated_phases" lists their phase numbers.
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
 
-    api_key = os.getenv('GEMINI_API_KEY', '')
-    if not api_key or api_key == 'your-gemini-api-key-here':
-        return jsonify({'error': 'GEMINI_API_KEY not configured in backend/.env'}), 503
-
-    body         = request.get_json(force=True) or {}
-    role         = body.get('role', 'unknown')
-    match_pct    = body.get('match_pct', 0)
-    profile      = body.get('profile', {})
-    test_scores  = body.get('test_scores', {})
-    skill_results= body.get('skill_results', {})
-    totals       = body.get('totals', {})
-    swot         = body.get('swot', {})
-
-    # Build skill gap lines
-    skill_lines = []
-    for skill, info in skill_results.items():
-        u = round(info.get('user_score', 0) * 100)
-        r = round(info.get('required', 0) * 100)
-        g = round(info.get('gap', 0) * 100)
-        st = info.get('status', '')
-        skill_lines.append(f"  - {skill.title()}: scored {u}% | required {r}% | gap {g}% | {st}")
-
-    # Build test score lines (fallback)
-    test_lines = []
-    for skill, sc in test_scores.items():
-        test_lines.append(f"  - {skill.title()}: {round(float(sc)*100)}%")
-
-    # Build SWOT summary
-    swot_str = ''
-    for key in ['strengths', 'weaknesses', 'opportunities', 'threats']:
-        items = swot.get(key, [])
-        if items:
-            titles = [i.get('title', i) if isinstance(i, dict) else str(i) for i in items]
-            swot_str += f"\n{key.upper()}: {', '.join(titles)}"
-
-    # Load JobInfo
-    job_info_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'JobInfo.json'
-    )
-    job_context = ''
-    try:
-        with open(job_info_file, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
-        matched_job = next(
-            (r for r in job_data.get('roles', [])
-             if r['title'].lower().replace(' ', '') == role.lower().replace(' ', '')),
-            None
-        )
-        if matched_job:
-            job_context = (
-                f"\nRole Description: {matched_job['description']}\n"
-                f"Core Industry Skills: {', '.join(matched_job['core_skills'])}\n"
-            )
-    except Exception:
-        pass
-
-    context = f"""
-Student Profile:
-- Name:            {profile.get('name', 'Student')}
-- Target Role:     {role}
-- Career Match:    {match_pct}%
-- Domain:          {profile.get('domain', '')}
-- Skills Listed:   {', '.join(profile.get('skills', [])) or 'not specified'}
-- Interests:       {', '.join(profile.get('interests', [])) or 'not specified'}
-- Education:       {profile.get('education', 'not specified')}
-- University:      {profile.get('university', 'not specified')}
-- Year of Study:   {profile.get('currentYear', 'not specified')}
-- Career Readiness:{totals.get('readiness', 'N/A')}%
-
-Skill Gap Analysis:
-{chr(10).join(skill_lines) or chr(10).join(test_lines) or '  (No assessment taken yet)'}
-
-SWOT Summary:{swot_str or ' Not available'}
-
-{job_context}
-"""
-
-    SYSTEM_PROMPT = (
-        "You are a career guide and counsellor whose aim is to guide and show direction to computer and IT college students. "
-        "You are given student information, test scores, skill gap scores, and career matching percentage. "
-        "On the basis of given inputs, provide the student a clear and structured roadmap to overcome weaknesses and become "
-        "a professional in the desired career. Include industry-recognized projects and resources used in the recommended role. "
-        "Note: Never generate fake or incorrect roadmaps."
-    )
+    body   = request.get_json(force=True) or {}
+    enrich = bool(body.get('enrich')) or request.args.get('enrich') == '1'
+    invalid = inputs_error(body.get('skill_results'), body.get('test_scores'))
+    if invalid:
+        return jsonify({'error': invalid}), 400
 
-    prompt = (
-        f"Generate a detailed career roadmap for a student targeting the role of '{role}'.\n\n"
-        "Return ONLY valid JSON in EXACTLY this structure, no markdown, no extra text:\n"
-        "{\n"
-        '  "role": "...",\n'
-        '  "summary": "2-3 sentence personalised roadmap overview",\n'
-        '  "total_duration": "e.g. 6–12 months",\n'
-        '  "phases": [\n'
-        '    {\n'
-        '      "phase_number": 1,\n'
-        '      "title": "Phase title (e.g. Foundation — Month 1-2)",\n'
-        '      "duration": "e.g. 1-2 months",\n'
-        '      "goals": ["goal1", "goal2"],\n'
-        '      "skills_to_learn": ["skill1", "skill2"],\n'
-        '      "projects": [{"name": "Project name", "description": "1-2 sentences", "tech_stack": ["tech1"]}],\n'
-        '      "resources": [{"title": "Resource name", "type": "book|course|docs|youtube|tool", "url_or_platform": "e.g. Coursera, YouTube, docs.python.org"}]\n'
-        '    }\n'
-        '  ],\n'
-        '  "final_milestones": ["milestone1", "milestone2"],\n'
-        '  "job_ready_checklist": ["item1", "item2"]\n'
-        "}\n\n"
-        "Include 4 phases. Each phase should have 2-3 projects and 3-4 resources. Be specific and actionable."
-    )
+    with get_admission().admit('roadmap_enrich' if enrich else 'roadmap', client_identity()):
+        job = RoadmapJob(body, uid=_optional_identity(), enrich=enrich)
 
-    try:
-        client   = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            config=types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT),
-            contents=context + '\n\n' + prompt,
-        )
-        raw = response.text.strip()
-        if raw.startswith('```'):
-            raw = raw.split('```')[1]
-            if raw.startswith('json'):
-                raw = raw[4:]
-            raw = raw.strip()
-        roadmap = json.loads(raw)
-        return jsonify(roadmap), 200
-
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Gemini returned non-JSON response.', 'raw': raw[:500]}), 502
-    except Exception as e:
-        import traceback; traceback.print_exc()
-        return jsonify({'error': str(e), 'type': type(e).__name__}), 500
+        # ── Optional enrichment pass (Gemini) ─────────────────────────────────
+        if job.needs_gemini():
+            try:
+                response = generate_content('roadmap', job.contents, job.system_prompt, api_key=job.api_key)
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+        return jsonify(job.finish()), 200
 
 
 # ----------------------------------------
@@ -633,34 +789,27 @@ def career_match():
     interests   = [i.lower().strip() for i in body.get('interests', [])]
     test_scores = {k.lower(): float(v) for k, v in body.get('test_scores', {}).items()}
 
+    etag = compute_etag('career-match', {'skills': user_skills, 'interests': interests, 'test_scores': test_scores},
+                        'skill_gap_benchmark.json', 'JobInfo.json')
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
     # Load benchmark
-    benchmark_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'skill_gap_benchmark.json'
-    )
     try:
-        with open(benchmark_file, 'r', encoding='utf-8') as f:
-            benchmarks = json.load(f)
+        benchmarks = load_data('skill_gap_benchmark.json')
     except FileNotFoundError:
         return jsonify({'error': 'Benchmark file not found.'}), 404
 
     # Load JobInfo for descriptions and salaries
-    job_info_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'JobInfo.json'
-    )
     job_info_map = {}
     try:
-        with open(job_info_file, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
+        job_data = load_data('JobInfo.json')
         for r in job_data.get('roles', []):
             job_info_map[r['title'].lower().replace(' ', '')] = r
     except Exception:
         pass
 
-    # ── Weights (must sum to 1.0) ─────────────────────────────────────────────
-    W_TEST     = 0.45
-    W_SKILL    = 0.35
-    W_INTEREST = 0.20
-
     results = []
 
     for bench in benchmarks:
@@ -748,7 +897,7 @@ def career_match():
     results.sort(key=lambda x: x['career_score'], reverse=True)
     top3 = results[:3]
 
-    return jsonify({
+    return json_response({
         'top_matches': top3,
         'all_scores':  [{'role': r['role'], 'match_pct': r['match_pct']} for r in results],
         'weights_used': { 'test_alignment': W_TEST, 'skill_overlap': W_SKILL, 'interest_match': W_INTEREST },
@@ -759,7 +908,7 @@ def career_match():
             'career_score':    "career_score    = 0.45×test + 0.35×skill + 0.20×interest",
             'match_pct':       "match_pct       = career_score × 100",
         },
-    }), 200
+    }, etag=etag)
 
 
 # ----------------------------------------
@@ -776,142 +925,36 @@ def swot_analyze():
       "skill_results": { "python": { "required": 0.9, "user_score": 0.67, "gap": 0.23, "status": "moderate" } },
       "totals": { "total_gap": 0.31, "readiness": 69.0 }
     }
-    Returns: { "strengths": [...], "weaknesses": [...], "opportunities": [...], "threats": [...] }
+    Returns: { "strengths": [...], "weaknesses": [...], "opportunities": [...], "threats": [...],
+               "source": "gemini" | "local", "enrichment"?: { status, reason } }
+    Strengths and weaknesses are computed locally; Gemini (when configured)
+    writes opportunities and threats and rewords the rest.
     """
     if request.method == 'OPTIONS':
         return jsonify({}), 200
 
-    api_key = os.getenv('GEMINI_API_KEY', '')
-    if not api_key or api_key == 'your-gemini-api-key-here':
-        return jsonify({'error': 'GEMINI_API_KEY not configured in backend/.env'}), 503
-
-    body         = request.get_json(force=True) or {}
-    profile      = body.get('profile', {})
-    skill_results= body.get('skill_results', {})
-    totals       = body.get('totals', {})
-    test_scores  = body.get('test_scores', {})   # raw MCQ scores as fallback
-
-    # Pull fields from profile
-    domain       = profile.get('domain', 'unknown')
-    role         = profile.get('role', '') or domain
-    skills       = profile.get('skills', [])
-    name         = profile.get('name', 'Student')
-    education    = profile.get('education', '')
-    university   = profile.get('university', '')
-    year         = profile.get('currentYear', '')
-    interests    = profile.get('interests', [])
-
-    # Load JobInfo for role context
-    job_info_file = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'JobInfo.json'
-    )
-    job_context = ''
-    try:
-        with open(job_info_file, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
-        matched_job = next(
-            (r for r in job_data.get('roles', [])
-             if r['title'].lower().replace(' ', '') == role.lower().replace(' ', '')),
-            None
-        )
-        if not matched_job:
-            matched_job = next(
-                (r for r in job_data.get('roles', [])
-                 if domain.lower() in r['title'].lower() or r['title'].lower() in domain.lower()),
-                None
-            )
-        if matched_job:
-            job_context = (
-                f"\nJob Role Info — {matched_job['title']}:\n"
-                f"Description: {matched_job['description']}\n"
-                f"Core Skills Required: {', '.join(matched_job['core_skills'])}\n"
-                f"India Salary Range: {matched_job['approx_salary'].get('India', {})}\n"
-            )
-    except Exception:
-        pass
-
-    # Build skill gap summary (from full skill_results if available)
-    skill_lines = []
-    for skill, info in skill_results.items():
-        status = info.get('status', '')
-        u = round(info.get('user_score', 0) * 100)
-        r = round(info.get('required', 0) * 100)
-        g = round(info.get('gap', 0) * 100)
-        skill_lines.append(f"  - {skill.title()}: scored={u}% | required={r}% | gap={g}% | status={status}")
-
-    # Fallback: use raw test_scores if skill_gap wasn't run
-    if not skill_lines and test_scores:
-        for skill, score in test_scores.items():
-            skill_lines.append(f"  - {skill.title()}: MCQ score={round(float(score)*100)}%")
-
-    skill_summary = '\n'.join(skill_lines) if skill_lines else '  (Assessment not yet taken — analysis will be based on profile only)'
-
-    readiness = totals.get('readiness', 'N/A')
-    total_gap = totals.get('total_gap', 'N/A')
-    user_skills = ', '.join(skills) if skills else 'not specified'
-    user_interests = ', '.join(interests) if interests else 'not specified'
-
-    context = f"""
-Student Profile:
-- Name: {name}
-- Domain of Interest: {domain}
-- Target Role: {role}
-- Listed Skills: {user_skills}
-- Interests: {user_interests}
-- Education Level: {education or 'not specified'}
-- University / College: {university or 'not specified'}
-- Current Year of Study: {year or 'not specified'}
-- Career Readiness Score: {readiness}{'%' if isinstance(readiness, (int,float)) else ''}
-- Total Weighted Skill Gap: {total_gap}
-
-Skill-by-Skill Assessment:
-{skill_summary}
-{job_context}
-"""
-
-    prompt = (
-        "Based on the student profile above, generate a detailed SWOT analysis.\n\n"
-        "Respond ONLY with valid JSON in this exact format, no markdown, no extra text:\n"
-        "{\n"
-        '  "strengths":     [{"title": "...", "explanation": "..."}],\n'
-        '  "weaknesses":    [{"title": "...", "explanation": "..."}],\n'
-        '  "opportunities": [{"title": "...", "explanation": "..."}],\n'
-        '  "threats":       [{"title": "...", "explanation": "..."}]\n'
-        "}\n\n"
-        "Each array must have 3–5 items. Be specific, actionable, and concise."
-    )
+    body = request.get_json(force=True) or {}
+    invalid = inputs_error(body.get('skill_results'), body.get('test_scores'))
+    if invalid:
+        return jsonify({'error': invalid}), 400
+    job  = SwotJob(body)
+    if job.needs_gemini():
+        with get_admission().admit('swot', client_identity()):
+            try:
+                response = generate_content('swot', job.contents, job.system_prompt, api_key=job.api_key)
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+    return jsonify(job.finish()), 200
 
-    SYSTEM_PROMPT = (
-        "You are a career mentor and guide whose primary task is to provide SWOT analysis to students. "
-        "Given the skill gap of students, provide Strengths, Weaknesses, Opportunities, and Threats "
-        "with reasonable, actionable explanations. "
-        "Provide your explanation in a structured way. "
-        "If the information given is incomplete, respond with: "
-        '{"error": "Incomplete data to analyse"}.'
-    )
 
-    try:
-        client   = genai.Client(api_key=api_key)
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            config=types.GenerateContentConfig(system_instruction=SYSTEM_PROMPT),
-            contents=context + '\n\n' + prompt,
-        )
-        raw = response.text.strip()
-        # Strip markdown fences if present
-        if raw.startswith('```'):
-            raw = raw.split('```')[1]
-            if raw.startswith('json'):
-                raw = raw[4:]
-        swot = json.loads(raw)
-        return jsonify(swot), 200
-
-    except json.JSONDecodeError:
-        return jsonify({'error': 'Gemini returned non-JSON response.', 'raw': raw[:500]}), 502
-    except Exception as e:
-        import traceback
-        traceback.print_exc()          # prints full trace to Flask console
-        return jsonify({'error': str(e), 'type': type(e).__name__}), 500
+# ----------------------------------------
+# Warm-up (optional, WARMUP=1)
+# ----------------------------------------
+# Runs at import, so gunicorn/flask only hand this worker traffic afterwards.
+if os.getenv('WARMUP', '0') == '1':
+    _report = warm_up(app)
+    print(f"\u2713 Warm-up {_report['state']} in {_report.get('warmup_ms', 0)} ms")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,176 @@
+"""
+assessment_engine.py
+────────────────────
+Question selection and server-side grading for assessment sessions.
+
+Each question bank (a /data/*.json file, or the built-in sample MCQs) is
+compiled once per process into flat numpy arrays:
+
+  answer_key[q]    index of the correct option of question q
+  skill_code[q]    integer code of q's skill (index into `skills`)
+  option_index[q]  {option text → option index}, to decode submitted answers
+
+A session only stores the question ids it issued.  Grading a submission is
+then one gather + compare over the sheet and a pair of bincounts for the
+per-skill totals, instead of a per-question loop on every client.
+"""
+
+import random
+import threading
+
+import numpy as np
+
+from utils.data_loader import load_data
+
+# Map domain/interest name → question bank file in /data
+DOMAIN_FILES = {
+    'web development':    'WebDevelopment.json',
+    'web developer':      'WebDevelopment.json',
+    'frontend':           'WebDevelopment.json',
+    'full-stack':         'WebDevelopment.json',
+    'full stack':         'WebDevelopment.json',
+    'data science':       'DataScience.json',
+    'data scientist':     'DataScience.json',
+    'machine learning':   'DataScience.json',
+    'ai engineer':        'AIEngineer.json',
+    'ai engineering':     'AIEngineer.json',
+    'artificial intelligence': 'AIEngineer.json',
+    'software engineer':  'SoftwareEngineering.json',
+    'software engineering': 'SoftwareEngineering.json',
+    'data analyst':       'DataAnalyst.json',
+    'business analyst':   'DataAnalyst.json',
+}
+DEFAULT_BANK = 'WebDevelopment.json'
+
+QUESTIONS_PER_SKILL = 3
+
+
+def bank_for_domain(domain: str) -> str:
+    """Question bank filename for a domain (exact, then substring, then default)."""
+    filename = DOMAIN_FILES.get(domain)
+    if not filename:
+        for key, val in DOMAIN_FILES.items():
+            if key in domain or domain in key:
+                filename = val
+                break
+    return filename or DEFAULT_BANK
+
+
+class QuestionBank:
+    def __init__(self, name: str, questions: list[dict]):
+        self.name = name
+        self.questions = questions
+        self.skills = []
+        skill_codes, answer_key, self.option_index = [], [], []
+        codes = {}
+
+        for q in questions:
+            skill = str(q.get('language', q.get('skill', 'general'))).lower()
+            if skill not in codes:
+                codes[skill] = len(self.skills)
+                self.skills.append(skill)
+            skill_codes.append(codes[skill])
+
+            options = {opt: i for i, opt in enumerate(q['options'])}
+            answer = q.get('answer', q.get('correct_answer', ''))
+            if answer not in options:
+                raise ValueError(f"{name}: answer {answer!r} is not one of the options of {q['question'][:60]!r}")
+            answer_key.append(options[answer])
+            self.option_index.append(options)
+
+        self.skill_code = np.asarray(skill_codes, dtype=np.int32)
+        self.answer_key = np.asarray(answer_key, dtype=np.int16)
+        self.by_skill = {s: np.flatnonzero(self.skill_code == c).tolist() for s, c in codes.items()}
+
+    def select(self, skills: list[str], per_skill: int = QUESTIONS_PER_SKILL) -> list[int]:
+        """
+        Question ids for a test: `per_skill` random questions for every bank
+        skill matching one of `skills` (substring either way), falling back
+        to the first five bank skills when nothing matches.
+        """
+        if skills:
+            matched = []
+            for user_skill in skills:
+                for bank_skill in self.by_skill:
+                    if (user_skill in bank_skill or bank_skill in user_skill) and bank_skill not in matched:
+                        matched.append(bank_skill)
+            if not matched:
+                matched = self.skills[:5]
+        else:
+            matched = list(self.skills)
+
+        ids = []
+        for skill in matched:
+            pool = list(self.by_skill[skill])
+            random.shuffle(pool)
+            ids.extend(pool[:per_skill])
+        return ids
+
+    def public_question(self, qid: int) -> dict:
+        """Client view of a question: no answer."""
+        q = self.questions[qid]
+        return {
+            'id':         qid,
+            'skill':      q.get('language', q.get('skill', 'general')),
+            'difficulty': q.get('difficulty', 'medium'),
+            'question':   q['question'],
+            'options':    q['options'],
+        }
+
+    def grade(self, question_ids: list[int], answers: list) -> dict:
+        """
+        Grade one answer sheet.  `answers[i]` is the chosen option text for
+        the i-th issued question (None / missing = unanswered).
+        Returns per-skill scores keyed like /api/skill-gap/calculate expects.
+        """
+        qids = np.asarray(question_ids, dtype=np.intp)
+        chosen = np.fromiter(
+            (self.option_index[q].get(a, -1) if isinstance(a, str) else -1
+             for q, a in zip(question_ids, answers)),
+            dtype=np.int16, count=len(question_ids),
+        )
+        correct = chosen == self.answer_key[qids]
+        codes = self.skill_code[qids]
+
+        n_skills = len(self.skills)
+        asked = np.bincount(codes, minlength=n_skills)
+        right = np.bincount(codes, weights=correct, minlength=n_skills)
+        present = np.flatnonzero(asked)
+        per_skill = np.round(right[present] / asked[present], 2)
+
+        scores = {self.skills[c]: float(s) for c, s in zip(present, per_skill)}
+        total = round(float(per_skill.mean()), 2) if len(per_skill) else 0.0
+        return {
+            'scores':      scores,
+            'total_score': total,
+            'correct':     int(correct.sum()),
+            'answered':    int((chosen >= 0).sum()),
+            'review': [
+                {'id': int(q), 'correct': bool(ok), 'answer': self.questions[q].get('answer', self.questions[q].get('correct_answer'))}
+                for q, ok in zip(question_ids, correct)
+            ],
+        }
+
+
+_banks = {}
+_lock = threading.Lock()
+
+
+def register_bank(name: str, questions: list[dict]) -> QuestionBank:
+    """Compile and register an in-memory bank (e.g. the sample MCQs in run.py)."""
+    bank = QuestionBank(name, questions)
+    with _lock:
+        _banks[name] = bank
+    return bank
+
+
+def get_bank(name: str) -> QuestionBank:
+    """Compiled bank `name`, loading /data/<name> on first use."""
+    bank = _banks.get(name)
+    if bank is None:
+        with _lock:
+            bank = _banks.get(name)
+            if bank is None:
+                bank = QuestionBank(name, load_data(name))
+                _banks[name] = bank
+    return bank
@@ -0,0 +1,405 @@
+"""
+career_advisor.py
+─────────────────
+Request building and reply handling for the Gemini-backed advice routes
+(/api/roadmap/generate and /api/swot/analyze).
+
+Nothing here talks to Gemini.  The sync Flask views in run.py and the async
+views in asgi.py make the call themselves — `client.models` or
+`client.aio.models` — and share everything else from this module, so both
+serving modes build the same prompts and return the same payloads.
+"""
+
+import os
+import json
+import time
+import logging
+
+from services.roadmap_generator import generate_roadmap, update_roadmap
+from services.swot_engine import job_info, local_swot, swot_inputs
+from storage import get_storage
+
+logger = logging.getLogger(__name__)
+
+# Response-only fields, not stored with the roadmap
+ROADMAP_TRANSIENT_KEYS = ('generated_ms', 'enrichment', 'regenerated_phases')
+
+
+def gemini_api_key() -> str | None:
+    """GEMINI_API_KEY, or None while it is unset / still the .env placeholder."""
+    api_key = os.getenv('GEMINI_API_KEY', '')
+    if not api_key or api_key == 'your-gemini-api-key-here':
+        return None
+    return api_key
+
+
+def strip_json_fences(raw: str) -> str:
+    """Drop a ```json … ``` wrapper around a model reply."""
+    raw = raw.strip()
+    if raw.startswith('```'):
+        raw = raw.split('```')[1]
+        if raw.startswith('json'):
+            raw = raw[4:]
+        raw = raw.strip()
+    return raw
+
+
+# ─── Roadmap ──────────────────────────────────────────────────────────────────
+
+ROADMAP_SYSTEM_PROMPT = (
+    "You are a career guide and counsellor whose aim is to guide and show direction to computer and IT college students. "
+    "You are given student information, test scores, skill gap scores, and career matching percentage. "
+    "On the basis of given inputs, provide the student a clear and structured roadmap to overcome weaknesses and become "
+    "a professional in the desired career. Include industry-recognized projects and resources used in the recommended role. "
+    "Note: Never generate fake or incorrect roadmaps."
+)
+
+_PHASE_SHAPE = (
+    '{\n'
+    '  "phase_number": 1,\n'
+    '  "title": "Phase title (e.g. Foundation — Month 1-2)",\n'
+    '  "duration": "e.g. 1-2 months",\n'
+    '  "goals": ["goal1", "goal2"],\n'
+    '  "skills_to_learn": ["skill1", "skill2"],\n'
+    '  "projects": [{"name": "Project name", "description": "1-2 sentences", "tech_stack": ["tech1"]}],\n'
+    '  "resources": [{"title": "Resource name", "type": "book|course|docs|youtube|tool", "url_or_platform": "e.g. Coursera, YouTube, docs.python.org"}]\n'
+    '}'
+)
+
+
+class RoadmapJob:
+    """
+    One /api/roadmap/generate request.
+
+        job = RoadmapJob(body, uid, enrich)        # loads the stored roadmap, builds locally
+        if job.needs_gemini():
+            try:
+                job.apply(<Gemini reply text for job.contents, job.system_prompt>)
+            except Exception as e:
+                job.fail(e)
+        payload = job.finish()                     # stores the roadmap for `uid`
+
+    The constructor and finish() touch storage (blocking); async callers
+    run them in a thread.
+    """
+
+    system_prompt = ROADMAP_SYSTEM_PROMPT
+
+    def __init__(self, body: dict, uid: str = None, enrich: bool = False):
+        self.body = body
+        self.uid = uid
+        self.enrich = enrich
+        self.role = body.get('role', 'unknown')
+        self.role_key = ' '.join(str(self.role).lower().split())
+        self.api_key = None
+
+        previous = body.get('previous_roadmap')
+        if not isinstance(previous, dict) and uid:
+            try:
+                previous = ((get_storage().get_roadmap(uid) or {}).get('roadmaps') or {}).get(self.role_key)
+            except Exception:
+                logger.exception('[roadmap] could not load stored roadmap')
+                previous = None
+
+        # ── Fast path: deterministic local roadmap, rebuilding changed phases only ─
+        args = (self.role, body.get('skill_results', {}), body.get('test_scores', {}),
+                body.get('profile', {}), body.get('totals', {}))
+        started = time.perf_counter()
+        if isinstance(previous, dict):
+            roadmap, self.regenerated = update_roadmap(previous, *args)
+            roadmap = dict(roadmap)
+        else:
+            roadmap = generate_roadmap(*args)
+            self.regenerated = [p['phase_number'] for p in roadmap['phases']]
+        roadmap.setdefault('source', 'local')
+        roadmap['generated_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        self.roadmap = roadmap
+
+        # Phases Gemini has already refined are kept; only the rest are sent
+        if roadmap['source'] == 'gemini':
+            self.targets = list(self.regenerated)
+        else:
+            self.targets = [p['phase_number'] for p in roadmap['phases']]
+
+    def needs_gemini(self) -> bool:
+        """True when an enrichment call should be made (notes why not otherwise)."""
+        if not self.enrich or not self.targets:
+            return False
+        self.api_key = gemini_api_key()
+        if not self.api_key:
+            self.roadmap['enrichment'] = {'status': 'unavailable', 'reason': 'GEMINI_API_KEY not configured in backend/.env'}
+            return False
+        return True
+
+    @property
+    def whole(self) -> bool:
+        return len(self.targets) == len(self.roadmap['phases'])
+
+    @property
+    def contents(self) -> str:
+        return self._context() + '\n\n' + self._prompt()
+
+    def _context(self) -> str:
+        body = self.body
+        profile, totals, swot = body.get('profile', {}), body.get('totals', {}), body.get('swot', {})
+
+        skill_lines = []
+        for skill, info in body.get('skill_results', {}).items():
+            u = round(info.get('user_score', 0) * 100)
+            r = round(info.get('required', 0) * 100)
+            g = round(info.get('gap', 0) * 100)
+            st = info.get('status', '')
+            skill_lines.append(f"  - {skill.title()}: scored {u}% | required {r}% | gap {g}% | {st}")
+
+        # Test score lines (fallback)
+        test_lines = [f"  - {skill.title()}: {round(float(sc)*100)}%" for skill, sc in body.get('test_scores', {}).items()]
+
+        swot_str = ''
+        for key in ['strengths', 'weaknesses', 'opportunities', 'threats']:
+            items = swot.get(key, [])
+            if items:
+                titles = [i.get('title', i) if isinstance(i, dict) else str(i) for i in items]
+                swot_str += f"\n{key.upper()}: {', '.join(titles)}"
+
+        job_context = ''
+        matched_job = job_info(self.role)
+        if matched_job:
+            job_context = (
+                f"\nRole Description: {matched_job['description']}\n"
+                f"Core Industry Skills: {', '.join(matched_job['core_skills'])}\n"
+            )
+
+        return f"""
+Student Profile:
+- Name:            {profile.get('name', 'Student')}
+- Target Role:     {self.role}
+- Career Match:    {body.get('match_pct', 0)}%
+- Domain:          {profile.get('domain', '')}
+- Skills Listed:   {', '.join(profile.get('skills', [])) or 'not specified'}
+- Interests:       {', '.join(profile.get('interests', [])) or 'not specified'}
+- Education:       {profile.get('education', 'not specified')}
+- University:      {profile.get('university', 'not specified')}
+- Year of Study:   {profile.get('currentYear', 'not specified')}
+- Career Readiness:{totals.get('readiness', 'N/A')}%
+
+Skill Gap Analysis:
+{chr(10).join(skill_lines) or chr(10).join(test_lines) or '  (No assessment taken yet)'}
+
+SWOT Summary:{swot_str or ' Not available'}
+
+{job_context}
+"""
+
+    def _prompt(self) -> str:
+        roadmap = self.roadmap
+        draft_phases = [{k: v for k, v in p.items() if k != 'skill_keys'}
+                        for p in roadmap['phases'] if p['phase_number'] in self.targets]
+        if self.whole:
+            draft = {k: v for k, v in roadmap.items() if k not in ROADMAP_TRANSIENT_KEYS + ('source', 'inputs')}
+            draft['phases'] = draft_phases
+            scope = (
+                "Start from this draft roadmap, built from the student's skill gaps and a curated catalog. "
+                "Keep its phase order and skills; personalise the summary, goals and projects, and replace "
+                "resources only with better, real ones:\n"
+            )
+            shape = (
+                '{\n'
+                '  "role": "...",\n'
+                '  "summary": "2-3 sentence personalised roadmap overview",\n'
+                '  "total_duration": "e.g. 6–12 months",\n'
+                '  "phases": [ PHASE, ... ],\n'
+                '  "final_milestones": ["milestone1", "milestone2"],\n'
+                '  "job_ready_checklist": ["item1", "item2"]\n'
+                '}\n\n'
+                f"Include {len(draft_phases)} phases."
+            )
+        else:
+            draft = {'phases': draft_phases}
+            scope = (
+                "The student's skill gaps changed, so these phases of their existing roadmap were rebuilt "
+                "from a curated catalog. The other phases are unchanged and are not shown. Keep each phase's "
+                "number, title, duration and skills; personalise the goals and projects, and replace "
+                "resources only with better, real ones:\n"
+            )
+            shape = '{\n  "phases": [ PHASE, ... ]\n}\n\n' + f"Return exactly these {len(draft_phases)} phases."
+        return (
+            f"Generate a detailed career roadmap for a student targeting the role of '{self.role}'.\n\n"
+            + scope
+            + f"{json.dumps(draft, ensure_ascii=False)}\n\n"
+            "Return ONLY valid JSON in EXACTLY this structure, no markdown, no extra text:\n"
+            + shape.replace('PHASE', _PHASE_SHAPE)
+            + " Each phase should have 2-3 projects and 3-4 resources. Be specific and actionable."
+        )
+
+    def apply(self, reply: str) -> None:
+        """Splice Gemini's refined phases back in by number; skill_keys stay from the local plan."""
+        enriched = json.loads(strip_json_fences(reply or ''))
+        if not isinstance(enriched, dict) or not isinstance(enriched.get('phases'), list):
+            raise ValueError('Gemini roadmap is missing "phases".')
+
+        roadmap = self.roadmap
+        refined = {p.get('phase_number'): p for p in enriched['phases'] if isinstance(p, dict)}
+        phases = []
+        for phase in roadmap['phases']:
+            new = refined.get(phase['phase_number']) if phase['phase_number'] in self.targets else None
+            phases.append({**phase, **new, 'phase_number': phase['phase_number'],
+                           'skill_keys': phase['skill_keys']} if new else phase)
+        roadmap['phases'] = phases
+        if self.whole:
+            for key in ('summary', 'total_duration', 'final_milestones', 'job_ready_checklist'):
+                if enriched.get(key):
+                    roadmap[key] = enriched[key]
+        roadmap['source'] = 'gemini'
+
+    def fail(self, exc: Exception) -> None:
+        """Keep the local roadmap and note why enrichment failed."""
+        if isinstance(exc, json.JSONDecodeError):
+            self.roadmap['enrichment'] = {'status': 'failed', 'reason': 'Gemini returned non-JSON response.'}
+            return
+        logger.error('[roadmap] Gemini enrichment failed', exc_info=exc)
+        self.roadmap['enrichment'] = {'status': 'failed', 'reason': str(exc), 'type': type(exc).__name__}
+
+    def finish(self) -> dict:
+        """Store the roadmap for the signed-in user and return the response payload."""
+        result = self.roadmap
+        if self.uid:
+            stored = {k: v for k, v in result.items() if k not in ROADMAP_TRANSIENT_KEYS}
+            try:
+                get_storage().save_roadmap(self.uid, {'roadmaps': {self.role_key: stored}})
+            except Exception:
+                logger.exception('[roadmap] could not save roadmap')
+        result['regenerated_phases'] = self.regenerated
+        return result
+
+
+# ─── SWOT ─────────────────────────────────────────────────────────────────────
+
+SWOT_SYSTEM_PROMPT = (
+    "You are a career mentor and guide who writes SWOT analyses for students. "
+    "The strengths and weaknesses have already been derived from the student's skill assessment; "
+    "your job is to write specific, actionable opportunities and threats and to tighten the wording "
+    "of the given items without changing their meaning. Be concise."
+)
+
+SWOT_QUADRANTS = ('strengths', 'weaknesses', 'opportunities', 'threats')
+
+
+class SwotJob:
+    """
+    One /api/swot/analyze request.
+
+        job = SwotJob(body)                         # local skeleton (services/swot_engine.py)
+        if job.needs_gemini():
+            try:
+                job.apply(<Gemini reply text for job.contents, job.system_prompt>)
+            except Exception as e:
+                job.fail(e)
+        payload = job.finish()
+
+    Gemini only writes opportunities and threats and rewords the computed
+    strengths and weaknesses; without it the local skeleton is returned.
+    """
+
+    system_prompt = SWOT_SYSTEM_PROMPT
+
+    def __init__(self, body: dict):
+        self.inputs = swot_inputs(body)
+        self.swot = local_swot(self.inputs)
+        self.source = 'local'
+        self.enrichment = None
+        self.api_key = None
+
+    def needs_gemini(self) -> bool:
+        self.api_key = gemini_api_key()
+        if not self.api_key:
+            self.enrichment = {'status': 'unavailable', 'reason': 'GEMINI_API_KEY not configured in backend/.env'}
+            return False
+        return True
+
+    @property
+    def contents(self) -> str:
+        return self._context() + '\n\n' + self._prompt()
+
+    def _context(self) -> str:
+        inputs = self.inputs
+        profile, totals, job = inputs['profile'], inputs['totals'], inputs['job']
+
+        job_context = ''
+        if job:
+            job_context = (
+                f"\nJob Role Info — {job['title']}:\n"
+                f"Description: {job['description']}\n"
+                f"Core Skills Required: {', '.join(job['core_skills'])}\n"
+                f"India Salary Range: {job['approx_salary'].get('India', {})}\n"
+            )
+
+        skill_lines = []
+        for skill, info in inputs['skill_results'].items():
+            skill_lines.append(f"  - {skill.title()}: scored={round(info.get('user_score', 0) * 100)}% | "
+                               f"required={round(info.get('required', 0) * 100)}% | status={info.get('status', '')}")
+        skill_summary = '\n'.join(skill_lines) or '  (Assessment not yet taken)'
+
+        readiness = totals.get('readiness', 'N/A')
+        return f"""
+Student Profile:
+- Domain of Interest: {inputs['domain']}
+- Target Role: {inputs['role']}
+- Listed Skills: {', '.join(inputs['skills']) or 'not specified'}
+- Interests: {', '.join(profile.get('interests') or []) or 'not specified'}
+- Education Level: {profile.get('education') or 'not specified'}
+- Current Year of Study: {profile.get('currentYear') or 'not specified'}
+- Career Readiness Score: {readiness}{'%' if isinstance(readiness, (int, float)) else ''}
+
+Skill-by-Skill Assessment:
+{skill_summary}
+{job_context}"""
+
+    def _prompt(self) -> str:
+        given = {key: [f"{i['title']}: {i['explanation']}" for i in self.swot[key]]
+                 for key in ('strengths', 'weaknesses')}
+        return (
+            "Computed strengths and weaknesses (already final, in this order):\n"
+            f"{json.dumps(given, ensure_ascii=False)}\n\n"
+            "Respond ONLY with valid JSON in this exact format, no markdown, no extra text:\n"
+            "{\n"
+            '  "opportunities": [{"title": "...", "explanation": "..."}],\n'
+            '  "threats":       [{"title": "...", "explanation": "..."}],\n'
+            '  "strengths":     ["...", ...],\n'
+            '  "weaknesses":    ["...", ...]\n'
+            "}\n\n"
+            "opportunities and threats: 3–4 items each, explanations under 30 words, specific to this student. "
+            "strengths and weaknesses: one rewritten explanation per given item, same order and count, "
+            "under 20 words each."
+        )
+
+    def apply(self, reply: str) -> None:
+        """Take Gemini's opportunities / threats and any well-formed rewrites."""
+        enriched = json.loads(strip_json_fences(reply or ''))
+        if not isinstance(enriched, dict):
+            raise ValueError('Gemini SWOT reply is not a JSON object.')
+        for key in ('opportunities', 'threats'):
+            items = [{'title': str(i['title']), 'explanation': str(i.get('explanation', ''))}
+                     for i in enriched.get(key) or [] if isinstance(i, dict) and i.get('title')]
+            if items:
+                self.swot[key] = items
+        for key in ('strengths', 'weaknesses'):
+            rewrites = enriched.get(key)
+            if (isinstance(rewrites, list) and len(rewrites) == len(self.swot[key])
+                    and all(isinstance(r, str) and r.strip() for r in rewrites)):
+                self.swot[key] = [{**item, 'explanation': r.strip()} for item, r in zip(self.swot[key], rewrites)]
+        self.source = 'gemini'
+
+    def fail(self, exc: Exception) -> None:
+        """Keep the local SWOT and note why enrichment failed."""
+        if isinstance(exc, json.JSONDecodeError):
+            self.enrichment = {'status': 'failed', 'reason': 'Gemini returned non-JSON response.'}
+            return
+        logger.error('[swot] Gemini enrichment failed', exc_info=exc)
+        self.enrichment = {'status': 'failed', 'reason': str(exc), 'type': type(exc).__name__}
+
+    def finish(self) -> dict:
+        result = {key: self.swot[key] for key in SWOT_QUADRANTS}
+        result['source'] = self.source
+        if self.enrichment:
+            result['enrichment'] = self.enrichment
+        return result
@@ -0,0 +1,209 @@
+"""
+gap_engine.py
+─────────────
+Vectorised readiness and career-match scoring against every benchmark
+role at once, for the what-if simulator (POST /api/skill-gap/simulate).
+
+skill_gap_benchmark.json is compiled once per process into dense arrays
+over a shared skill vocabulary:
+
+  weights[r, s]    benchmark weight of skill s for role r (0 = not required)
+  weight_sum[r]    Σ_s weights[r, s]
+
+A batch of score vectors U (scenarios × skills) is then scored against
+every role with a few broadcast operations:
+
+  readiness[n, r] = 100 × (1 − Σ_s max(0, W − U)·W / Σ W)      as /api/skill-gap/calculate
+  match[n, r]     = 100 × (0.45 × Σ_s min(U, W) / Σ W           as /api/career/match
+                           + 0.35 × skill_overlap[r] + 0.20 × interest[r])
+
+Skill overlap and interest depend on the listed skills and interests, not
+on test scores, so they are computed once per request.  The routes round
+every intermediate value to 4 decimals; the simulator does not, so its
+figures can differ from theirs in the last displayed digit.
+"""
+
+import threading
+
+import numpy as np
+
+from utils.data_loader import load_data
+
+# /api/career/match component weights (must sum to 1.0)
+W_TEST     = 0.45
+W_SKILL    = 0.35
+W_INTEREST = 0.20
+
+MAX_SCENARIOS = 10_000
+MAX_STEPS = 10
+STEP_MODES = ('add', 'scale')
+
+
+def match_benchmark(benchmarks: list[dict], domain: str) -> int:
+    """Index of the benchmark for `domain`: exact, then substring either way, else the first."""
+    for i, b in enumerate(benchmarks):
+        if b['domain'].lower() == domain:
+            return i
+    for i, b in enumerate(benchmarks):
+        if domain in b['domain'].lower() or b['domain'].lower() in domain:
+            return i
+    return 0
+
+
+def interest_score(interests: list[str], role_domain: str) -> float:
+    """1.0 exact domain match, 0.6 partial (substring), 0.2 none."""
+    score = 0.2
+    for interest in interests:
+        if interest == role_domain:
+            return 1.0
+        if interest in role_domain or role_domain in interest:
+            score = max(score, 0.6)
+    return score
+
+
+class BenchmarkMatrix:
+    def __init__(self, benchmarks: list[dict]):
+        self.benchmarks = benchmarks
+        self.roles = [b['role'] for b in benchmarks]
+        self.domains = [b['domain'].lower() for b in benchmarks]
+        index = {}
+        for b in benchmarks:
+            for skill in b['skills']:
+                index.setdefault(skill.lower(), len(index))
+        self.skills = list(index)
+        self.index = index
+
+        self.weights = np.zeros((len(benchmarks), len(self.skills)))
+        for r, b in enumerate(benchmarks):
+            for skill, weight in b['skills'].items():
+                self.weights[r, index[skill.lower()]] = float(weight)
+        self.required = self.weights > 0
+        self.weight_sum = self.weights.sum(axis=1)
+        self.required_count = self.required.sum(axis=1)
+
+    # ── Scoring ───────────────────────────────────────────────────────────────
+
+    def score_vector(self, scores: dict) -> np.ndarray:
+        """Scores over the vocabulary; skills no role requires are dropped."""
+        u = np.zeros(len(self.skills))
+        for skill, value in scores.items():
+            s = self.index.get(skill)
+            if s is not None:
+                u[s] = value
+        return u
+
+    def readiness(self, U: np.ndarray) -> np.ndarray:
+        """(n, skills) scores → (n, roles) readiness in percent."""
+        gaps = np.maximum(0.0, self.weights - U[:, None, :])
+        return 100.0 * (1.0 - (gaps * self.weights).sum(axis=2) / self.weight_sum)
+
+    def test_alignment(self, U: np.ndarray) -> np.ndarray:
+        """(n, skills) scores → (n, roles) Σ min(score, weight) / Σ weight."""
+        return np.minimum(U[:, None, :], self.weights).sum(axis=2) / self.weight_sum
+
+    def skill_overlap(self, user_skills: list[str]) -> np.ndarray:
+        """Per role: share of its skills matched by a listed skill (substring either way)."""
+        matched = np.fromiter(
+            (any(us in rs or rs in us for us in user_skills) for rs in self.skills),
+            dtype=bool, count=len(self.skills),
+        )
+        return (self.required & matched).sum(axis=1) / self.required_count
+
+    def interests(self, interests: list[str]) -> np.ndarray:
+        return np.array([interest_score(interests, d) for d in self.domains])
+
+    def career_match(self, U: np.ndarray, overlap: np.ndarray, interest: np.ndarray) -> np.ndarray:
+        """(n, skills) scores → (n, roles) match percentage."""
+        fixed = W_SKILL * overlap + W_INTEREST * interest
+        return 100.0 * (W_TEST * self.test_alignment(U) + fixed)
+
+    # ── Scenarios ─────────────────────────────────────────────────────────────
+
+    def step_grid(self, u: np.ndarray, steps: list[float], mode: str) -> np.ndarray:
+        """One row per (step, skill): `u` with only that skill raised, capped at 1.0."""
+        n_skills = len(self.skills)
+        grid = np.tile(u, (len(steps) * n_skills, 1))
+        rows = np.arange(len(grid))
+        cols = np.tile(np.arange(n_skills), len(steps))
+        step = np.repeat(np.asarray(steps, dtype=float), n_skills)
+        current = u[cols]
+        raised = current + step if mode == 'add' else current * (1.0 + step)
+        grid[rows, cols] = np.minimum(1.0, np.maximum(current, raised))
+        return grid
+
+    def scenario_matrix(self, u: np.ndarray, scenarios: list[dict]) -> np.ndarray:
+        """One row per scenario: `u` with the scenario's {skill: score} overrides."""
+        U = np.tile(u, (len(scenarios), 1))
+        for n, overrides in enumerate(scenarios):
+            for skill, value in overrides.items():
+                s = self.index.get(skill)
+                if s is not None:
+                    U[n, s] = value
+        return U
+
+    def simulate(self, scores: dict, skills: list[str] = (), interests: list[str] = (),
+                 domain: str = '', steps: list[float] = (0.1,), mode: str = 'add',
+                 scenarios: list[dict] = ()) -> dict:
+        """
+        Baseline readiness / match for every role, the gain from raising
+        each skill by every step in turn, and any explicit scenarios.
+        Gains are in percentage points.
+        """
+        u = self.score_vector(scores)
+        overlap, interest = self.skill_overlap(list(skills)), self.interests(list(interests))
+        focus = match_benchmark(self.benchmarks, domain) if domain else None
+
+        base_ready = self.readiness(u[None, :])[0]
+        base_match = self.career_match(u[None, :], overlap, interest)[0]
+
+        n_skills = len(self.skills)
+        grid = self.step_grid(u, list(steps), mode)
+        ready_gain = (self.readiness(grid) - base_ready).reshape(len(steps), n_skills, -1)
+        match_gain = (self.career_match(grid, overlap, interest) - base_match).reshape(len(steps), n_skills, -1)
+
+        marginal = []
+        for k, step in enumerate(steps):
+            rank = ready_gain[k, :, focus] if focus is not None else ready_gain[k].max(axis=1)
+            order = [s for s in np.argsort(-rank, kind='stable') if ready_gain[k, s].max() > 1e-9]
+            marginal.append({
+                'step': step,
+                'mode': mode,
+                'skills': [{
+                    'skill':          self.skills[s],
+                    'score':          round(float(u[s]), 4),
+                    'raised_to':      round(float(grid[k * n_skills + s, s]), 4),
+                    'readiness_gain': np.round(ready_gain[k, s], 2).tolist(),
+                    'match_gain':     np.round(match_gain[k, s], 2).tolist(),
+                } for s in order],
+            })
+
+        result = {
+            'roles':      [{'role': r, 'domain': d} for r, d in zip(self.roles, self.domains)],
+            'focus_role': self.roles[focus] if focus is not None else None,
+            'baseline': {
+                'readiness': np.round(base_ready, 1).tolist(),
+                'match_pct': np.round(base_match, 1).tolist(),
+            },
+            'marginal': marginal,
+        }
+        if scenarios:
+            U = self.scenario_matrix(u, list(scenarios))
+            result['scenarios'] = {
+                'readiness': np.round(self.readiness(U), 1).tolist(),
+                'match_pct': np.round(self.career_match(U, overlap, interest), 1).tolist(),
+            }
+        return result
+
+
+_matrix = None
+_lock = threading.Lock()
+
+
+def get_benchmark_matrix() -> BenchmarkMatrix:
+    """Compiled skill_gap_benchmark.json (raises FileNotFoundError like load_data)."""
+    global _matrix
+    if _matrix is None:
+        with _lock:
+            if _matrix is None:
+                _matrix = BenchmarkMatrix(load_data('skill_gap_benchmark.json'))
+    return _matrix
@@ -1,133 +1,789 @@
 """
 Lightweight GitHub repo information scraper using the GitHub public API.
-Falls back to scraping the page with requests if the API rate-limits or fails.
+
+The repo, languages and README endpoints are fetched concurrently over a small
+pool of keep-alive connections, so a scrape costs one round-trip of latency
+instead of three.  Responses are revalidated through the persistent ETag
+cache in utils/http_cache.py: a 304 is served from disk and does not count
+against GitHub's rate limit.  Concurrent scrapes of the same URL are
+coalesced into one (utils/single_flight.py).  Redirects (GitHub answers
+301 for a renamed or transferred repo) are followed for up to MAX_REDIRECTS
+hops.  Set GITHUB_API_URL to point the scraper at a local stub.
 """
 
 import os
 import re
 import json
-import urllib.request
-import urllib.error
+import math
+import time
+import asyncio
+import codecs
+import threading
+import http.client
+from urllib.parse import urljoin, urlsplit
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.http_cache import get_http_cache
+from utils.analysis_cache import get_analysis_cache
+from utils.genai_client import agenerate_content, generate_content
+from utils.metrics import cache_lookup, span
+from utils.single_flight import SingleFlight, fingerprint
+
+GITHUB_API_URL = os.getenv('GITHUB_API_URL', 'https://api.github.com')
+REQUEST_TIMEOUT = 10          # seconds, per call
+README_CHAR_LIMIT = 3000      # only this much of the README is sent to Gemini
+MAX_REDIRECTS = 3
+REDIRECT_STATUSES = (301, 302, 307, 308)
+# Bump whenever the repo-analysis prompt changes so cached analyses are regenerated
+ANALYSIS_PROMPT_VERSION = '1'
+
+_DEFAULT_HEADERS = {
+    'User-Agent': 'SkillBridge/1.0',
+    'Accept': 'application/vnd.github.v3+json',
+}
+
+
+class GitHubHTTPError(Exception):
+    """Non-2xx response from the GitHub API."""
 
+    def __init__(self, code: int, url: str):
+        super().__init__(f"HTTP {code} for {url}")
+        self.code = code
+        self.url = url
 
-def scrape_github_repo(url: str) -> dict:
+
+# ─── Keep-alive connection pool ───────────────────────────────────────────────
+
+class _ConnectionPool:
+    """
+    Thread-safe pool of idle HTTP(S) connections keyed by (scheme, host, port).
+    A connection is returned to the pool only after its response body has been
+    fully read; anything else is closed.
     """
-    Fetch public metadata for a GitHub repository and analyze with Gemini 2.5 Flash.
 
-    Args:
-        url: GitHub repo URL, e.g. https://github.com/user/repo
+    def __init__(self, max_idle_per_host: int = 8):
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._max_idle = max_idle_per_host
+
+    def acquire(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        key = (scheme, netloc)
+        with self._lock:
+            conns = self._idle.get(key)
+            if conns:
+                return conns.pop()
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(netloc, timeout=REQUEST_TIMEOUT)
+
+    def release(self, scheme: str, netloc: str, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            conns = self._idle.setdefault((scheme, netloc), [])
+            if len(conns) < self._max_idle:
+                conns.append(conn)
+                return
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
+
+
+# ─── Rate-limit scheduler ─────────────────────────────────────────────────────
+
+class RateLimitExceeded(Exception):
+    """The next GitHub call slot is further away than the caller may wait."""
+
+    def __init__(self, reset_at: float):
+        super().__init__(f"GitHub rate limit exhausted until {time.strftime('%H:%M:%S', time.localtime(reset_at))}")
+        self.reset_at = reset_at
+        self.retry_after = max(1, math.ceil(reset_at - time.time()))
+
+
+class RateLimitScheduler:
+    """
+    Paces outbound calls from the X-RateLimit-Remaining / X-RateLimit-Reset
+    headers GitHub sends on every response.
+
+    While plenty of quota is left calls go out immediately.  Below
+    `low_water` the remaining calls are spread evenly over the time left in
+    the window, and at zero we wait for the reset (or raise if that is more
+    than `max_wait` seconds away).
+
+    Batch scrapes wait for their slots however long the spacing makes them.
+    Interactive scrapes pass a `deadline` (their start plus `max_wait`) that
+    bounds the whole request: a call whose slot falls after it raises
+    RateLimitExceeded without claiming the slot, and the route answers 429.
+    """
+
+    def __init__(self, low_water: int = 10, max_wait: float = 30.0):
+        self.low_water = low_water
+        self.max_wait = max_wait
+        self.remaining = None
+        self.reset_at = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, headers: dict) -> None:
+        remaining = headers.get('x-ratelimit-remaining')
+        reset = headers.get('x-ratelimit-reset')
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            self.remaining = int(remaining)
+            self.reset_at = float(reset)
+
+    def _reserve(self, deadline: float = None) -> float:
+        """Claim the next call slot; return how long to wait before sending."""
+        with self._lock:
+            now = time.time()
+            if self.remaining is None or now >= self.reset_at:
+                return 0.0
+            if self.remaining <= 0:
+                if self.reset_at - now > self.max_wait:
+                    raise RateLimitExceeded(self.reset_at)
+                slot = self.reset_at
+            elif self.remaining < self.low_water:
+                interval = (self.reset_at - now) / self.remaining
+                slot = max(self._next_slot, now) + min(interval, self.max_wait)
+            else:
+                self.remaining -= 1
+                return 0.0
+            if deadline is not None and slot > deadline:
+                raise RateLimitExceeded(slot)
+            self._next_slot = slot
+            if self.remaining > 0:
+                self.remaining -= 1
+            return slot - now
+
+    def deadline(self) -> float:
+        """Latest send time for the calls of an interactive request starting now."""
+        return time.time() + self.max_wait
+
+    def acquire(self, deadline: float = None) -> None:
+        """Block until the next call may be sent (raising if that is after `deadline`)."""
+        wait = self._reserve(deadline)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, deadline: float = None) -> None:
+        """acquire() for the event loop."""
+        wait = self._reserve(deadline)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def status(self) -> dict:
+        return {'remaining': self.remaining, 'resetAt': self.reset_at or None}
+
+
+_pool = _ConnectionPool()
+_rate_limiter = RateLimitScheduler()
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='github-fetch')
+# Concurrent scrapes of one repo (a whole class pasting the same URL) share a single fetch + analysis
+_repo_flights = SingleFlight('github_repo')
+
+
+def _request(url: str, accept: str = None, max_chars: int = None,
+             deadline: float = None) -> tuple[int, dict, str]:
+    """
+    GET `url` over a pooled connection, following redirects.
+    Returns (status, headers, body).  When `max_chars` is set the body is
+    streamed and decoding stops as soon as that many characters are available.
+
+    Cached responses are revalidated with If-None-Match / If-Modified-Since;
+    on 304 the stored body is returned with status 200.  The returned headers
+    carry `x-cache: hit|miss` so callers can report cache behaviour.
+    `deadline` bounds the rate-limit wait (see RateLimitScheduler).
+    """
+    origin = urlsplit(url).netloc
+    for _ in range(MAX_REDIRECTS + 1):
+        # The token is only ever sent to the host it was configured for
+        status, headers, body = _request_once(url, accept, max_chars, deadline,
+                                              auth=urlsplit(url).netloc == origin)
+        if status not in REDIRECT_STATUSES or not headers.get('location'):
+            return status, headers, body
+        url = urljoin(url, headers['location'])
+    raise GitHubHTTPError(status, url)
+
+
+def _request_once(url: str, accept: str = None, max_chars: int = None, deadline: float = None,
+                  auth: bool = True) -> tuple[int, dict, str]:
+    """One GET of `url`; see _request()."""
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else '')
+    headers, cache, cache_key, cached = _prepare_request(url, accept, max_chars, auth)
+
+    _rate_limiter.acquire(deadline)
+
+    with span('github', _operation(max_chars)):
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh connection in that case.
+        for attempt in range(2):
+            conn = _pool.acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+            break
+
+        resp_headers = {k.lower(): v for k, v in resp.getheaders()}
+        _rate_limiter.observe(resp_headers)
+        reusable = True
+        try:
+            if max_chars is None:
+                body = resp.read().decode('utf-8', errors='replace')
+            else:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                chunks, size = [], 0
+                while size < max_chars:
+                    chunk = resp.read(4096)
+                    if not chunk:
+                        break
+                    text = decoder.decode(chunk)
+                    chunks.append(text)
+                    size += len(text)
+                body = ''.join(chunks)[:max_chars]
+                # Unread bytes left on the socket: the connection can't be reused
+                reusable = resp.isclosed()
+        except Exception:
+            conn.close()
+            raise
+
+        if reusable and not resp.will_close:
+            _pool.release(parts.scheme, parts.netloc, conn)
+        else:
+            conn.close()
+
+    return _finish_request(resp.status, resp_headers, body, cache, cache_key, cached)
+
+
+def _operation(max_chars: int = None) -> str:
+    """Metrics operation label for a GitHub fetch."""
+    return 'readme' if max_chars else 'api'
+
+
+def _prepare_request(url: str, accept: str = None, max_chars: int = None, auth: bool = True):
+    """Request headers (with revalidation validators) plus the cache entry they came from."""
+    headers = dict(_DEFAULT_HEADERS)
+    if accept:
+        headers['Accept'] = accept
+    token = os.getenv('GITHUB_TOKEN')
+    if token and auth:
+        headers['Authorization'] = f"Bearer {token}"
+
+    cache = get_http_cache()
+    cache_key = f"{headers['Accept']} {max_chars or ''} {url}"
+    cached = cache.get(cache_key) if cache else None
+    if cached:
+        headers.update(cache.conditional_headers(cached))
+    return headers, cache, cache_key, cached
+
+
+def _finish_request(status: int, resp_headers: dict, body: str, cache, cache_key: str, cached):
+    if cache:
+        cache_lookup('github_http', status == 304 and bool(cached))
+    if status == 304 and cached:
+        cache.touch(cache_key)
+        return 200, {**cached['headers'], **resp_headers, 'x-cache': 'hit'}, cached['body']
+    if cache and status == 200:
+        cache.store(cache_key, resp_headers, body)
+    resp_headers['x-cache'] = 'miss'
+    return status, resp_headers, body
+
+
+# ─── Async client (ASGI mode) ─────────────────────────────────────────────────
+
+_async_http = None
+
+
+def _async_client():
+    """Shared httpx.AsyncClient; created on first use inside the serving event loop."""
+    global _async_http
+    if _async_http is None:
+        import httpx
+        # httpx drops the Authorization header on a redirect to another host
+        _async_http = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            max_redirects=MAX_REDIRECTS,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _async_http
+
+
+async def aclose() -> None:
+    """Close the async client (ASGI lifespan shutdown)."""
+    global _async_http
+    if _async_http is not None:
+        await _async_http.aclose()
+        _async_http = None
+
+
+async def _request_async(url: str, accept: str = None, max_chars: int = None,
+                         deadline: float = None) -> tuple[int, dict, str]:
+    """_request() on httpx.AsyncClient: same caching, rate limiting, redirects and truncation."""
+    headers, cache, cache_key, cached = _prepare_request(url, accept, max_chars)
+    await _rate_limiter.acquire_async(deadline)
+
+    with span('github', _operation(max_chars)):
+        async with _async_client().stream('GET', url, headers=headers) as resp:
+            resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+            _rate_limiter.observe(resp_headers)
+            if max_chars is None:
+                body = (await resp.aread()).decode('utf-8', errors='replace')
+            else:
+                decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+                chunks, size = [], 0
+                async for chunk in resp.aiter_bytes(4096):
+                    text = decoder.decode(chunk)
+                    chunks.append(text)
+                    size += len(text)
+                    if size >= max_chars:
+                        break
+                body = ''.join(chunks)[:max_chars]
+    return _finish_request(resp.status_code, resp_headers, body, cache, cache_key, cached)
+
+
+def _timed(fn, *args, **kwargs):
+    """Run fn and return (result, exception, elapsed_ms)."""
+    start = time.perf_counter()
+    try:
+        result, error = fn(*args, **kwargs), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _raise_for_status(status: int, url: str) -> None:
+    """Anything but a 2xx (or a 304 served from the cache) is an error, redirects included."""
+    if not 200 <= status < 300 and status != 304:
+        raise GitHubHTTPError(status, url)
+
+
+def _fetch_json(url: str, deadline: float = None):
+    """Return (parsed JSON, x-cache status)."""
+    status, headers, body = _request(url, deadline=deadline)
+    _raise_for_status(status, url)
+    return json.loads(body), headers['x-cache']
+
+
+def _fetch_readme(url: str, deadline: float = None):
+    """Return (README text truncated to README_CHAR_LIMIT, x-cache status)."""
+    status, headers, body = _request(url, accept='application/vnd.github.v3.raw',
+                                     max_chars=README_CHAR_LIMIT, deadline=deadline)
+    _raise_for_status(status, url)
+    return body, headers['x-cache']
+
+
+async def _timed_async(coro):
+    start = time.perf_counter()
+    try:
+        result, error = await coro, None
+    except Exception as e:
+        result, error = None, e
+    return result, error, round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _fetch_json_async(url: str, deadline: float = None):
+    status, headers, body = await _request_async(url, deadline=deadline)
+    _raise_for_status(status, url)
+    return json.loads(body), headers['x-cache']
+
+
+async def _fetch_readme_async(url: str, deadline: float = None):
+    status, headers, body = await _request_async(url, accept='application/vnd.github.v3.raw',
+                                                 max_chars=README_CHAR_LIMIT, deadline=deadline)
+    _raise_for_status(status, url)
+    return body, headers['x-cache']
+
+
+def fetch_repo_bundle(owner: str, repo: str, api_base: str = None, repo_data: dict = None,
+                      paced: bool = False) -> dict:
+    """
+    Fetch repo metadata, languages and README concurrently.
+    Pass `repo_data` when the metadata is already known (e.g. from a user's
+    repo listing) to skip the repo call.  Unless `paced` (batch scrapes), the
+    calls wait at most RateLimitScheduler.max_wait in all for quota and raise
+    RateLimitExceeded beyond that.
 
     Returns:
-        dict with keys: url, name, description, techStack, stars, lastCommit, language
+        dict with keys: repo, languages, readme, timings (ms per call + total),
+        cache (hit/miss per call).
+        The README is best-effort; repo/languages errors are re-raised.
     """
-    url = url.rstrip('/')
+    base = (api_base or GITHUB_API_URL).rstrip('/')
+    repo_url = f"{base}/repos/{owner}/{repo}"
+    deadline = None if paced else _rate_limiter.deadline()
+
+    start = time.perf_counter()
+    futures = {
+        'languages': _executor.submit(_timed, _fetch_json, f"{repo_url}/languages", deadline),
+        'readme':    _executor.submit(_timed, _fetch_readme, f"{repo_url}/readme", deadline),
+    }
+    if repo_data is None:
+        futures['repo'] = _executor.submit(_timed, _fetch_json, repo_url, deadline)
+    results = {name: f.result() for name, f in futures.items()}
+    return _bundle(results, repo_data, start)
+
+
+async def fetch_repo_bundle_async(owner: str, repo: str, api_base: str = None, repo_data: dict = None,
+                                  paced: bool = False) -> dict:
+    """fetch_repo_bundle() on the event loop: the calls run as concurrent tasks, not threads."""
+    base = (api_base or GITHUB_API_URL).rstrip('/')
+    repo_url = f"{base}/repos/{owner}/{repo}"
+    deadline = None if paced else _rate_limiter.deadline()
+
+    start = time.perf_counter()
+    calls = {
+        'languages': _fetch_json_async(f"{repo_url}/languages", deadline),
+        'readme':    _fetch_readme_async(f"{repo_url}/readme", deadline),
+    }
+    if repo_data is None:
+        calls['repo'] = _fetch_json_async(repo_url, deadline)
+    done = await asyncio.gather(*(_timed_async(c) for c in calls.values()))
+    return _bundle(dict(zip(calls, done)), repo_data, start)
+
+
+def _bundle(results: dict, repo_data: dict, start: float) -> dict:
+    if repo_data is not None:
+        results['repo'] = ((repo_data, 'listing'), None, 0.0)
+    timings = {name: elapsed for name, (_, _, elapsed) in results.items()}
+    timings['total'] = round((time.perf_counter() - start) * 1000, 1)
+
+    for name in ('repo', 'languages', 'readme'):
+        error = results[name][1]
+        if error is not None and (name != 'readme' or isinstance(error, RateLimitExceeded)):
+            raise error
+
+    readme, readme_cache = results['readme'][0] or ('', 'miss')
+    return {
+        'repo':      results['repo'][0][0],
+        'languages': results['languages'][0][0],
+        'readme':    readme,
+        'timings':   timings,
+        'cache': {
+            'repo':      results['repo'][0][1],
+            'languages': results['languages'][0][1],
+            'readme':    readme_cache,
+        },
+    }
+
 
-    # Parse owner/repo from URL
+# ─── Result builders ──────────────────────────────────────────────────────────
+
+def _parse_repo_url(url: str) -> tuple[str, str]:
     match = re.search(r'github\.com/([^/]+)/([^/]+)', url)
     if not match:
         raise ValueError(f"Cannot parse GitHub URL: {url}")
+    return match.group(1), match.group(2)
 
-    owner, repo = match.group(1), match.group(2)
-    api_url = f"https://api.github.com/repos/{owner}/{repo}"
-    langs_url = f"https://api.github.com/repos/{owner}/{repo}/languages"
 
-    try:
-        # Fetch repo info
-        req = urllib.request.Request(api_url, headers={
-            'User-Agent': 'SkillBridge/1.0',
-            'Accept': 'application/vnd.github.v3+json',
-        })
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            repo_data = json.loads(resp.read().decode())
-
-        # Fetch languages
-        req2 = urllib.request.Request(langs_url, headers={
-            'User-Agent': 'SkillBridge/1.0',
-            'Accept': 'application/vnd.github.v3+json',
-        })
-        with urllib.request.urlopen(req2, timeout=10) as resp2:
-            langs_data = json.loads(resp2.read().decode())
-
-        tech_stack = list(langs_data.keys())[:6]
-        # Add topics as extra tech indicators
-        topics = repo_data.get('topics', [])
-        for t in topics[:4]:
-            if t not in tech_stack:
-                tech_stack.append(t)
-
-        # Try to get README for Gemini Context
-        readme_url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-        readme_text = ""
-        try:
-            req_readme = urllib.request.Request(readme_url, headers={
-                'User-Agent': 'SkillBridge/1.0',
-                'Accept': 'application/vnd.github.v3.raw',
-            })
-            with urllib.request.urlopen(req_readme, timeout=10) as rr:
-                readme_text = rr.read().decode()
-        except Exception:
-            pass
+def _analysis_prompt(owner: str, repo: str, repo_data: dict, langs_data: dict, readme_text: str) -> str:
+    topics = repo_data.get('topics', [])
+    context = f"Repo Name: {owner}/{repo}\nDescription: {repo_data.get('description', '')}\nTopics: {', '.join(topics)}\nLanguages: {', '.join(langs_data.keys())}\n\nREADME Preview:\n{readme_text[:README_CHAR_LIMIT]}"
+    return f"""You are a senior technical screener. Analyze this Github repository context and provide a concise, distinct summary of its exact purpose, the main frameworks/libraries used, and what skills this project demonstrates. Max 3 sentences.
 
-        # Call Gemini for Insightful Analysis
-        gemini_key = os.getenv('GEMINI_API_KEY', '')
-        gemini_analysis = ""
-        if gemini_key:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=gemini_key)
-                model = genai.GenerativeModel('gemini-2.5-flash')
-                
-                context = f"Repo Name: {owner}/{repo}\nDescription: {repo_data.get('description', '')}\nTopics: {', '.join(topics)}\nLanguages: {', '.join(langs_data.keys())}\n\nREADME Preview:\n{readme_text[:3000]}"
-                prompt = f"""You are a senior technical screener. Analyze this Github repository context and provide a concise, distinct summary of its exact purpose, the main frameworks/libraries used, and what skills this project demonstrates. Max 3 sentences.
-                
                 Context:
                 {context}
-                
+
                 Provide only your analysis, no markdown styling."""
-                
-                response = model.generate_content(prompt)
-                gemini_analysis = response.text.strip()
-            except Exception as e:
-                gemini_analysis = f"Gemini Analysis Failed: {str(e)}"
-
-        return {
-            'url': url,
-            'name': repo_data.get('full_name', f"{owner}/{repo}"),
-            'description': repo_data.get('description') or 'No description provided',
-            'techStack': tech_stack,
-            'stars': repo_data.get('stargazers_count', 0),
-            'language': repo_data.get('language', 'Unknown'),
-            'lastCommit': repo_data.get('pushed_at', ''),
-            'geminiAnalysis': gemini_analysis,
-            'scrapedAt': __import__('datetime').datetime.utcnow().isoformat(),
-        }
-
-    except urllib.error.HTTPError as e:
-        # Return partial data if API fails
-        err_msg = f'Could not fetch repo details (HTTP {e.code})'
-        if e.code == 404:
+
+
+def _analyze_with_gemini(owner: str, repo: str, repo_data: dict, langs_data: dict,
+                         readme_text: str, timings: dict) -> str:
+    """Three-sentence Gemini summary of a repo; empty string if no key is set."""
+    gemini_key = os.getenv('GEMINI_API_KEY', '')
+    if not gemini_key:
+        return ""
+    try:
+        prompt = _analysis_prompt(owner, repo, repo_data, langs_data, readme_text)
+        gemini_start = time.perf_counter()
+        response = generate_content('repo_analysis', prompt, api_key=gemini_key)
+        timings['gemini'] = round((time.perf_counter() - gemini_start) * 1000, 1)
+        return response.text.strip()
+    except Exception as e:
+        return f"Gemini Analysis Failed: {str(e)}"
+
+
+async def _analyze_with_gemini_async(owner: str, repo: str, repo_data: dict, langs_data: dict,
+                                     readme_text: str, timings: dict) -> str:
+    """_analyze_with_gemini() on the async Gemini client."""
+    gemini_key = os.getenv('GEMINI_API_KEY', '')
+    if not gemini_key:
+        return ""
+    try:
+        prompt = _analysis_prompt(owner, repo, repo_data, langs_data, readme_text)
+        gemini_start = time.perf_counter()
+        response = await agenerate_content('repo_analysis', prompt, api_key=gemini_key)
+        timings['gemini'] = round((time.perf_counter() - gemini_start) * 1000, 1)
+        return response.text.strip()
+    except Exception as e:
+        return f"Gemini Analysis Failed: {str(e)}"
+
+
+def _cached_analysis(owner: str, repo: str, repo_data: dict) -> str | None:
+    """Stored analysis, reused while the repo hasn't been pushed since."""
+    pushed_at = repo_data.get('pushed_at') or ''
+    cache = get_analysis_cache() if pushed_at else None
+    if not cache:
+        return None
+    analysis = cache.get(f"{owner}/{repo}", pushed_at, ANALYSIS_PROMPT_VERSION)
+    cache_lookup('repo_analysis', analysis is not None)
+    return analysis
+
+
+def _remember_analysis(owner: str, repo: str, repo_data: dict, analysis: str) -> str:
+    """Store a fresh analysis; returns its analysisSource ('unavailable' when none or failed)."""
+    if not analysis or analysis.startswith('Gemini Analysis Failed'):
+        return 'unavailable'
+    pushed_at = repo_data.get('pushed_at') or ''
+    if pushed_at:
+        get_analysis_cache().put(f"{owner}/{repo}", pushed_at, ANALYSIS_PROMPT_VERSION, analysis)
+    return 'fresh'
+
+
+def _build_repo_result(url: str, owner: str, repo: str, bundle: dict) -> dict:
+    gemini_analysis = _cached_analysis(owner, repo, bundle['repo'])
+    if gemini_analysis is not None:
+        analysis_source = 'cached'
+    else:
+        gemini_analysis = _analyze_with_gemini(owner, repo, bundle['repo'], bundle['languages'],
+                                               bundle['readme'], bundle['timings'])
+        analysis_source = _remember_analysis(owner, repo, bundle['repo'], gemini_analysis)
+    return _repo_result(url, owner, repo, bundle, gemini_analysis, analysis_source)
+
+
+async def _build_repo_result_async(url: str, owner: str, repo: str, bundle: dict) -> dict:
+    gemini_analysis = _cached_analysis(owner, repo, bundle['repo'])
+    if gemini_analysis is not None:
+        analysis_source = 'cached'
+    else:
+        gemini_analysis = await _analyze_with_gemini_async(owner, repo, bundle['repo'], bundle['languages'],
+                                                           bundle['readme'], bundle['timings'])
+        analysis_source = _remember_analysis(owner, repo, bundle['repo'], gemini_analysis)
+    return _repo_result(url, owner, repo, bundle, gemini_analysis, analysis_source)
+
+
+def _repo_result(url: str, owner: str, repo: str, bundle: dict, gemini_analysis: str, analysis_source: str) -> dict:
+    repo_data = bundle['repo']
+    tech_stack = list(bundle['languages'].keys())[:6]
+    # Add topics as extra tech indicators
+    topics = repo_data.get('topics', [])
+    for t in topics[:4]:
+        if t not in tech_stack:
+            tech_stack.append(t)
+
+    return {
+        'url': url,
+        'name': repo_data.get('full_name', f"{owner}/{repo}"),
+        'description': repo_data.get('description') or 'No description provided',
+        'techStack': tech_stack,
+        'stars': repo_data.get('stargazers_count', 0),
+        'language': repo_data.get('language', 'Unknown'),
+        'lastCommit': repo_data.get('pushed_at', ''),
+        'geminiAnalysis': gemini_analysis,
+        'analysisSource': analysis_source,
+        'fetchTimings': bundle['timings'],
+        'fetchCache': bundle['cache'],
+        'scrapedAt': __import__('datetime').datetime.utcnow().isoformat(),
+    }
+
+
+def _error_result(url: str, owner: str, repo: str, exc: Exception) -> dict:
+    """Partial payload returned when the GitHub API call fails."""
+    if isinstance(exc, GitHubHTTPError):
+        err_msg = f'Could not fetch repo details (HTTP {exc.code})'
+        if exc.code == 404:
             err_msg = "Repository Not Found. Ensure the repo is PUBLIC and the URL is correct."
-        elif e.code == 403:
+        elif exc.code == 403:
             err_msg = "API Rate limit exceeded or access denied. Please try again later."
-            
-        return {
-            'url': url,
-            'name': f"{owner}/{repo}",
-            'description': err_msg,
-            'techStack': [],
-            'stars': 0,
-            'language': 'Unknown',
-            'lastCommit': '',
-            'scrapedAt': __import__('datetime').datetime.utcnow().isoformat(),
-        }
-    except Exception as e:
-        return {
-            'url': url,
-            'name': f"{owner}/{repo}",
-            'description': f'Error fetching repo: {str(e)}',
-            'techStack': [],
-            'stars': 0,
-            'language': 'Unknown',
-            'lastCommit': '',
-            'scrapedAt': __import__('datetime').datetime.utcnow().isoformat(),
-        }
+    elif isinstance(exc, RateLimitExceeded):
+        err_msg = "API Rate limit exceeded or access denied. Please try again later."
+    else:
+        err_msg = f'Error fetching repo: {str(exc)}'
+
+    return {
+        'url': url,
+        'name': f"{owner}/{repo}",
+        'description': err_msg,
+        'techStack': [],
+        'stars': 0,
+        'language': 'Unknown',
+        'lastCommit': '',
+        'scrapedAt': __import__('datetime').datetime.utcnow().isoformat(),
+    }
+
+
+# ─── Public API ───────────────────────────────────────────────────────────────
+
+def scrape_github_repo(url: str, api_base: str = None) -> dict:
+    """
+    Fetch public metadata for a GitHub repository and analyze with Gemini 2.5 Flash.
+
+    Args:
+        url: GitHub repo URL, e.g. https://github.com/user/repo
+        api_base: Override for the GitHub API root (defaults to GITHUB_API_URL)
+
+    Returns:
+        dict with keys: url, name, description, techStack, stars, lastCommit,
+        language, geminiAnalysis, analysisSource ('fresh' | 'cached' |
+        'unavailable'), fetchTimings, fetchCache
+
+    Raises RateLimitExceeded when GitHub quota would make the caller wait
+    longer than RateLimitScheduler.max_wait.
+    """
+    url = url.rstrip('/')
+    owner, repo = _parse_repo_url(url)
+
+    def scrape():
+        try:
+            bundle = fetch_repo_bundle(owner, repo, api_base=api_base)
+            return _build_repo_result(url, owner, repo, bundle)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            # Return partial data if API fails
+            return _error_result(url, owner, repo, e)
+    return _repo_flights.do(fingerprint(url, api_base or GITHUB_API_URL), scrape)
+
+
+async def scrape_github_repo_async(url: str, api_base: str = None) -> dict:
+    """scrape_github_repo() for the ASGI app; holds no thread while GitHub / Gemini respond."""
+    url = url.rstrip('/')
+    owner, repo = _parse_repo_url(url)
+
+    async def scrape():
+        try:
+            bundle = await fetch_repo_bundle_async(owner, repo, api_base=api_base)
+            return await _build_repo_result_async(url, owner, repo, bundle)
+        except RateLimitExceeded:
+            raise
+        except Exception as e:
+            return _error_result(url, owner, repo, e)
+    return await _repo_flights.ado(fingerprint(url, api_base or GITHUB_API_URL), scrape)
+
+
+# ─── Batch / profile scraping ─────────────────────────────────────────────────
+
+MAX_BATCH_REPOS = 30
+
+
+def _list_user_repos(username: str, api_base: str, limit: int) -> list[dict]:
+    """
+    All public repos owned by `username`, most recently pushed first.
+    One listing page carries the metadata of up to 100 repos, which replaces
+    the per-repo metadata call.
+    """
+    base = (api_base or GITHUB_API_URL).rstrip('/')
+    repos, page = [], 1
+    while len(repos) < limit:
+        listing, _ = _fetch_json(
+            f"{base}/users/{username}/repos?type=owner&sort=pushed&per_page=100&page={page}"
+        )
+        repos.extend(r for r in listing if not r.get('fork'))
+        if len(listing) < 100:
+            break
+        page += 1
+    return repos[:limit]
+
+
+def summarize_profile(results: list[dict]) -> dict:
+    """
+    Aggregate per-repo results into one profile-level tech-stack summary.
+    Languages are ranked by how many repos use them; the per-repo Gemini
+    summaries are condensed by one extra Gemini call when a key is set.
+    """
+    repos = [r for r in results if r.get('techStack')]
+    language_counts = {}
+    tech_counts = {}
+    for r in repos:
+        if r.get('language') and r['language'] != 'Unknown':
+            language_counts[r['language']] = language_counts.get(r['language'], 0) + 1
+        for tech in r['techStack']:
+            tech_counts[tech] = tech_counts.get(tech, 0) + 1
+
+    top_languages = sorted(language_counts, key=lambda k: (-language_counts[k], k))
+    tech_stack = sorted(tech_counts, key=lambda k: (-tech_counts[k], k))[:15]
+    analyses = [f"- {r['name']}: {r['geminiAnalysis']}" for r in repos
+                if r.get('geminiAnalysis') and not r['geminiAnalysis'].startswith('Gemini Analysis Failed')]
+
+    summary = ''
+    gemini_key = os.getenv('GEMINI_API_KEY', '')
+    if gemini_key and analyses:
+        try:
+            prompt = (
+                "You are a senior technical screener. Below are short analyses of a student's GitHub "
+                "repositories. Summarise the student's overall tech stack, strongest areas and the kind of "
+                "roles the portfolio supports. Max 4 sentences, no markdown styling.\n\n"
+                + "\n".join(analyses)
+            )
+            summary = generate_content('profile_summary', prompt, api_key=gemini_key).text.strip()
+        except Exception as e:
+            summary = f"Gemini Analysis Failed: {str(e)}"
+    if not summary and repos:
+        summary = (
+            f"{len(repos)} repositories analysed. Most used languages: "
+            f"{', '.join(top_languages[:3]) or 'n/a'}. Recurring technologies: {', '.join(tech_stack[:6])}."
+        )
+
+    return {
+        'repoCount':      len(repos),
+        'totalStars':     sum(r.get('stars', 0) for r in repos),
+        'languages':      [{'name': k, 'repos': language_counts[k]} for k in top_languages],
+        'techStack':      tech_stack,
+        'profileSummary': summary,
+        'rateLimit':      _rate_limiter.status(),
+    }
+
+
+def scrape_github_profile(username: str = None, urls: list[str] = None,
+                          api_base: str = None, max_repos: int = MAX_BATCH_REPOS):
+    """
+    Scrape many repos at once and yield results as they complete.
+
+    Either `username` (all public, non-fork repos of that user) or `urls`
+    must be given.  Yields dicts of the form
+        {"type": "repo",    "data": <scrape_github_repo payload>}
+        {"type": "profile", "data": <summarize_profile payload>}   (last)
+    Requests are paced by the shared RateLimitScheduler.
+    """
+    if not username and not urls:
+        raise ValueError("Provide a GitHub username or a list of repo URLs.")
+
+    targets = []   # (url, owner, repo, repo_data or None)
+    if username:
+        for r in _list_user_repos(username, api_base, max_repos):
+            targets.append((r.get('html_url', f"https://github.com/{r['full_name']}"),
+                            r['owner']['login'], r['name'], r))
+    else:
+        for url in urls[:max_repos]:
+            url = url.strip().rstrip('/')
+            owner, repo = _parse_repo_url(url)
+            targets.append((url, owner, repo, None))
+
+    def _scrape(target):
+        url, owner, repo, repo_data = target
+        try:
+            bundle = fetch_repo_bundle(owner, repo, api_base=api_base, repo_data=repo_data, paced=True)
+            return _build_repo_result(url, owner, repo, bundle)
+        except Exception as e:
+            return _error_result(url, owner, repo, e)
+
+    results = []
+    # Repo-level work runs on its own pool: each task fans out onto _executor
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix='github-batch') as pool:
+        for future in as_completed([pool.submit(_scrape, t) for t in targets]):
+            result = future.result()
+            results.append(result)
+            yield {'type': 'repo', 'data': result}
+
+    yield {'type': 'profile', 'data': summarize_profile(results)}
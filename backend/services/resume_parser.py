@@ -1,21 +1,32 @@
 import re
 import json
+import asyncio
+import hashlib
+import logging
 import sys
 import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-try:
-    import pymupdf                       # pymupdf >= 1.23 (fitz renamed)
-except ImportError:
-    import fitz as pymupdf               # older versions exposed as fitz
+from utils.genai_client import agenerate_content, genai_available, generate_content
+from utils.metrics import cache_lookup, span
+from utils.resume_pages import get_resume_page_store
 
-try:
-    from google import genai
-    from google.genai import types
-    HAS_GENAI = True
-except ImportError:
-    HAS_GENAI = False
+logger = logging.getLogger(__name__)
+
+_pymupdf = None
+
+
+def load_pymupdf():
+    """Import PyMuPDF on first use; warm-up calls this before traffic arrives."""
+    global _pymupdf
+    if _pymupdf is None:
+        try:
+            import pymupdf                   # pymupdf >= 1.23 (fitz renamed)
+        except ImportError:
+            import fitz as pymupdf           # older versions exposed as fitz
+        _pymupdf = pymupdf
+    return _pymupdf
 
 # Load env for GEMINI_API_KEY
 load_dotenv()
@@ -51,91 +62,245 @@ GENERIC_SECTION_HEADING = re.compile(
 
 # ─── Enhanced Text extraction ──────────────────────────────────────────────────
 
-def extract_raw_text(pdf_path: str = None, pdf_bytes: bytes = None) -> tuple[str, dict]:
+def _page_text(page) -> str:
+    # Get text blocks: (x0, y0, x1, y1, "text", block_no, block_type)
+    blocks = page.get_text("blocks")
+
+    # Sort blocks: Primary by top-y (row), Secondary by left-x (column)
+    # We allow a 5pt tolerance for "same row" to handle minor misalignments
+    blocks.sort(key=lambda b: (b[1] // 5, b[0]))
+
+    return "\n".join([b[4].strip() for b in blocks if b[4].strip()])
+
+
+def _content_hash(page) -> str:
+    """Fingerprint of a page's drawing instructions and fonts (far cheaper than text extraction)."""
+    fonts = sorted((f[3], f[4], f[5]) for f in page.get_fonts())
+    return hashlib.sha256(page.read_contents() + repr(fonts).encode()).hexdigest()
+
+
+def page_fingerprint(text: str) -> str:
+    """Fingerprint of a page's extracted text; whitespace-only edits don't change it."""
+    return hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+
+
+def extract_pages(pdf_path: str = None, pdf_bytes: bytes = None,
+                  known_text: dict = None) -> tuple[list[dict], dict]:
     """
     Open a PDF and return:
-      - full concatenated text (str)
+      - one {'page', 'content_hash', 'text'} dict per page
       - metadata dict
+    With `known_text` ({content_hash: text} of a previous upload), pages are
+    fingerprinted first and unchanged ones reuse that text instead of being
+    extracted again; without it content_hash is left empty.
     Uses block analysis to handle multi-column layouts.
     """
-    if pdf_bytes:
-        doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-    else:
-        doc = pymupdf.open(pdf_path)
+    with span('pymupdf', 'extract'):
+        if pdf_bytes:
+            doc = load_pymupdf().open(stream=pdf_bytes, filetype="pdf")
+        else:
+            doc = load_pymupdf().open(pdf_path)
+
+        pages = []
+        for number, page in enumerate(doc, 1):
+            content_hash = _content_hash(page) if known_text is not None else ""
+            text = (known_text or {}).get(content_hash)
+            pages.append({
+                "page":         number,
+                "content_hash": content_hash,
+                "text":         text if text is not None else _page_text(page),
+            })
 
-    full_text_parts = []
+        metadata = {
+            "title":      doc.metadata.get("title", ""),
+            "author":     doc.metadata.get("author", ""),
+            "page_count": doc.page_count,
+            "file_name":  Path(pdf_path).name if pdf_path else "upload.pdf",
+        }
 
-    for page in doc:
-        # Get text blocks: (x0, y0, x1, y1, "text", block_no, block_type)
-        blocks = page.get_text("blocks")
-        
-        # Sort blocks: Primary by top-y (row), Secondary by left-x (column)
-        # We allow a 5pt tolerance for "same row" to handle minor misalignments
-        blocks.sort(key=lambda b: (b[1] // 5, b[0]))
-        
-        page_text = "\n".join([b[4].strip() for b in blocks if b[4].strip()])
-        full_text_parts.append(page_text)
+        doc.close()
+    return pages, metadata
 
-    full_text = "\n\n".join(full_text_parts)
 
-    metadata = {
-        "title":      doc.metadata.get("title", ""),
-        "author":     doc.metadata.get("author", ""),
-        "page_count": doc.page_count,
-        "file_name":  Path(pdf_path).name if pdf_path else "upload.pdf",
-    }
+def _join_pages(pages: list[dict]) -> str:
+    return "\n\n".join(p["text"] for p in pages)
 
-    doc.close()
-    return full_text, metadata
+
+def extract_raw_text(pdf_path: str = None, pdf_bytes: bytes = None) -> tuple[str, dict]:
+    """extract_pages() with the pages concatenated into one string."""
+    pages, metadata = extract_pages(pdf_path, pdf_bytes)
+    return _join_pages(pages), metadata
 
 
 # ─── Gemini LLM Parser ────────────────────────────────────────────────────────
 
-def parse_with_gemini(raw_text: str) -> dict:
-    """Extract structured data using Gemini 2.5 Flash."""
+GEMINI_SYSTEM_PROMPT = (
+    "You are an expert resume parser. Your task is to extract structured information "
+    "from resume text. Focus on accuracy and complete extraction of details."
+)
+
+# Bump when the prompt changes so stored page fragments are re-parsed
+RESUME_PROMPT_VERSION = 2
+MAX_PROMPT_CHARS = 8000     # resume text per Gemini call, shared by the pages sent
+PAGE_CONTEXT_CHARS = 300    # tail of the previous / head of the next page sent along with a page
+
+
+def _pages_prompt(pending: list[dict], pages: list[dict]) -> str:
+    per_page = MAX_PROMPT_CHARS // max(1, len(pending))
+    sent = {p["page"] for p in pending}
+    parts = []
+    for p in pending:
+        parts.append(f"--- Page {p['page']} ---")
+        previous = pages[p["page"] - 2]["text"] if p["page"] > 1 else ""
+        if previous and p["page"] - 1 not in sent:
+            parts.append(f"[context, end of page {p['page'] - 1}]\n{previous[-PAGE_CONTEXT_CHARS:]}\n[page text]")
+        parts.append(p["text"][:per_page])
+        following = pages[p["page"]]["text"] if p["page"] < len(pages) else ""
+        if following and p["page"] + 1 not in sent:
+            parts.append(f"[context, start of page {p['page'] + 1}]\n{following[:PAGE_CONTEXT_CHARS]}")
+    return (
+        "Extract structured JSON from the following resume pages, separately for each page. "
+        "Return ONLY valid JSON in this structure, with an entry for every page number given:\n"
+        "{\n"
+        '  "pages": {\n'
+        '    "<page number>": {\n'
+        '      "skills": ["Skill 1", "Skill 2"],\n'
+        '      "experience": [\n'
+        '        {"title": "Role", "company": "Company", "duration": "Dates", "description": "Details"}\n'
+        '      ],\n'
+        '      "projects": [\n'
+        '        {"name": "Project Name", "technologies": ["Tech 1"], "description": "Details"}\n'
+        '      ],\n'
+        '      "continues": false\n'
+        "    }\n"
+        "  }\n"
+        "}\n"
+        "An entry belongs to the page where it starts; extract it in full, including the part that "
+        "runs onto the next page. Text marked as context is only there to recognise an entry "
+        "continuing from the previous page or to finish one continuing onto the next page; do not "
+        "extract entries that start in it. Set \"continues\" to true when the page's last entry "
+        "runs onto the next page.\n\n"
+        "Resume Pages:\n" + "\n".join(parts)
+    )
+
+
+def _gemini_key() -> str:
     api_key = os.getenv('GEMINI_API_KEY')
-    if not api_key or not HAS_GENAI:
+    if not api_key or not genai_available():
         raise ValueError("Gemini API key not found or google-genai not installed.")
+    return api_key
 
-    client = genai.Client(api_key=api_key)
-    
-    system_prompt = (
-        "You are an expert resume parser. Your task is to extract structured information "
-        "from resume text. Focus on accuracy and complete extraction of details."
-    )
 
-    user_prompt = (
-        "Extract structured JSON from the following resume text. "
-        "Return ONLY valid JSON in this structure:\n"
-        "{\n"
-        '  "skills": ["Skill 1", "Skill 2"],\n'
-        '  "experience": [\n'
-        '    {"title": "Role", "company": "Company", "duration": "Dates", "description": "Details"}\n'
-        '  ],\n'
-        '  "projects": [\n'
-        '    {"name": "Project Name", "technologies": ["Tech 1"], "description": "Details"}\n'
-        '  ]\n'
-        "}\n\n"
-        f"Resume Text:\n{raw_text[:8000]}" # Limit to 8k chars to avoid token issues
-    )
+def _parse_gemini_reply(text: str) -> dict:
+    text = text.strip()
+    # Clean markdown fences
+    if text.startswith('```'):
+        text = re.sub(r'^```json\s*', '', text)
+        text = re.sub(r'\s*```$', '', text)
+    return json.loads(text)
 
-    try:
-        response = client.models.generate_content(
-            model='gemini-2.5-flash',
-            config=types.GenerateContentConfig(system_instruction=system_prompt),
-            contents=user_prompt,
-        )
-        
-        text = response.text.strip()
-        # Clean markdown fences
-        if text.startswith('```'):
-            text = re.sub(r'^```json\s*', '', text)
-            text = re.sub(r'\s*```$', '', text)
-        
-        return json.loads(text)
-    except Exception as e:
-        print(f"[Gemini Parser Error] {e}")
-        return None
+
+def _fragment(raw) -> dict:
+    """A page's {skills, experience, projects}, with anything malformed dropped."""
+    raw = raw if isinstance(raw, dict) else {}
+    return {
+        "skills":     [s for s in raw.get("skills") or [] if isinstance(s, str) and s.strip()],
+        "experience": [e for e in raw.get("experience") or [] if isinstance(e, dict)],
+        "projects":   [p for p in raw.get("projects") or [] if isinstance(p, dict)],
+        "continues":  raw.get("continues") is True,
+    }
+
+
+def merge_fragments(fragments: list[dict]) -> dict:
+    """Page fragments in page order, duplicates (same skill / role / project name) kept once."""
+    merged = {"skills": [], "experience": [], "projects": []}
+    seen = set()
+    for fragment in fragments:
+        for skill in fragment["skills"]:
+            key = ("skill", skill.strip().lower())
+            if key not in seen:
+                seen.add(key)
+                merged["skills"].append(skill.strip())
+        for entry in fragment["experience"]:
+            key = ("experience", str(entry.get("title", "")).lower(), str(entry.get("company", "")).lower())
+            if key not in seen:
+                seen.add(key)
+                merged["experience"].append(entry)
+        for entry in fragment["projects"]:
+            key = ("project", str(entry.get("name", "")).lower())
+            if key not in seen:
+                seen.add(key)
+                merged["projects"].append(entry)
+    return merged
+
+
+class ResumeParseJob:
+    """
+    Gemini parse of one upload, page by page.
+
+        job = ResumeParseJob(pages, stored)        # stored: ResumePageStore.get() rows
+        if job.needs_gemini():
+            try:
+                job.apply(<Gemini reply text for job.contents, GEMINI_SYSTEM_PROMPT>)
+            except Exception as e:
+                job.fail(e)
+        structured = job.finish()                  # None → regex fallback
+
+    Pages whose text matches a stored page reuse its fragment; only the
+    rest are sent to Gemini, so a re-upload with one edited page sends
+    only that page, and an unchanged one makes no call at all.  A page
+    whose last entry runs onto the next one ("continues") is re-parsed
+    too when that next page is no longer the one it was parsed with.
+    """
+
+    def __init__(self, pages: list[dict], stored: list[dict] = ()):
+        fragments = {row["text_hash"]: row["fragment"] for row in stored}
+        # text_hash of the page that followed each stored page (None after the last)
+        followed_by = {row["text_hash"]: nxt["text_hash"] if nxt else None
+                       for row, nxt in zip(stored, [*stored[1:], None])}
+        self.pages = pages
+        for p in pages:
+            p["text_hash"] = page_fingerprint(p["text"])
+            p["fragment"] = fragments.get(p["text_hash"])
+        for p, nxt in zip(pages, [*pages[1:], None]):
+            if p["fragment"] and p["fragment"].get("continues") and \
+                    (nxt["text_hash"] if nxt else None) != followed_by.get(p["text_hash"]):
+                p["fragment"] = None
+        self.pending = [p for p in pages if p["fragment"] is None]
+        self.reparsed = [p["page"] for p in self.pending]
+        self.failed = False
+
+    def needs_gemini(self) -> bool:
+        return bool(self.pending)
+
+    @property
+    def contents(self) -> str:
+        return _pages_prompt(self.pending, self.pages)
+
+    def apply(self, reply: str) -> None:
+        parsed = _parse_gemini_reply(reply)
+        by_page = parsed.get("pages") if isinstance(parsed, dict) else None
+        if not isinstance(by_page, dict):
+            # A flat {skills, experience, projects} reply is fine for a single page
+            if len(self.pending) != 1 or not isinstance(parsed, dict):
+                raise ValueError("Gemini reply has no 'pages' object")
+            by_page = {str(self.pending[0]["page"]): parsed}
+        # A page left out of the reply must not be stored as empty, or it would never be re-parsed
+        missing = [p["page"] for p in self.pending if str(p["page"]) not in by_page]
+        if missing:
+            raise ValueError(f"Gemini reply is missing page(s) {', '.join(map(str, missing))}")
+        for p in self.pending:
+            p["fragment"] = _fragment(by_page[str(p["page"])])
+        self.pending = []
+
+    def fail(self, exc: Exception) -> None:
+        logger.error("[resume_parser] Gemini parse failed, falling back to regex", exc_info=exc)
+        self.failed = True
+
+    def finish(self) -> dict | None:
+        if self.failed or self.pending:
+            return None
+        return merge_fragments([p["fragment"] for p in self.pages])
 
 
 # ─── Regex Fallback Parser ────────────────────────────────────────────────────
@@ -230,20 +395,10 @@ def parse_regex_fallback(raw_text: str) -> dict:
 
 # ─── Public API ───────────────────────────────────────────────────────────────
 
-def parse_resume(pdf_path: str = None, pdf_bytes: bytes = None, filename: str = "upload.pdf") -> dict:
-    """Unified entry point for parsing resumes."""
-    raw_text, metadata = extract_raw_text(pdf_path, pdf_bytes)
-    if pdf_path: metadata["file_name"] = Path(pdf_path).name
-    elif filename: metadata["file_name"] = filename
-
-    # Primary: Gemini
-    structured = None
-    if os.getenv('GEMINI_API_KEY'):
-        structured = parse_with_gemini(raw_text)
-    
+def _assemble(raw_text: str, metadata: dict, structured: dict) -> dict:
     # Fallback: Regex
     if not structured:
-        print("[Resume Parser] Using Regex Fallback")
+        logger.info("[resume_parser] using regex fallback")
         structured = parse_regex_fallback(raw_text)
 
     return {
@@ -254,9 +409,86 @@ def parse_resume(pdf_path: str = None, pdf_bytes: bytes = None, filename: str =
         "projects": structured.get("projects", []),
     }
 
-def parse_resume_from_bytes(pdf_bytes: bytes, filename: str = "upload.pdf") -> dict:
+
+def _stored_pages(owner: str | None) -> list[dict] | None:
+    """`owner`'s pages from the last upload ([] if none); None when nothing is reused or kept."""
+    if not owner or not os.getenv('GEMINI_API_KEY'):
+        return None
+    return get_resume_page_store().get(owner, RESUME_PROMPT_VERSION)
+
+
+def _known_text(stored: list[dict] | None) -> dict | None:
+    return None if stored is None else {row["content_hash"]: row["text"] for row in stored}
+
+
+def _finish_job(job: ResumeParseJob, owner: str | None, stored: list[dict] | None, metadata: dict) -> dict | None:
+    """Structured result of `job`; stores its pages for the owner's next upload."""
+    structured = job.finish()
+    metadata["reparsed_pages"] = job.reparsed
+    if stored is None:
+        return structured
+    for p in job.pages:
+        cache_lookup('resume_pages', p["page"] not in job.reparsed)
+    unchanged = [(p["content_hash"], p["text_hash"]) for p in job.pages] == \
+                [(row["content_hash"], row["text_hash"]) for row in stored]
+    if structured is not None and not unchanged:
+        get_resume_page_store().put(owner, RESUME_PROMPT_VERSION, job.pages)
+    return structured
+
+
+def parse_resume(pdf_path: str = None, pdf_bytes: bytes = None, filename: str = "upload.pdf",
+                 owner: str = None) -> dict:
+    """
+    Unified entry point for parsing resumes.  With `owner` (the user's uid),
+    pages unchanged since that user's last upload are neither re-extracted
+    nor sent to Gemini again (utils/resume_pages.py).
+    """
+    stored = _stored_pages(owner)
+    pages, metadata = extract_pages(pdf_path, pdf_bytes, _known_text(stored))
+    if pdf_path: metadata["file_name"] = Path(pdf_path).name
+    elif filename: metadata["file_name"] = filename
+    raw_text = _join_pages(pages)
+
+    # Primary: Gemini
+    structured = None
+    if os.getenv('GEMINI_API_KEY'):
+        job = ResumeParseJob(pages, stored or [])
+        if job.needs_gemini():
+            try:
+                response = generate_content('resume_parse', job.contents, GEMINI_SYSTEM_PROMPT, api_key=_gemini_key())
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+        structured = _finish_job(job, owner, stored, metadata)
+    return _assemble(raw_text, metadata, structured)
+
+def parse_resume_from_bytes(pdf_bytes: bytes, filename: str = "upload.pdf", owner: str = None) -> dict:
     """Backward compatibility wrapper."""
-    return parse_resume(pdf_bytes=pdf_bytes, filename=filename)
+    return parse_resume(pdf_bytes=pdf_bytes, filename=filename, owner=owner)
+
+
+async def parse_resume_async(pdf_bytes: bytes, filename: str = "upload.pdf", owner: str = None) -> dict:
+    """
+    parse_resume() for the ASGI app: text extraction (CPU-bound PyMuPDF)
+    runs in a worker thread, the Gemini call on the event loop.
+    """
+    stored = _stored_pages(owner)
+    pages, metadata = await asyncio.to_thread(extract_pages, None, pdf_bytes, _known_text(stored))
+    if filename: metadata["file_name"] = filename
+    raw_text = _join_pages(pages)
+
+    structured = None
+    if os.getenv('GEMINI_API_KEY'):
+        job = ResumeParseJob(pages, stored or [])
+        if job.needs_gemini():
+            try:
+                response = await agenerate_content('resume_parse', job.contents, GEMINI_SYSTEM_PROMPT,
+                                                   api_key=_gemini_key())
+                job.apply(response.text)
+            except Exception as e:
+                job.fail(e)
+        structured = _finish_job(job, owner, stored, metadata)
+    return _assemble(raw_text, metadata, structured)
 
 
 # ─── CLI entry point ──────────────────────────────────────────────────────────
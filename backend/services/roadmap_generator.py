@@ -0,0 +1,399 @@
+"""
+roadmap_generator.py
+────────────────────
+Deterministic, zero-LLM career roadmap builder.
+
+Turns the skill-gap results of /api/skill-gap/calculate into the same
+four-phase JSON schema /api/roadmap/generate has always returned, filling
+projects and resources from the curated catalog in data/roadmap_catalog.json.
+The same input always yields the same roadmap, in a few milliseconds.
+
+Ordering
+  Gaps are sorted by status (critical → moderate → minor), then weighted
+  gap, then required level.  The sorted list is split into three learning
+  phases; phase 4 is always portfolio / job readiness built from the role's
+  capstone projects and checklist.  With fewer than three skills to work on
+  (no assessment yet, or a role without a benchmark) the learning phases
+  are topped up with the catalog's generic core skills, so a roadmap always
+  has four phases.
+
+Gemini can still refine the result (see run.py), but only as an optional
+enrichment pass on top of this output.
+"""
+
+import math
+
+from utils.data_loader import load_data
+
+CATALOG_FILE = 'roadmap_catalog.json'
+
+STATUS_RANK = {'critical': 0, 'moderate': 1, 'minor': 2, 'met': 3}
+
+LEARNING_PHASES = 3
+PROJECTS_PER_PHASE = 3
+RESOURCES_PER_PHASE = 4
+
+PHASE_TITLES = ('Foundation', 'Core Skills', 'Applied Practice', 'Portfolio & Job Readiness')
+# Below this score a skill is not shown off in the portfolio phase
+MIN_STRENGTH_SCORE = 0.1
+
+
+def status_for(gap: float) -> str:
+    """Same thresholds as /api/skill-gap/calculate."""
+    if gap == 0:
+        return 'met'
+    if gap > 0.5:
+        return 'critical'
+    if gap > 0.25:
+        return 'moderate'
+    return 'minor'
+
+
+def _norm_role(role: str) -> str:
+    return ' '.join(str(role).lower().split())
+
+
+def derive_skill_results(role: str, test_scores: dict) -> dict:
+    """
+    skill_results for `role` from raw test scores, for callers that have not
+    run the skill-gap calculation yet.  Empty when the role has no benchmark.
+    """
+    try:
+        benchmarks = load_data('skill_gap_benchmark.json')
+    except FileNotFoundError:
+        return {}
+    key = _norm_role(role)
+    matched = next((b for b in benchmarks if b['role'].lower() == key), None)
+    if not matched:
+        return {}
+    scores = {k.lower(): float(v) for k, v in (test_scores or {}).items()}
+    results = {}
+    for skill, required in matched['skills'].items():
+        required = float(required)
+        user_score = scores.get(skill.lower(), 0.0)
+        gap = round(max(0.0, required - user_score), 4)
+        results[skill.lower()] = {
+            'required':     required,
+            'user_score':   round(user_score, 4),
+            'gap':          gap,
+            'weighted_gap': round(gap * required, 4),
+            'status':       status_for(gap),
+        }
+    return results
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def inputs_error(skill_results, test_scores) -> str | None:
+    """
+    Why a request's skill_results / test_scores can't be used, or None.
+    skill_results maps skills to objects with numeric 'gap' and 'required'
+    (and, when present, numeric 'user_score' / 'weighted_gap');
+    test_scores maps skills to numbers.
+    """
+    if skill_results is not None:
+        if not isinstance(skill_results, dict):
+            return "'skill_results' must be an object keyed by skill."
+        for skill, info in skill_results.items():
+            if not isinstance(info, dict) or not all(_is_number(info.get(k)) for k in ('gap', 'required')):
+                return f"skill_results[{skill!r}] must be an object with numeric 'gap' and 'required'."
+            if any(k in info and not _is_number(info[k]) for k in ('user_score', 'weighted_gap')):
+                return f"skill_results[{skill!r}]: 'user_score' and 'weighted_gap' must be numbers."
+    if test_scores is not None:
+        if not isinstance(test_scores, dict) or not all(_is_number(v) for v in test_scores.values()):
+            return "'test_scores' must be an object of numeric scores."
+    return None
+
+
+def order_gaps(skill_results: dict) -> list[tuple[str, dict]]:
+    """(skill, info) pairs, most urgent first; met skills last."""
+    def key(item):
+        skill, info = item
+        gap = float(info.get('gap', 0) or 0)
+        required = float(info.get('required', 0) or 0)
+        weighted = float(info.get('weighted_gap', gap * required) or 0)
+        status = info.get('status') or status_for(gap)
+        return (STATUS_RANK.get(status, 3), -weighted, -gap, -required, skill)
+
+    return sorted(((s.lower(), i) for s, i in (skill_results or {}).items()), key=key)
+
+
+def _split(items: list, parts: int) -> list[list]:
+    """Contiguous, near-equal chunks (earlier chunks get the remainder)."""
+    size, extra = divmod(len(items), parts)
+    chunks, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+
+def _phase_months(skills: list[tuple[str, dict]]) -> int:
+    """About one month per 0.5 of summed gap, clamped to 1-3 months."""
+    total_gap = sum(float(info.get('gap', 0) or 0) for _, info in skills)
+    return min(3, max(1, math.ceil(total_gap / 0.5)))
+
+
+def _skill_entry(catalog: dict, skill: str) -> dict:
+    entry = catalog['skills'].get(skill)
+    if entry:
+        return entry
+    title = skill.title()
+    return {
+        'resources': [{'title': f'{title} official documentation', 'type': 'docs',
+                       'url_or_platform': 'Official documentation'}],
+        'projects':  [{'name': f'{title} practice project',
+                       'description': f'Build a small, self-contained project that exercises {title} end to end.',
+                       'tech_stack': [title]}],
+    }
+
+
+def _goal(skill: str, info: dict) -> str:
+    if 'required' not in info and 'user_score' not in info:
+        return f"Build working knowledge of {skill.title()} with a small project"
+    user = round(float(info.get('user_score', 0) or 0) * 100)
+    required = round(float(info.get('required', 0) or 0) * 100)
+    if info.get('status') == 'met' or user >= required:
+        return f"Deepen {skill.title()} beyond the required {required}% with harder problems"
+    return f"Raise {skill.title()} from {user}% to at least {required}%"
+
+
+def _learning_phase(number: int, start_month: int, skills: list, catalog: dict, capstones: list) -> dict:
+    months = _phase_months(skills)
+    entries = [(s, _skill_entry(catalog, s)) for s, _ in skills]
+
+    # Round-robin across the phase's skills so every skill gets coverage
+    projects, resources = [], []
+    for rank in range(max((len(e['projects']) for _, e in entries), default=0)):
+        projects.extend(e['projects'][rank] for _, e in entries if rank < len(e['projects']))
+    for rank in range(max((len(e['resources']) for _, e in entries), default=0)):
+        resources.extend(e['resources'][rank] for _, e in entries if rank < len(e['resources']))
+    for capstone in capstones:
+        if len(projects) >= 2:
+            break
+        projects.append(capstone)
+
+    end_month = start_month + months - 1
+    span = f"Month {start_month}" if months == 1 else f"Month {start_month}-{end_month}"
+    return {
+        'phase_number':    number,
+        'title':           f"{PHASE_TITLES[number - 1]} — {span}",
+        'duration':        f"{months} month" + ('s' if months > 1 else ''),
+        'goals':           [_goal(s, info) for s, info in skills[:3]],
+        'skills_to_learn': [s.title() for s, _ in skills],
+        'projects':        projects[:PROJECTS_PER_PHASE],
+        'resources':       resources[:RESOURCES_PER_PHASE],
+        'skill_keys':      [s for s, _ in skills],
+    }
+
+
+def _readiness_phase(number: int, start_month: int, role_entry: dict, ordered: list) -> dict:
+    months = 2
+    # Lead the portfolio with the student's strongest skills; with no real
+    # strengths yet, with the skills the learning phases just covered
+    scored = [item for item in ordered if float(item[1].get('user_score', 0) or 0) >= MIN_STRENGTH_SCORE]
+    strongest = sorted(scored, key=lambda item: -float(item[1].get('user_score', 0) or 0))[:3] or ordered[:3]
+    return {
+        'phase_number':    number,
+        'title':           f"{PHASE_TITLES[-1]} — Month {start_month}-{start_month + months - 1}",
+        'duration':        f"{months} months",
+        'goals':           list(role_entry['final_milestones'][:3]),
+        'skills_to_learn': [s.title() for s, _ in strongest],
+        'projects':        list(role_entry['capstones'][:PROJECTS_PER_PHASE]),
+        'resources':       list(role_entry['resources'][:RESOURCES_PER_PHASE]),
+        'skill_keys':      [s for s, _ in strongest],
+    }
+
+
+def _is_gap(info: dict) -> bool:
+    return (info.get('status') or status_for(float(info.get('gap', 0) or 0))) != 'met'
+
+
+def _signature(info: dict) -> dict:
+    """What a phase's content depends on for one skill."""
+    gap = round(float(info.get('gap', 0) or 0), 2)
+    return {'gap': gap, 'status': info.get('status') or status_for(gap),
+            'user_score': round(float(info.get('user_score', 0) or 0), 2)}
+
+
+def _inputs_by_skill(inputs) -> dict | None:
+    """
+    Stored `inputs` → {skill: signature}.  Reads the {skill: signature} map,
+    skipping the None left for dropped skills, and the [skill, gap, status,
+    user_score] rows written by older versions.
+    """
+    try:
+        if isinstance(inputs, dict):
+            return {str(s): dict(sig) for s, sig in inputs.items() if sig is not None}
+        return {str(row[0]): {'gap': row[1], 'status': row[2], 'user_score': row[3]} for row in inputs}
+    except (TypeError, ValueError, IndexError, KeyError):
+        return None
+
+
+def _months(phase: dict) -> int:
+    try:
+        return max(1, int(str(phase.get('duration', '1')).split()[0]))
+    except ValueError:
+        return 1
+
+
+def _summary(role: str, ordered: list, phases: list, profile: dict, totals: dict) -> str:
+    """Overview sentence naming what each of `phases` actually covers."""
+    name = profile.get('name') or 'You'
+    top = ', '.join(s.title() for s, i in [item for item in ordered if _is_gap(item[1])][:3])
+    readiness_pct = totals.get('readiness')
+    if top:
+        plan_text = f"The plan closes the largest gaps first ({top})"
+    elif ordered:
+        plan_text = "Every benchmark skill is already met, so the plan deepens them"
+    else:
+        plan_text = "There is no assessment data yet, so the plan starts from core skills every role needs"
+    steps = [f"{str(p.get('title', '')).split(' — ')[0]} ({', '.join(p['skills_to_learn'][:3])})"
+             for p in phases[:-1] if p.get('skills_to_learn')]
+    return (
+        f"{name} {'are' if name == 'You' else 'is'} targeting {role.title()}"
+        + (f" at {readiness_pct}% readiness" if readiness_pct is not None else '')
+        + ". " + plan_text
+        + (f": {'; '.join(steps)}" if steps else '')
+        + ", and finishes with a portfolio and interview preparation."
+    )
+
+
+def _assemble(role: str, role_entry: dict, phases: list, summary: str, inputs: dict) -> dict:
+    """Number the phases, lay out their month spans and wrap them in the roadmap schema."""
+    month = 1
+    for number, phase in enumerate(phases, start=1):
+        months = _months(phase)
+        span = f"Month {month}" if months == 1 else f"Month {month}-{month + months - 1}"
+        phase['phase_number'] = number
+        phase['title'] = f"{str(phase.get('title', '')).split(' — ')[0]} — {span}"
+        month += months
+    total_months = month - 1
+    return {
+        'role':                role.title(),
+        'summary':             summary,
+        'total_duration':      f"{total_months}–{total_months + 2} months",
+        'phases':              phases,
+        'final_milestones':    list(role_entry['final_milestones']),
+        'job_ready_checklist': list(role_entry['job_ready_checklist']),
+        'inputs':              inputs,
+    }
+
+
+def _context(role: str, skill_results: dict, test_scores: dict):
+    catalog = load_data(CATALOG_FILE)
+    role_entry = catalog['roles'].get(_norm_role(role), catalog['general'])
+    if not skill_results:
+        skill_results = derive_skill_results(role, test_scores)
+    ordered = order_gaps(skill_results)
+    inputs = {s: _signature(i) for s, i in ordered}
+    return catalog, role_entry, ordered, inputs
+
+
+def generate_roadmap(role: str, skill_results: dict = None, test_scores: dict = None,
+                     profile: dict = None, totals: dict = None) -> dict:
+    """
+    Build a roadmap in the /api/roadmap/generate schema:
+    { role, summary, total_duration, phases[4], final_milestones, job_ready_checklist }
+    Each phase also lists the `skill_keys` it addresses, and `inputs` maps
+    each skill to its {gap, status, user_score}, so update_roadmap() can diff
+    later requests.  (A map, not rows: Firestore rejects arrays of arrays.)
+    """
+    catalog, role_entry, ordered, inputs = _context(role, skill_results, test_scores)
+    gaps = [(s, i) for s, i in ordered if _is_gap(i)]
+    # Fewer gaps than phases: top up with met skills to deepen, then with generic core skills
+    plan = gaps + [item for item in ordered if item not in gaps][:max(0, LEARNING_PHASES - len(gaps))]
+    core = role_entry.get('core_skills') or catalog['general']['core_skills']
+    planned = {s for s, _ in plan}
+    plan += [(s, {}) for s in core if s not in planned][:LEARNING_PHASES - len(plan) if plan else None]
+
+    phases = [_learning_phase(n, 1, chunk, catalog, role_entry['capstones'])
+              for n, chunk in enumerate(_split(plan, LEARNING_PHASES), start=1)]
+    phases.append(_readiness_phase(len(phases) + 1, 1, role_entry, ordered or plan))
+    summary = _summary(role, ordered, phases, profile or {}, totals or {})
+    return _assemble(role, role_entry, phases, summary, inputs)
+
+
+def update_roadmap(previous: dict, role: str, skill_results: dict = None, test_scores: dict = None,
+                   profile: dict = None, totals: dict = None) -> tuple[dict, list[int]]:
+    """
+    Incrementally refresh `previous` (a roadmap from generate_roadmap or a
+    later update) for new gap results.
+
+    Skills whose gap signature changed are diffed against `previous['inputs']`.
+    Only the phases holding those skills are rebuilt: a skill that is still
+    a gap stays in its phase, a closed gap leaves it, and a new gap joins the
+    phase for its status.  Every other phase, including any Gemini-enriched
+    text, is kept verbatim.  Returns (roadmap, regenerated phase numbers);
+    falls back to a full generate_roadmap() when `previous` cannot be diffed.
+    """
+    def full():
+        roadmap = generate_roadmap(role, skill_results, test_scores, profile, totals)
+        return roadmap, [p['phase_number'] for p in roadmap['phases']]
+
+    old_inputs = _inputs_by_skill((previous or {}).get('inputs') or [])
+    old_phases = (previous or {}).get('phases') or []
+    if (not old_inputs or len(old_phases) < 2
+            or _norm_role(previous.get('role', '')) != _norm_role(role)
+            or any(not isinstance(p.get('skill_keys'), list) for p in old_phases)):
+        return full()
+
+    catalog, role_entry, ordered, inputs = _context(role, skill_results, test_scores)
+    new_info = dict(ordered)
+    new_inputs = _inputs_by_skill(inputs)
+    # Stored roadmaps are merge-written, so a dropped skill needs an explicit None
+    inputs.update({s: None for s in set(old_inputs) - set(new_inputs)})
+    rank = {s: i for i, (s, _) in enumerate(ordered)}
+    changed = {s for s in set(new_inputs) | set(old_inputs) if new_inputs.get(s) != old_inputs.get(s)}
+    if not changed:
+        return {**previous, 'inputs': inputs}, []
+
+    learning = [dict(p) for p in old_phases[:-1]]
+    members = [list(p['skill_keys']) for p in learning]
+    affected = set()
+
+    for skill in changed:
+        home = next((i for i, keys in enumerate(members) if skill in keys), None)
+        info = new_info.get(skill)
+        if home is not None:
+            affected.add(home)
+            if info is None or not _is_gap(info):
+                members[home].remove(skill)
+        elif info is not None and _is_gap(info):
+            target = min(STATUS_RANK.get(info.get('status') or status_for(float(info.get('gap', 0))), 2),
+                         len(members) - 1)
+            members[target].append(skill)
+            affected.add(target)
+
+    phases, regenerated = [], []
+    for i, phase in enumerate(learning):
+        if i not in affected:
+            phases.append(phase)
+            continue
+        keys = sorted((s for s in members[i] if s in new_info), key=rank.get)
+        if not keys:
+            continue
+        rebuilt = _learning_phase(i + 1, 1, [(s, new_info[s]) for s in keys], catalog, role_entry['capstones'])
+        # Keep the phase's place in the sequence (Foundation / Core Skills / …)
+        rebuilt['title'] = phase.get('title', rebuilt['title'])
+        phases.append(rebuilt)
+        regenerated.append(len(phases))
+    if not phases:
+        return full()
+
+    readiness = dict(old_phases[-1])
+    fresh_readiness = _readiness_phase(len(phases) + 1, 1, role_entry, ordered)
+    if fresh_readiness['skill_keys'] != readiness.get('skill_keys'):
+        readiness = fresh_readiness
+        regenerated.append(len(phases) + 1)
+    phases.append(readiness)
+
+    summary = (previous.get('summary') if previous.get('source') == 'gemini'
+               else _summary(role, ordered, phases, profile or {}, totals or {}))
+    roadmap = _assemble(role, role_entry, phases, summary, inputs)
+    if 'source' in previous:
+        roadmap['source'] = previous['source']
+    return roadmap, regenerated
@@ -0,0 +1,310 @@
+"""
+skill_index.py
+──────────────
+In-memory inverted index over student skill profiles, for placement
+queries such as "knows python and sql, missing statistics, readiness > 60".
+
+Layout
+  • Skill names are interned to small integer ids (SkillVocabulary).
+  • Each student gets a row.  The row's profile is a compact bitset of
+    known skill ids plus parallel (skill id, score) arrays of test scores.
+  • The inverted index maps each skill id to a bitset over rows, stored as
+    a uint64 word array.  Readiness is a float32 column (NaN = unknown)
+    and each tested skill has a float32 score column.
+
+A query ANDs / ORs / AND-NOTs a few word arrays, applies the readiness range
+with one vectorised compare, and ranks with argpartition.  That is
+sub-millisecond for tens of thousands of profiles, and no documents are read.
+
+A skill counts as "known" when it is on the student's parsed resume or
+their latest test score for it is at least KNOWN_SCORE.
+
+The index is per process.  Routes update it incrementally when a resume is
+parsed, a test is graded or a gap snapshot is recorded; rebuild() reloads
+it from storage and the history tables (run during warm-up).
+"""
+
+import math
+import threading
+
+import numpy as np
+
+KNOWN_SCORE = 0.5
+_WORD = 64
+
+
+def normalize_skill(name: str) -> str:
+    return ' '.join(str(name).lower().split())
+
+
+class SkillVocabulary:
+    """Skill name ↔ integer id."""
+
+    def __init__(self):
+        self._ids = {}
+        self.names = []
+
+    def intern(self, name: str) -> int:
+        key = normalize_skill(name)
+        sid = self._ids.get(key)
+        if sid is None:
+            sid = self._ids[key] = len(self.names)
+            self.names.append(key)
+        return sid
+
+    def lookup(self, name: str) -> int | None:
+        return self._ids.get(normalize_skill(name))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+class _Profile:
+    __slots__ = ('row', 'resume_bits', 'score_ids', 'score_vals', 'readiness', 'domain')
+
+    def __init__(self, row: int):
+        self.row = row
+        self.resume_bits = 0                              # bitset over skill ids
+        self.score_ids = np.empty(0, dtype=np.int32)
+        self.score_vals = np.empty(0, dtype=np.float32)
+        self.readiness = math.nan
+        self.domain = ''
+
+    @property
+    def known_bits(self) -> int:
+        bits = self.resume_bits
+        for sid, score in zip(self.score_ids.tolist(), self.score_vals.tolist()):
+            if score >= KNOWN_SCORE:
+                bits |= 1 << sid
+        return bits
+
+
+def _bit_ids(bits: int) -> list[int]:
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(low.bit_length() - 1)
+        bits ^= low
+    return ids
+
+
+class SkillIndex:
+    def __init__(self, capacity: int = 1024):
+        self.vocab = SkillVocabulary()
+        self._lock = threading.RLock()
+        self._rows = {}                      # student id → _Profile
+        self._students = []                  # row → student id
+        self._capacity = 0
+        self._active = np.zeros(0, dtype=np.uint64)
+        self._postings = []                  # skill id → uint64 words over rows
+        self._score_cols = {}                # skill id → float32 column over rows
+        self._readiness = np.zeros(0, dtype=np.float32)
+        self._grow(max(_WORD, capacity))
+
+    # ── Storage growth ────────────────────────────────────────────────────────
+
+    def _grow(self, capacity: int) -> None:
+        capacity = -(-capacity // _WORD) * _WORD
+        words = capacity // _WORD
+
+        def widen(arr, fill=0):
+            out = np.full(words if arr.dtype == np.uint64 else capacity, fill, dtype=arr.dtype)
+            out[:len(arr)] = arr
+            return out
+
+        self._active = widen(self._active)
+        self._postings = [widen(p) for p in self._postings]
+        self._score_cols = {sid: widen(col, np.nan) for sid, col in self._score_cols.items()}
+        self._readiness = widen(self._readiness, np.nan)
+        self._capacity = capacity
+
+    def _posting(self, sid: int) -> np.ndarray:
+        while sid >= len(self._postings):
+            self._postings.append(np.zeros(self._capacity // _WORD, dtype=np.uint64))
+        return self._postings[sid]
+
+    def _score_col(self, sid: int) -> np.ndarray:
+        col = self._score_cols.get(sid)
+        if col is None:
+            col = self._score_cols[sid] = np.full(self._capacity, np.nan, dtype=np.float32)
+        return col
+
+    @staticmethod
+    def _set_bit(words: np.ndarray, row: int, on: bool) -> None:
+        mask = np.uint64(1 << (row % _WORD))
+        if on:
+            words[row // _WORD] |= mask
+        else:
+            words[row // _WORD] &= ~mask
+
+    def _profile(self, student_id: str) -> _Profile:
+        profile = self._rows.get(student_id)
+        if profile is None:
+            row = len(self._students)
+            if row >= self._capacity:
+                self._grow(self._capacity * 2)
+            profile = self._rows[student_id] = _Profile(row)
+            self._students.append(student_id)
+            self._set_bit(self._active, row, True)
+        return profile
+
+    def _reindex(self, profile: _Profile, old_bits: int) -> None:
+        new_bits = profile.known_bits
+        for sid in _bit_ids(old_bits & ~new_bits):
+            self._set_bit(self._posting(sid), profile.row, False)
+        for sid in _bit_ids(new_bits & ~old_bits):
+            self._set_bit(self._posting(sid), profile.row, True)
+
+    # ── Incremental updates ───────────────────────────────────────────────────
+
+    def set_resume_skills(self, student_id: str, skills: list[str]) -> None:
+        """Replace the student's resume skills (after a resume is parsed)."""
+        with self._lock:
+            profile = self._profile(student_id)
+            old = profile.known_bits
+            bits = 0
+            for skill in skills or []:
+                if normalize_skill(skill):
+                    bits |= 1 << self.vocab.intern(skill)
+            profile.resume_bits = bits
+            self._reindex(profile, old)
+
+    def set_test_scores(self, student_id: str, scores: dict, domain: str = None) -> None:
+        """Merge graded per-skill scores (0..1) into the student's profile."""
+        with self._lock:
+            profile = self._profile(student_id)
+            old = profile.known_bits
+            merged = dict(zip(profile.score_ids.tolist(), profile.score_vals.tolist()))
+            for skill, score in (scores or {}).items():
+                sid = self.vocab.intern(skill)
+                merged[sid] = float(score)
+                self._score_col(sid)[profile.row] = float(score)
+            ids = sorted(merged)
+            profile.score_ids = np.asarray(ids, dtype=np.int32)
+            profile.score_vals = np.asarray([merged[s] for s in ids], dtype=np.float32)
+            if domain:
+                profile.domain = domain
+            self._reindex(profile, old)
+
+    def set_readiness(self, student_id: str, readiness: float, domain: str = None) -> None:
+        """Readiness in percent (0..100), as returned by /api/skill-gap/calculate."""
+        with self._lock:
+            profile = self._profile(student_id)
+            profile.readiness = float(readiness)
+            self._readiness[profile.row] = float(readiness)
+            if domain:
+                profile.domain = domain
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def query(self, has=(), missing=(), any_of=(), min_readiness=None, max_readiness=None,
+              rank_by: str = 'readiness', limit: int = 20) -> dict:
+        """
+        Students who know every skill in `has`, none in `missing`, at least
+        one in `any_of` (when given), with readiness in [min, max].
+        Ranked by readiness or by the test score of skill `rank_by`, best first.
+        """
+        with self._lock:
+            n_rows = len(self._students)
+            words = self._active.copy()
+            for skill in has:
+                sid = self.vocab.lookup(skill)
+                if sid is None or sid >= len(self._postings):
+                    return {'total': 0, 'results': []}
+                words &= self._postings[sid]
+            for skill in missing:
+                sid = self.vocab.lookup(skill)
+                if sid is not None and sid < len(self._postings):
+                    words &= ~self._postings[sid]
+            if any_of:
+                union = np.zeros_like(words)
+                for skill in any_of:
+                    sid = self.vocab.lookup(skill)
+                    if sid is not None and sid < len(self._postings):
+                        union |= self._postings[sid]
+                words &= union
+
+            mask = np.unpackbits(words.view(np.uint8), bitorder='little')[:n_rows].astype(bool)
+            readiness = self._readiness[:n_rows]
+            if min_readiness is not None:
+                mask &= readiness >= float(min_readiness)
+            if max_readiness is not None:
+                mask &= readiness <= float(max_readiness)
+            rows = np.flatnonzero(mask)
+
+            if rank_by == 'readiness':
+                keys = readiness[rows]
+            else:
+                sid = self.vocab.lookup(rank_by)
+                col = self._score_cols.get(sid) if sid is not None else None
+                keys = col[rows] if col is not None else np.full(len(rows), np.nan, dtype=np.float32)
+            keys = np.nan_to_num(keys, nan=-np.inf)
+
+            limit = max(0, int(limit))
+            if len(rows) > limit:
+                top = np.argpartition(-keys, limit - 1)[:limit] if limit else np.empty(0, dtype=np.intp)
+            else:
+                top = np.arange(len(rows))
+            top = top[np.lexsort((rows[top], -keys[top]))]
+
+            return {
+                'total':   int(len(rows)),
+                'results': [self._describe(self._rows[self._students[r]]) for r in rows[top].tolist()],
+            }
+
+    def _describe(self, profile: _Profile) -> dict:
+        names = self.vocab.names
+        return {
+            'uid':       self._students[profile.row],
+            'domain':    profile.domain,
+            'readiness': None if math.isnan(profile.readiness) else round(profile.readiness, 2),
+            'skills':    [names[s] for s in _bit_ids(profile.known_bits)],
+            'scores':    {names[s]: round(v, 4) for s, v in zip(profile.score_ids.tolist(), profile.score_vals.tolist())},
+        }
+
+    def get(self, student_id: str) -> dict | None:
+        with self._lock:
+            profile = self._rows.get(student_id)
+            return self._describe(profile) if profile else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'students':     len(self._students),
+                'skills':       len(self.vocab),
+                'capacity':     self._capacity,
+                'index_bytes':  int(sum(p.nbytes for p in self._postings)
+                                    + sum(c.nbytes for c in self._score_cols.values())
+                                    + self._readiness.nbytes + self._active.nbytes),
+            }
+
+    # ── Bulk load ─────────────────────────────────────────────────────────────
+
+    def rebuild(self, storage=None, app=None) -> dict:
+        """
+        Reload from the `resumes` collection and the history tables (latest
+        attempt scores and gap readiness per user).  Missing sources are skipped.
+        """
+        fresh = SkillIndex()
+        if storage is not None:
+            for uid, doc in storage.iter_documents('resumes'):
+                fresh.set_resume_skills(uid, (doc or {}).get('skills', []))
+        if app is not None:
+            fresh._load_history(app)
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != '_lock'})
+        return self.stats()
+
+    def _load_history(self, app) -> None:
+        from models import db, AssessmentAttempt, GapSnapshot
+
+        with app.app_context():
+            for model in (AssessmentAttempt, GapSnapshot):
+                for row in db.session.scalars(db.select(model).order_by(model.created_at, model.id)):
+                    if model is AssessmentAttempt:
+                        self.set_test_scores(row.user_id, {s.skill: s.score for s in row.skill_scores}, row.domain)
+                    else:
+                        self.set_readiness(row.user_id, row.readiness, row.domain)
+
+
+skill_index = SkillIndex()
@@ -0,0 +1,187 @@
+"""
+swot_engine.py
+──────────────
+Deterministic SWOT skeleton for /api/swot/analyze.
+
+Strengths and weaknesses follow directly from the gap data, so they are
+built here rather than by the LLM:
+
+  strengths    skills at or near the benchmark ('met', then 'minor' gaps),
+               JobInfo core skills the student's skills cover, high readiness
+  weaknesses   'critical' then 'moderate' gaps (largest weighted gap first),
+               JobInfo core skills with no evidence, low readiness
+
+Opportunities and threats get rule-based defaults too (quick wins by
+readiness gain, salary band, screening risk on critical gaps).  When
+Gemini is available, career_advisor.SwotJob asks it only for better
+opportunities and threats plus one-line rewrites of the computed items,
+and falls back to this skeleton whenever that call fails.
+"""
+
+import re
+
+from services.roadmap_generator import derive_skill_results, order_gaps, status_for
+from utils.data_loader import load_data
+
+MIN_ITEMS = 3
+MAX_ITEMS = 5
+STRONG_READINESS = 70
+WEAK_READINESS = 50
+
+
+def _item(title: str, explanation: str) -> dict:
+    return {'title': title, 'explanation': explanation}
+
+
+def _pct(value) -> int:
+    return round(float(value or 0) * 100)
+
+
+def job_info(role: str, domain: str = '') -> dict | None:
+    """JobInfo.json entry for `role` (spaces ignored), else the first title overlapping `domain`."""
+    try:
+        roles = load_data('JobInfo.json').get('roles', [])
+    except Exception:
+        return None
+    matched = next((r for r in roles if r['title'].lower().replace(' ', '') == role.lower().replace(' ', '')), None)
+    if not matched and domain:
+        matched = next((r for r in roles
+                        if domain.lower() in r['title'].lower() or r['title'].lower() in domain.lower()), None)
+    return matched
+
+
+def swot_inputs(body: dict) -> dict:
+    """
+    Normalised SWOT request: profile fields (falling back to the same keys
+    at the top level of the body), skill_results (derived from test_scores
+    when the skill-gap step was skipped), totals and the JobInfo entry.
+    """
+    profile = {**{k: body[k] for k in ('domain', 'role', 'skills', 'interests', 'name') if k in body},
+               **(body.get('profile') or {})}
+    domain = str(profile.get('domain') or 'unknown')
+    role = str(profile.get('role') or '') or domain
+    test_scores = body.get('test_scores') or {}
+    skill_results = body.get('skill_results') or derive_skill_results(role, test_scores)
+    return {
+        'profile':       profile,
+        'domain':        domain,
+        'role':          role,
+        'skills':        [str(s).lower().strip() for s in profile.get('skills') or []],
+        'skill_results': skill_results,
+        'test_scores':   test_scores,
+        'totals':        body.get('totals') or {},
+        'job':           job_info(role, domain),
+    }
+
+
+def _gaps(skill_results: dict) -> list[tuple[str, dict, str]]:
+    """(skill, info, status), most urgent first."""
+    return [(s, i, i.get('status') or status_for(float(i.get('gap', 0) or 0))) for s, i in order_gaps(skill_results)]
+
+
+def _covers(core_skill: str, skills: set[str]) -> list[str]:
+    """Known skills named in a JobInfo core-skill phrase such as 'Version control (Git)'."""
+    phrase = core_skill.lower()
+    return sorted(s for s in skills if s and re.search(rf'(?<![\w+#]){re.escape(s)}(?![\w+#])', phrase))
+
+
+def _readiness(totals: dict) -> float | None:
+    try:
+        return float(totals.get('readiness'))
+    except (TypeError, ValueError):
+        return None
+
+
+def local_swot(inputs: dict) -> dict:
+    """All four quadrants, 3–5 items each where the data allows."""
+    role, job = inputs['role'], inputs['job']
+    title = job['title'] if job else role.title()
+    gaps = _gaps(inputs['skill_results'])
+    readiness = _readiness(inputs['totals'])
+    weight_sum = sum(float(i.get('required', 0) or 0) for _, i, _ in gaps) or 1.0
+
+    # Known = listed on the profile, or at most a minor gap on the assessment
+    known = set(inputs['skills']) | {s for s, _, status in gaps if status in ('met', 'minor')}
+    core = job.get('core_skills', []) if job else []
+    covered = [(c, _covers(c, known)) for c in core]
+    assessed = set(inputs['skill_results'])
+
+    strengths = []
+    for skill, info, status in sorted(gaps, key=lambda g: -float(g[1].get('required', 0) or 0)):
+        if status == 'met':
+            strengths.append(_item(f'{skill.title()} meets the benchmark',
+                                   f"Scored {_pct(info.get('user_score'))}% against the "
+                                   f"{_pct(info.get('required'))}% benchmark for {title}."))
+    for skill, info, status in gaps:
+        if status == 'minor':
+            strengths.append(_item(f'Solid {skill.title()}',
+                                   f"{_pct(info.get('user_score'))}% against {_pct(info.get('required'))}% "
+                                   f"required, {_pct(info.get('gap'))} points from the benchmark."))
+    for phrase, matched in covered:
+        if matched and not set(matched) <= assessed:
+            strengths.append(_item(f'Covers: {phrase}',
+                                   f"Your skills ({', '.join(s.title() for s in matched)}) match this core "
+                                   f"requirement of {title} roles."))
+    if readiness is not None and readiness >= STRONG_READINESS:
+        strengths.append(_item('Strong overall readiness', f'Career readiness of {readiness:g}% for {title}.'))
+    if not strengths:
+        strengths.append(_item('Room to grow',
+                               'No skill meets the benchmark yet; every assessed improvement will show up here.'))
+
+    weaknesses = []
+    for skill, info, status in gaps:
+        if status in ('critical', 'moderate'):
+            weaknesses.append(_item(f'{skill.title()} gap ({status})',
+                                    f"Scored {_pct(info.get('user_score'))}% against {_pct(info.get('required'))}% "
+                                    f"required, a {_pct(info.get('gap'))}-point gap."))
+    for phrase, matched in covered:
+        if not matched:
+            weaknesses.append(_item(f'No evidence of: {phrase}',
+                                    f'A core skill for {title} roles that your profile and assessment do not show yet.'))
+    if readiness is not None and readiness < WEAK_READINESS:
+        weaknesses.append(_item('Low overall readiness', f'Career readiness of {readiness:g}% for {title}.'))
+    for skill, info, status in gaps:
+        if len(weaknesses) >= MIN_ITEMS:
+            break
+        if status == 'minor':
+            weaknesses.append(_item(f'{skill.title()} slightly below benchmark',
+                                    f"{_pct(info.get('user_score'))}% against {_pct(info.get('required'))}% required."))
+    if not gaps:
+        weaknesses.append(_item('No assessment results yet',
+                                'Without skill test scores, gaps against the role benchmark cannot be measured.'))
+
+    opportunities = []
+    open_gaps = [(s, i) for s, i, status in gaps if status != 'met']
+    for skill, info in sorted(open_gaps, key=lambda g: -float(g[1].get('weighted_gap', 0) or 0))[:3]:
+        gain = float(info.get('weighted_gap', 0) or 0) / weight_sum * 100
+        opportunities.append(_item(f'Quick win: {skill.title()}',
+                                   f"Raising {skill.title()} to {_pct(info.get('required'))}% would add about "
+                                   f"{gain:.1f} readiness points."))
+    salary = (job or {}).get('approx_salary', {}).get('India', {})
+    if salary.get('entry_level'):
+        later = salary.get('average') or salary.get('mid_level')
+        opportunities.append(_item(f'{title} pay in India',
+                                   f"Entry-level salaries are around {salary['entry_level']}"
+                                   + (f", rising to {later} with experience." if later else '.')))
+    if len(opportunities) < MIN_ITEMS:
+        opportunities.append(_item('Portfolio projects',
+                                   f'Projects that use the core {title} skills are direct evidence for recruiters.'))
+
+    threats = []
+    for skill, info, status in gaps:
+        if status == 'critical':
+            threats.append(_item(f'Screening risk: {skill.title()}',
+                                 f"{title} interviews commonly test {skill.title()}; a {_pct(info.get('gap'))}-point "
+                                 f"gap can screen you out early."))
+    if readiness is None or readiness < 60:
+        threats.append(_item('Competitive entry-level market',
+                             f'Entry-level {title} roles draw many applicants, so visible gaps weigh heavily.'))
+    threats.append(_item('Fast-moving tools',
+                         f'{title} tooling changes quickly; skills need regular practice to stay current.'))
+
+    return {
+        'strengths':     strengths[:MAX_ITEMS],
+        'weaknesses':    weaknesses[:MAX_ITEMS],
+        'opportunities': opportunities[:MAX_ITEMS],
+        'threats':       threats[:MAX_ITEMS],
+    }
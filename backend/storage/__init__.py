@@ -0,0 +1,61 @@
+"""
+storage
+───────
+Pluggable persistence for users and per-user documents.
+
+STORAGE_BACKEND selects the implementation:
+  firestore  (default) Firestore via utils/firebase_config.py, with write-behind
+  sqlite     embedded SQLite at SQLITE_STORAGE_PATH (default backend/instance/storage.db)
+  memory     in-process Firestore stand-in, for local runs and benchmarks
+"""
+
+import os
+import threading
+
+from storage.base import StorageBackend, USER_COLLECTIONS
+from storage.firestore_backend import FirestoreStorage
+from storage.sqlite_backend import SQLiteStorage, DEFAULT_DB_PATH
+from utils.doc_cache import doc_cache
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(backend: str = None) -> StorageBackend:
+    """Build a new backend instance (see module docstring for `backend`)."""
+    backend = (backend or os.getenv('STORAGE_BACKEND', 'firestore')).lower()
+    if backend == 'sqlite':
+        return SQLiteStorage(os.getenv('SQLITE_STORAGE_PATH', DEFAULT_DB_PATH))
+    if backend == 'memory':
+        from utils.memory_firestore import InMemoryFirestore
+        return FirestoreStorage(InMemoryFirestore(), server_timestamps=False)
+    if backend == 'firestore':
+        from utils.firebase_config import get_db
+        return FirestoreStorage(get_db())
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
+
+
+def get_storage() -> StorageBackend:
+    """Process-wide backend; cached documents are invalidated whenever it commits."""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                storage = create_storage()
+                storage.add_commit_listener(doc_cache.invalidate_many)
+                _storage = storage
+    return _storage
+
+
+def set_storage(storage: StorageBackend) -> None:
+    """Install a specific backend (benchmarks, local fakes)."""
+    global _storage
+    with _storage_lock:
+        storage.add_commit_listener(doc_cache.invalidate_many)
+        _storage = storage
+
+
+__all__ = [
+    'StorageBackend', 'FirestoreStorage', 'SQLiteStorage', 'USER_COLLECTIONS',
+    'create_storage', 'get_storage', 'set_storage',
+]
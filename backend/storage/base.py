@@ -0,0 +1,110 @@
+"""
+base.py
+───────
+Storage interface shared by the Firestore and SQLite backends.
+
+Every per-user collection (resumes, test_scores, career_matches, roadmaps,
+skill_gaps, swot_analyses, github_scrapes) holds one JSON document per
+uid, mirroring the layout in firestore.rules.  Users are keyed by email.
+Subclasses must implement every abstract method; an incomplete backend
+fails when it is instantiated, not on its first call.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+USER_COLLECTIONS = (
+    'resumes',
+    'test_scores',
+    'career_matches',
+    'roadmaps',
+    'skill_gaps',
+    'swot_analyses',
+    'github_scrapes',
+)
+
+
+class StorageBackend(ABC):
+    """Abstract persistence API used by routes and services."""
+
+    name = 'base'
+
+    # ── Users ─────────────────────────────────────────────────────────────────
+
+    @abstractmethod
+    def get_user(self, email: str) -> dict | None:
+        ...
+
+    def user_exists(self, email: str) -> bool:
+        return self.get_user(email) is not None
+
+    @abstractmethod
+    def create_user(self, user_data: dict) -> None:
+        """Insert a new user document; `user_data['email']` is the key."""
+
+    @abstractmethod
+    def update_user(self, email: str, fields: dict) -> None:
+        """Set top-level `fields` of a user, like Firestore update()."""
+
+    # ── Per-user documents ────────────────────────────────────────────────────
+
+    @abstractmethod
+    def get_document(self, collection: str, uid: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def save_document(self, collection: str, uid: str, data: dict, merge: bool = True) -> None:
+        """
+        Write a document.  A merge write deep-merges nested maps into the stored
+        document like Firestore set(..., merge=True): None values are stored as
+        null, not removed.
+        """
+
+    @abstractmethod
+    def iter_documents(self, collection: str):
+        """Yield (uid, data) for every document in `collection` (bulk loads only)."""
+
+    def get_resume(self, uid: str) -> dict | None:
+        return self.get_document('resumes', uid)
+
+    def save_resume(self, uid: str, data: dict) -> None:
+        self.save_document('resumes', uid, data)
+
+    def get_test_scores(self, uid: str) -> dict | None:
+        return self.get_document('test_scores', uid)
+
+    def save_test_scores(self, uid: str, data: dict) -> None:
+        self.save_document('test_scores', uid, data)
+
+    def get_career_matches(self, uid: str) -> dict | None:
+        return self.get_document('career_matches', uid)
+
+    def save_career_matches(self, uid: str, data: dict) -> None:
+        self.save_document('career_matches', uid, data)
+
+    def get_roadmap(self, uid: str) -> dict | None:
+        return self.get_document('roadmaps', uid)
+
+    def save_roadmap(self, uid: str, data: dict) -> None:
+        self.save_document('roadmaps', uid, data)
+
+    # ── Misc ──────────────────────────────────────────────────────────────────
+
+    def timestamp(self):
+        """Value to store in *At fields; backends may return a server sentinel."""
+        return datetime.utcnow().isoformat()
+
+    @abstractmethod
+    def add_commit_listener(self, fn) -> None:
+        """Register `fn(keys)` to run after writes land; synchronous backends call it inline."""
+
+    def flush(self) -> None:
+        """Block until all buffered writes are durable."""
+
+    def close(self) -> None:
+        self.flush()
+
+
+def check_collection(collection: str) -> None:
+    if collection not in USER_COLLECTIONS:
+        raise ValueError(f"Unknown collection: {collection}")
@@ -0,0 +1,159 @@
+"""
+sqlite_backend.py
+─────────────────
+Embedded SQLite implementation of StorageBackend for self-hosted
+deployments and offline benchmarks.
+
+Users get real columns (email primary key, created_at index); every
+per-user collection is a (uid PRIMARY KEY, data JSON, updated_at) table
+with an updated_at index.  Merge writes read, merge and rewrite the
+document in one transaction with the write-behind queue's merge_document,
+so they match Firestore's set(..., merge=True) exactly; SQLite's json_patch
+would instead delete keys whose new value is null.  The database runs in
+WAL mode with one connection per thread.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from storage.base import StorageBackend, USER_COLLECTIONS, check_collection
+from utils.write_behind import merge_document
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_DB_PATH = os.path.join(_INSTANCE_DIR, 'storage.db')
+
+_USER_COLUMNS = ('email', 'full_name', 'password_hash', 'created_at')
+
+
+def _schema() -> str:
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            email          TEXT PRIMARY KEY,
+            full_name      TEXT,
+            password_hash  TEXT,
+            created_at     TEXT,
+            extra          TEXT NOT NULL DEFAULT '{}'
+        )""",
+        'CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at)',
+    ]
+    for collection in USER_COLLECTIONS:
+        statements.append(f"""
+        CREATE TABLE IF NOT EXISTS {collection} (
+            uid         TEXT PRIMARY KEY,
+            data        TEXT NOT NULL,
+            updated_at  REAL NOT NULL
+        )""")
+        statements.append(
+            f'CREATE INDEX IF NOT EXISTS idx_{collection}_updated_at ON {collection} (updated_at)'
+        )
+    return ';\n'.join(statements) + ';'
+
+
+class SQLiteStorage(StorageBackend):
+    name = 'sqlite'
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._listeners = []
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn().executescript(_schema())
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ── Users ─────────────────────────────────────────────────────────────────
+
+    def get_user(self, email: str) -> dict | None:
+        row = self._conn().execute(
+            'SELECT email, full_name, password_hash, created_at, extra FROM users WHERE email = ?',
+            (email,),
+        ).fetchone()
+        if row is None:
+            return None
+        user = {**json.loads(row[4]), **dict(zip(_USER_COLUMNS, row[:4]))}
+        user['id'] = row[0]
+        return user
+
+    def user_exists(self, email: str) -> bool:
+        return self._conn().execute('SELECT 1 FROM users WHERE email = ?', (email,)).fetchone() is not None
+
+    def create_user(self, user_data: dict) -> None:
+        extra = {k: v for k, v in user_data.items() if k not in _USER_COLUMNS and k != 'id'}
+        self._conn().execute(
+            'INSERT INTO users (email, full_name, password_hash, created_at, extra) VALUES (?, ?, ?, ?, ?)',
+            (user_data['email'], user_data.get('full_name'), user_data.get('password_hash'),
+             user_data.get('created_at'), json.dumps(extra)),
+        )
+        self._notify([('users', user_data['email'])])
+
+    def update_user(self, email: str, fields: dict) -> None:
+        conn = self._conn()
+        columns = {k: v for k, v in fields.items() if k in _USER_COLUMNS and k != 'email'}
+        extra = {k: v for k, v in fields.items() if k not in _USER_COLUMNS and k != 'id'}
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if columns:
+                assignments = ', '.join(f'{k} = ?' for k in columns)
+                conn.execute(f'UPDATE users SET {assignments} WHERE email = ?', (*columns.values(), email))
+            if extra:
+                # Top-level fields are replaced, nulls included, as Firestore update() does
+                row = conn.execute('SELECT extra FROM users WHERE email = ?', (email,)).fetchone()
+                if row:
+                    conn.execute('UPDATE users SET extra = ? WHERE email = ?',
+                                 (json.dumps({**json.loads(row[0]), **extra}), email))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        self._notify([('users', email)])
+
+    # ── Per-user documents ────────────────────────────────────────────────────
+
+    def get_document(self, collection: str, uid: str) -> dict | None:
+        check_collection(collection)
+        row = self._conn().execute(f'SELECT data FROM {collection} WHERE uid = ?', (uid,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_document(self, collection: str, uid: str, data: dict, merge: bool = True) -> None:
+        check_collection(collection)
+        conn = self._conn()
+        sql = f'INSERT OR REPLACE INTO {collection} (uid, data, updated_at) VALUES (?, ?, ?)'
+        if not merge:
+            conn.execute(sql, (uid, json.dumps(data, default=str), time.time()))
+        else:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(f'SELECT data FROM {collection} WHERE uid = ?', (uid,)).fetchone()
+                merged = merge_document(json.loads(row[0]) if row else {}, data)
+                conn.execute(sql, (uid, json.dumps(merged, default=str), time.time()))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        self._notify([(collection, uid)])
+
+    def iter_documents(self, collection: str):
+        check_collection(collection)
+        for uid, data in self._conn().execute(f'SELECT uid, data FROM {collection}'):
+            yield uid, json.loads(data)
+
+    # ── Misc ──────────────────────────────────────────────────────────────────
+
+    def add_commit_listener(self, fn) -> None:
+        self._listeners.append(fn)
+
+    def _notify(self, keys) -> None:
+        for fn in self._listeners:
+            fn(keys)
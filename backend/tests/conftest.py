@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Keep the app's databases and caches out of backend/instance; set before run.py is imported
+_tmp = tempfile.mkdtemp(prefix='skillbridge-tests-')
+os.environ.update({
+    'DATABASE_URL':        f"sqlite:///{os.path.join(_tmp, 'skillbridge.db')}",
+    'STORAGE_BACKEND':     'memory',
+    'HTTP_CACHE_PATH':     os.path.join(_tmp, 'http_cache.db'),
+    'ANALYSIS_CACHE_PATH': os.path.join(_tmp, 'analysis_cache.db'),
+    'RESUME_PAGES_PATH':   os.path.join(_tmp, 'resume_pages.db'),
+    'WARMUP':              '0',
+    'ADMISSION_CONTROL':   '0',
+})
+os.environ.setdefault('JWT_SECRET_KEY', 'test-jwt-secret-0123456789abcdef')
+os.environ.pop('GEMINI_API_KEY', None)
+os.environ.pop('GITHUB_TOKEN', None)
+
+
+@pytest.fixture(scope='session')
+def app():
+    from run import app
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(app):
+    """auth(identity) → Authorization header for a signed-in user."""
+    from flask_jwt_extended import create_access_token
+
+    def headers(identity: str = 'student@example.com') -> dict:
+        with app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=identity)}'}
+    return headers
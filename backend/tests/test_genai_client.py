@@ -0,0 +1,59 @@
+import os
+import sys
+import json
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip('google.genai')
+
+import utils.genai_client as genai_client
+from benchmarks.fakes import FakeGemini
+from utils.model_router import get_router
+
+
+class _CutOffGemini(FakeGemini):
+    """Stops every reply at the output cap, with no text, as Gemini does when thinking eats the budget."""
+
+    def __init__(self):
+        super().__init__()
+        self.configs = []
+
+    def respond(self, path, headers, body):
+        self.configs.append(json.loads(body).get('generationConfig') or {})
+        return 200, {'Content-Type': 'application/json'}, {
+            'candidates': [{'content': {'role': 'model', 'parts': []}, 'finishReason': 'MAX_TOKENS'}],
+            'usageMetadata': {'promptTokenCount': 10, 'candidatesTokenCount': 8192},
+        }
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    server = _CutOffGemini().start()
+    monkeypatch.setenv('GEMINI_BASE_URL', server.url)
+    monkeypatch.setattr(genai_client, '_clients', {})
+    yield server
+    server.stop()
+
+
+def test_resume_parse_has_room_for_long_resumes():
+    assert get_router().route('resume_parse').max_output_tokens >= 8192
+
+
+def test_max_tokens_reply_raises_truncated(gemini):
+    with pytest.raises(genai_client.GeminiTruncated) as err:
+        genai_client.generate_content('resume_parse', 'Resume Pages: ...', api_key='test-key')
+    assert err.value.max_output_tokens == 8192
+    assert gemini.configs[0]['maxOutputTokens'] == 8192
+    # A cut-off reply is not retried on the fallback model: it would hit the same cap
+    assert gemini.requests == 1
+
+
+def test_max_tokens_reply_raises_truncated_async(gemini):
+    async def call():
+        return await genai_client.agenerate_content('repo_analysis', 'Repo Name: a/b', api_key='test-key')
+
+    with pytest.raises(genai_client.GeminiTruncated):
+        asyncio.run(call())
@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_record_rejects_non_string_domain(client, auth):
+    for body in ({'domain': 5}, {'rows': [{'domain': 'data science'}, {'domain': ['x']}]}, {'domain': '  '}):
+        resp = client.post('/api/history/attempts', json=body, headers=auth())
+        assert resp.status_code == 400, body
+        assert 'domain' in resp.get_json()['error']
+
+
+def test_record_and_read_back(client, auth):
+    headers = auth('history@example.com')
+    resp = client.post('/api/history/gaps', json={'domain': 'Data Science', 'totals': {'readiness': 40}}, headers=headers)
+    assert resp.status_code == 201
+    page = client.get('/api/history/gaps/progress?domain=data science', headers=headers).get_json()
+    assert [row['readiness'] for row in page['items']] == [40]
@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.assessment_engine import QuestionBank
+
+
+def _start_test(client, headers):
+    resp = client.get('/api/mcq', headers=headers)
+    assert resp.status_code == 200
+    return resp.get_json()
+
+
+def test_submit_grades_once(client, auth):
+    headers = auth('once@example.com')
+    session = _start_test(client, headers)
+    body = {'session_id': session['session_id'], 'answers': []}
+    assert client.post('/api/mcq/submit', json=body, headers=headers).status_code == 200
+    assert client.post('/api/mcq/submit', json=body, headers=headers).status_code == 409
+
+
+def test_concurrent_submits_record_one_attempt(app, client, auth, monkeypatch):
+    from models import AssessmentAttempt, db
+
+    headers = auth('race@example.com')
+    session = _start_test(client, headers)
+    body = {'session_id': session['session_id'], 'answers': []}
+
+    # Hold both requests after the submitted_at check until each has graded
+    both_graded = threading.Barrier(2, timeout=5)
+    grade = QuestionBank.grade
+
+    def slow_grade(self, question_ids, answers):
+        result = grade(self, question_ids, answers)
+        both_graded.wait()
+        return result
+
+    monkeypatch.setattr(QuestionBank, 'grade', slow_grade)
+    statuses = []
+
+    def submit():
+        statuses.append(app.test_client().post('/api/mcq/submit', json=body, headers=headers).status_code)
+
+    threads = [threading.Thread(target=submit) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+
+    assert sorted(statuses) == [200, 409]
+    with app.app_context():
+        attempts = db.session.execute(
+            db.select(AssessmentAttempt).where(AssessmentAttempt.user_id == 'race@example.com')).scalars().all()
+    assert len(attempts) == 1
@@ -0,0 +1,47 @@
+import os
+import sys
+import logging
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.password_pool import HashPoolSaturated, PasswordHasher
+
+FAST = 'pbkdf2:sha256:1000'
+
+
+def test_hash_verify_and_rehash():
+    hasher = PasswordHasher(method=FAST, workers=2)
+    pw_hash = hasher.hash('secret')
+    assert hasher.verify(pw_hash, 'secret') and not hasher.verify(pw_hash, 'wrong')
+    assert not hasher.needs_rehash(pw_hash)
+    assert PasswordHasher(method='pbkdf2:sha256:2000', workers=1).needs_rehash(pw_hash)
+
+
+def test_saturated_pool_rejects_and_counts():
+    hasher = PasswordHasher(method=FAST, workers=1, max_queue=0)
+    release = threading.Event()
+    hasher._submit(release.wait)
+    try:
+        with pytest.raises(HashPoolSaturated):
+            hasher.hash('secret')
+        assert hasher.stats()['rejected'] == 1
+    finally:
+        release.set()
+
+
+def test_failed_rehash_save_is_logged(caplog):
+    hasher = PasswordHasher(method=FAST, workers=1)
+    done = threading.Event()
+
+    def save(new_hash):
+        done.set()
+        raise RuntimeError('storage down')
+
+    with caplog.at_level(logging.ERROR, logger='utils.password_pool'):
+        hasher.rehash_async('secret', save)
+        assert done.wait(5)
+        hasher._executor.shutdown(wait=True)
+    assert any('rehash save failed' in r.getMessage() for r in caplog.records)
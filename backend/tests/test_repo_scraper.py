@@ -0,0 +1,96 @@
+import os
+import sys
+import asyncio
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.repo_scraper as repo_scraper
+from benchmarks.fakes import FakeGitHub
+
+
+class _MovedGitHub(FakeGitHub):
+    """FakeGitHub where `old-owner`'s repos answer 301, as GitHub does for a transferred repo."""
+
+    def respond(self, path, headers, body):
+        if path.startswith('/repos/old-owner/'):
+            return 301, {'Location': path.replace('/old-owner/', '/new-owner/', 1)}, {'message': 'Moved'}
+        if path.startswith('/repos/loop/'):
+            return 302, {'Location': path}, b''
+        if path.startswith('/repos/choice/'):
+            return 300, {}, {'message': 'Multiple Choices'}
+        return super().respond(path, headers, body)
+
+
+@pytest.fixture
+def github(monkeypatch):
+    monkeypatch.setattr(repo_scraper, 'get_http_cache', lambda: None)
+    server = _MovedGitHub().start()
+    yield server
+    server.stop()
+
+
+def test_follows_redirect_for_moved_repo(github):
+    bundle = repo_scraper.fetch_repo_bundle('old-owner', 'app', api_base=github.url)
+    assert bundle['repo']['full_name'] == 'new-owner/app'
+    assert bundle['languages']
+    assert bundle['readme'].startswith('# app')
+
+
+def test_redirect_loop_and_other_3xx_are_errors(github):
+    with pytest.raises(repo_scraper.GitHubHTTPError) as err:
+        repo_scraper.fetch_repo_bundle('loop', 'app', api_base=github.url)
+    assert err.value.code == 302
+
+    with pytest.raises(repo_scraper.GitHubHTTPError) as err:
+        repo_scraper.fetch_repo_bundle('choice', 'app', api_base=github.url)
+    assert err.value.code == 300
+
+
+def test_async_client_follows_redirect_for_moved_repo(github):
+    async def fetch():
+        try:
+            return await repo_scraper.fetch_repo_bundle_async('old-owner', 'app', api_base=github.url)
+        finally:
+            await repo_scraper.aclose()
+
+    bundle = asyncio.run(fetch())
+    assert bundle['repo']['full_name'] == 'new-owner/app'
+    assert bundle['readme'].startswith('# app')
+
+
+def _low_quota(remaining: int, window: float = 100) -> repo_scraper.RateLimitScheduler:
+    scheduler = repo_scraper.RateLimitScheduler(low_water=10, max_wait=30)
+    scheduler.observe({'x-ratelimit-remaining': str(remaining),
+                       'x-ratelimit-reset': str(repo_scraper.time.time() + window)})
+    return scheduler
+
+
+def test_interactive_wait_is_bounded_by_the_deadline():
+    scheduler = _low_quota(5)
+    deadline = scheduler.deadline()
+    waits = [scheduler._reserve(deadline)]      # slots are 100 s / 5 = 20 s apart
+    with pytest.raises(repo_scraper.RateLimitExceeded) as err:
+        scheduler._reserve(deadline)
+    assert err.value.retry_after > 0
+    assert 0 < waits[0] <= scheduler.max_wait
+    # The refused call did not claim a slot or spend quota
+    assert scheduler.remaining == 4
+
+
+def test_batch_calls_keep_pacing_past_the_budget():
+    scheduler = _low_quota(5)
+    waits = [scheduler._reserve() for _ in range(3)]
+    assert waits == sorted(waits) and waits[-1] > scheduler.max_wait
+    assert scheduler.remaining == 2
+
+
+def test_interactive_scrape_raises_when_quota_would_stall_it(monkeypatch, github):
+    scheduler = _low_quota(1, window=3600)
+    monkeypatch.setattr(repo_scraper, '_rate_limiter', scheduler)
+    scheduler._next_slot = repo_scraper.time.time() + 120    # earlier callers hold the next slots
+
+    with pytest.raises(repo_scraper.RateLimitExceeded):
+        repo_scraper.scrape_github_repo('https://github.com/someone/app', api_base=github.url)
+    assert github.requests == 0
@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.resume_parser import ResumeParseJob, page_fingerprint
+
+
+def _pages(*texts):
+    return [{'page': n, 'content_hash': f'c{n}', 'text': text} for n, text in enumerate(texts, 1)]
+
+
+def _stored(pages, continues=()):
+    return [{'page': p['page'], 'content_hash': p['content_hash'], 'text_hash': page_fingerprint(p['text']),
+             'text': p['text'], 'fragment': {'skills': [], 'experience': [], 'projects': [],
+                                             'continues': p['page'] in continues}}
+            for p in pages]
+
+
+def test_prompt_carries_both_neighbours_as_context():
+    job = ResumeParseJob(_pages('first page ends mid-entry', 'second page', 'third page'),
+                         _stored(_pages('first page ends mid-entry', 'old second', 'third page')))
+    assert [p['page'] for p in job.pending] == [2]
+    prompt = job.contents
+    assert '[context, end of page 1]\nfirst page ends mid-entry' in prompt
+    assert '[context, start of page 3]\nthird page' in prompt
+
+
+def test_page_continuing_onto_an_edited_page_is_reparsed():
+    old = _pages('Engineer at Acme, built', 'the billing system', 'Projects')
+    new = _pages('Engineer at Acme, built', 'the billing and search systems', 'Projects')
+
+    job = ResumeParseJob(new, _stored(old, continues={1}))
+    assert job.reparsed == [1, 2]
+    assert '--- Page 1 ---' in job.contents and '[context, start of page 3]' in job.contents
+
+    # Without a continuing entry only the edited page goes to Gemini
+    assert ResumeParseJob(_pages(*(p['text'] for p in new)), _stored(old)).reparsed == [2]
+
+
+def test_continues_flag_survives_the_reply():
+    job = ResumeParseJob(_pages('Engineer at Acme, built'))
+    job.apply(json.dumps({'pages': {'1': {'experience': [{'title': 'Engineer'}], 'continues': True}}}))
+    assert job.pages[0]['fragment']['continues'] is True
+    assert job.finish()['experience'] == [{'title': 'Engineer'}]
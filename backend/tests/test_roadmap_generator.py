@@ -0,0 +1,73 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.roadmap_generator import generate_roadmap, update_roadmap
+
+
+def _nested_arrays(value) -> bool:
+    """True if `value` holds an array directly inside an array (Firestore rejects those)."""
+    if isinstance(value, dict):
+        return any(_nested_arrays(v) for v in value.values())
+    if isinstance(value, list):
+        return any(isinstance(v, list) or _nested_arrays(v) for v in value)
+    return False
+
+
+def test_stored_roadmap_has_no_nested_arrays():
+    roadmap = generate_roadmap('data scientist', {}, {'python': 0.4})
+    assert set(roadmap['inputs']['python']) == {'gap', 'status', 'user_score'}
+    assert roadmap['inputs']['python']['user_score'] == 0.4
+    assert not _nested_arrays(roadmap)
+
+    updated, regenerated = update_roadmap(roadmap, 'data scientist', {}, {'python': 0.9})
+    assert regenerated
+    assert updated['inputs']['python']['status'] == 'met'
+    assert not _nested_arrays(updated)
+
+
+def test_update_reads_legacy_input_rows():
+    roadmap = generate_roadmap('data scientist', {}, {'python': 0.4})
+    legacy = dict(roadmap, inputs=[[s, v['gap'], v['status'], v['user_score']]
+                                   for s, v in roadmap['inputs'].items()])
+
+    unchanged, regenerated = update_roadmap(legacy, 'data scientist', {}, {'python': 0.4})
+    assert regenerated == []
+    assert unchanged['inputs'] == roadmap['inputs']
+
+    _, regenerated = update_roadmap(legacy, 'data scientist', {}, {'python': 0.9})
+    assert regenerated
+
+
+def test_dropped_skill_is_cleared_for_merge_writes():
+    results = {
+        'python': {'required': 0.8, 'user_score': 0.2, 'gap': 0.6, 'status': 'critical'},
+        'sql':    {'required': 0.7, 'user_score': 0.3, 'gap': 0.4, 'status': 'moderate'},
+    }
+    roadmap = generate_roadmap('data scientist', results)
+    updated, _ = update_roadmap(roadmap, 'data scientist', {'python': results['python']})
+    assert updated['inputs']['sql'] is None
+
+    # A stored map that still carries the None compares clean on the next request
+    again, regenerated = update_roadmap(updated, 'data scientist', {'python': results['python']})
+    assert regenerated == []
+    assert 'sql' not in again['inputs']
+
+
+def test_role_without_catalog_entry_or_results_gets_four_phases():
+    roadmap = generate_roadmap('underwater basket weaver', {})
+    phases = roadmap['phases']
+    assert [p['phase_number'] for p in phases] == [1, 2, 3, 4]
+    assert all(p['skills_to_learn'] and p['projects'] and p['resources'] for p in phases)
+    # The summary names what the learning phases cover
+    for phase in phases[:-1]:
+        assert phase['skills_to_learn'][0] in roadmap['summary']
+
+
+def test_single_gap_is_topped_up_to_three_learning_phases():
+    results = {'python': {'required': 0.8, 'user_score': 0.2, 'gap': 0.6, 'status': 'critical'}}
+    roadmap = generate_roadmap('data scientist', results)
+    assert len(roadmap['phases']) == 4
+    assert roadmap['phases'][0]['skill_keys'] == ['python']
+    assert list(roadmap['inputs']) == ['python']
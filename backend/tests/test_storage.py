@@ -0,0 +1,46 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage import FirestoreStorage, SQLiteStorage, StorageBackend
+from utils.memory_firestore import InMemoryFirestore
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def storage(request, tmp_path):
+    if request.param == 'sqlite':
+        backend = SQLiteStorage(str(tmp_path / 'storage.db'))
+    else:
+        backend = FirestoreStorage(InMemoryFirestore(), server_timestamps=False)
+    yield backend
+    backend.close()
+
+
+def test_merge_write_deep_merges_and_keeps_nulls(storage):
+    storage.save_document('roadmaps', 'u1', {'roadmaps': {'data scientist': {'inputs': {'python': {'gap': 0.5},
+                                                                                        'sql': {'gap': 0.2}}}}})
+    storage.save_document('roadmaps', 'u1', {'roadmaps': {'data scientist': {'inputs': {'sql': None}},
+                                                          'web developer': {'phases': []}}})
+    storage.flush()
+    doc = storage.get_roadmap('u1')['roadmaps']
+    assert doc['data scientist']['inputs'] == {'python': {'gap': 0.5}, 'sql': None}
+    assert doc['web developer'] == {'phases': []}
+
+
+def test_plain_write_replaces_the_document(storage):
+    storage.save_document('resumes', 'u1', {'skills': ['python'], 'fullName': 'A'})
+    storage.save_document('resumes', 'u1', {'skills': ['sql']}, merge=False)
+    storage.flush()
+    assert storage.get_resume('u1') == {'skills': ['sql']}
+
+
+def test_incomplete_backend_fails_at_construction():
+    class Partial(StorageBackend):
+        def get_user(self, email):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
@@ -0,0 +1,128 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.write_behind import WriteBehindQueue
+
+
+class _Sentinel:
+    """Stands in for google.cloud.firestore.SERVER_TIMESTAMP (matched by identity)."""
+
+
+SENTINEL = _Sentinel()
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.sets = []
+
+    def collection(self, name):
+        return self
+
+    def document(self, doc_id):
+        return doc_id
+
+    def batch(self):
+        return self
+
+    def set(self, ref, data, merge=False):
+        self.sets.append((ref, data, merge))
+
+    def commit(self):
+        pass
+
+
+def test_flush_passes_sentinels_through_unchanged():
+    client = _RecordingClient()
+    queue = WriteBehindQueue(client, flush_interval=60)
+    try:
+        queue.enqueue('resumes', 'u1', {'skills': ['python'], 'parsedAt': SENTINEL, 'meta': {'at': SENTINEL}})
+        queue.enqueue('resumes', 'u1', {'fullName': 'A'})
+        assert queue.peek('resumes', 'u1')['parsedAt'] is SENTINEL
+        assert queue.flush() == 1
+    finally:
+        queue.close()
+
+    (ref, data, merge), = client.sets
+    assert ref == 'u1' and merge
+    assert data['parsedAt'] is SENTINEL
+    assert data['meta']['at'] is SENTINEL
+    assert data['fullName'] == 'A'
+
+
+def test_enqueue_copies_containers():
+    client = _RecordingClient()
+    queue = WriteBehindQueue(client, flush_interval=60)
+    try:
+        doc = {'skills': ['python'], 'meta': {'n': 1}}
+        queue.enqueue('resumes', 'u1', doc)
+        doc['skills'].append('sql')
+        doc['meta']['n'] = 2
+        assert queue.peek('resumes', 'u1') == {'skills': ['python'], 'meta': {'n': 1}}
+    finally:
+        queue.close()
+
+
+class _RejectingClient(_RecordingClient):
+    """Fails a whole batch commit, as Firestore does, when any document in it is invalid."""
+
+    def batch(self):
+        client = self
+
+        class _Batch:
+            def __init__(self):
+                self.sets = []
+
+            def set(self, ref, data, merge=False):
+                self.sets.append((ref, data, merge))
+
+            def commit(self):
+                if any(data.get('invalid') for _, data, _ in self.sets):
+                    raise ValueError('Cannot convert to a Firestore Value')
+                client.sets.extend(self.sets)
+
+        return _Batch()
+
+
+def test_invalid_document_does_not_drop_the_rest_of_its_batch():
+    client = _RejectingClient()
+    queue = WriteBehindQueue(client, flush_interval=60, max_retries=2)
+    try:
+        for uid in ('u1', 'u2', 'u3', 'u4', 'u5'):
+            queue.enqueue('resumes', uid, {'skills': ['python']})
+        queue.enqueue('roadmaps', 'u3', {'inputs': [['python', 0.5]], 'invalid': True})
+
+        assert queue.flush() == 5
+        assert sorted(ref for ref, _, _ in client.sets) == ['u1', 'u2', 'u3', 'u4', 'u5']
+        assert queue.pending_count() == 1
+        assert queue.peek('roadmaps', 'u3') is not None
+
+        for _ in range(2):
+            assert queue.flush() == 0
+        assert queue.pending_count() == 0
+        assert queue.stats['failed'] == 1
+        assert queue.stats['written'] == 5
+    finally:
+        queue.close()
+
+
+def test_transient_failure_requeues_the_batch_whole():
+    client = _RecordingClient()
+    commits = []
+
+    def commit():
+        commits.append(1)
+        raise ConnectionError('firestore unavailable')
+
+    client.commit = commit
+    queue = WriteBehindQueue(client, flush_interval=60)
+    try:
+        for uid in ('u1', 'u2', 'u3'):
+            queue.enqueue('resumes', uid, {'skills': ['python']})
+        assert queue.flush() == 0
+        assert len(commits) == 1
+        assert queue.pending_count() == 3
+    finally:
+        client.commit = lambda: None
+        queue.close()
@@ -0,0 +1,293 @@
+"""
+admission.py
+────────────
+Admission control for the expensive routes (Gemini, GitHub, PDF parsing).
+
+Two checks run before such a route does any work:
+
+  1. Upstream in-flight caps.  Each route declares the dependencies it holds
+     while running; at most ADMISSION_MAX_INFLIGHT_<DEP> requests may hold a
+     dependency at once (gemini 64, github 16 by default).  A request over
+     the cap is rejected straight away instead of queueing behind it.
+  2. Per-identity token bucket.  Every signed-in user (or client IP when
+     anonymous) has a bucket of ADMISSION_TOKENS tokens (default 30),
+     refilled at ADMISSION_REFILL_PER_MINUTE (default 30).  A request costs
+     its route's weight from ADMISSION_RULES.
+
+A rejection raises AdmissionRejected, which the apps turn into
+429 Too Many Requests with a Retry-After header, and is counted in
+skillbridge_admission_rejections_total (utils/metrics.py).
+
+    with get_admission().admit('swot', identity):
+        ...call Gemini...
+
+State lives in memory by default (per process).  ADMISSION_BACKEND=sqlite
+keeps buckets and in-flight slots in a local SQLite file
+(ADMISSION_DB_PATH, default backend/instance/admission.db) so the limits
+hold across all workers on the host; slots carry a lease so a crashed
+worker cannot leak them.  ADMISSION_CONTROL=0 disables the checks.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import threading
+
+from utils.metrics import admission_rejected
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_DB_PATH = os.path.join(_INSTANCE_DIR, 'admission.db')
+
+# name: (token cost, upstream dependencies held while the request runs)
+ADMISSION_RULES = {
+    'roadmap':        (1,  ()),
+    'roadmap_enrich': (4,  ('gemini',)),
+    'swot':           (4,  ('gemini',)),
+    'resume_parse':   (3,  ('gemini',)),
+    'github_scrape':  (3,  ('github', 'gemini')),
+    'github_batch':   (10, ('github', 'gemini')),
+}
+
+DEFAULT_INFLIGHT_LIMITS = {'gemini': 64, 'github': 16}
+SLOT_LEASE_SECONDS = 600
+_PRUNE_EVERY = 1000
+
+
+class AdmissionRejected(Exception):
+    """Request refused; `retry_after` is whole seconds for the Retry-After header."""
+
+    def __init__(self, rule: str, reason: str, retry_after: float):
+        self.rule = rule
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(f'{rule}: {reason}')
+
+    def payload(self) -> dict:
+        if self.reason == 'rate_limited':
+            message = 'Too many requests. Please wait before trying again.'
+        else:
+            message = 'The service is busy. Please try again shortly.'
+        return {'error': message, 'reason': self.reason, 'retry_after': self.retry_after}
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+
+class MemoryAdmissionBackend:
+    """Buckets and slots for this process only."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._slots = {}
+        self._next_slot = 0
+        self._calls = 0
+        self._lock = threading.Lock()
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        """Spend `cost` tokens; returns 0 on success, else seconds until they are available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            self._buckets[key] = (tokens - cost if not wait else tokens, now)
+            self._calls += 1
+            if self._calls % _PRUNE_EVERY == 0:
+                full_after = capacity / rate
+                self._buckets = {k: v for k, v in self._buckets.items() if now - v[1] < full_after}
+            return wait
+
+    def acquire(self, dependency: str, limit: int):
+        with self._lock:
+            held = self._slots.setdefault(dependency, set())
+            if len(held) >= limit:
+                return None
+            self._next_slot += 1
+            held.add(self._next_slot)
+            return self._next_slot
+
+    def release(self, dependency: str, slot) -> None:
+        with self._lock:
+            self._slots.get(dependency, set()).discard(slot)
+
+    def in_flight(self) -> dict:
+        with self._lock:
+            return {dep: len(held) for dep, held in self._slots.items()}
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key         TEXT PRIMARY KEY,
+    tokens      REAL NOT NULL,
+    updated_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    dependency  TEXT NOT NULL,
+    pid         INTEGER NOT NULL,
+    expires_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_slots_dependency ON slots (dependency, expires_at);
+"""
+
+
+class SQLiteAdmissionBackend:
+    """Buckets and slots in a SQLite file shared by every worker process on the host."""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, lease: float = SLOT_LEASE_SECONDS):
+        self.path = path
+        self.lease = lease
+        self._calls = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def _transaction(self, fn):
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(self._conn, time.time())
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            return result
+
+    def take(self, key: str, cost: float, capacity: float, rate: float) -> float:
+        def step(conn, now):
+            row = conn.execute('SELECT tokens, updated_at FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else min(capacity, row[0] + max(0.0, now - row[1]) * rate)
+            wait = 0.0 if tokens >= cost else (cost - tokens) / rate
+            conn.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)',
+                         (key, tokens - cost if not wait else tokens, now))
+            self._calls += 1
+            if self._calls % _PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM buckets WHERE updated_at < ?', (now - capacity / rate,))
+            return wait
+        return self._transaction(step)
+
+    def acquire(self, dependency: str, limit: int):
+        def step(conn, now):
+            conn.execute('DELETE FROM slots WHERE expires_at < ?', (now,))
+            held = conn.execute('SELECT COUNT(*) FROM slots WHERE dependency = ?', (dependency,)).fetchone()[0]
+            if held >= limit:
+                return None
+            cur = conn.execute('INSERT INTO slots (dependency, pid, expires_at) VALUES (?, ?, ?)',
+                               (dependency, os.getpid(), now + self.lease))
+            return cur.lastrowid
+        return self._transaction(step)
+
+    def release(self, dependency: str, slot) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM slots WHERE id = ?', (slot,))
+
+    def in_flight(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT dependency, COUNT(*) FROM slots WHERE expires_at >= ? GROUP BY dependency', (time.time(),)
+            ).fetchall()
+        return dict(rows)
+
+
+# ─── Controller ───────────────────────────────────────────────────────────────
+
+class Ticket:
+    """Admission granted; holds dependency slots until released (idempotent)."""
+
+    def __init__(self, backend, slots: list):
+        self._backend = backend
+        self._slots = slots
+
+    def release(self) -> None:
+        slots, self._slots = self._slots, []
+        for dependency, slot in slots:
+            self._backend.release(dependency, slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AdmissionController:
+    def __init__(self, backend=None, rules: dict = None, capacity: float = 30.0,
+                 refill_per_minute: float = 30.0, inflight_limits: dict = None,
+                 overload_retry_after: float = 2.0, enabled: bool = True):
+        self.backend = backend or MemoryAdmissionBackend()
+        self.rules = rules or ADMISSION_RULES
+        self.capacity = capacity
+        self.rate = refill_per_minute / 60.0
+        self.inflight_limits = {**DEFAULT_INFLIGHT_LIMITS, **(inflight_limits or {})}
+        self.overload_retry_after = overload_retry_after
+        self.enabled = enabled
+
+    def admit(self, rule: str, identity: str) -> Ticket:
+        """Reserve dependency slots and spend tokens for `rule`, or raise AdmissionRejected."""
+        if not self.enabled:
+            return Ticket(self.backend, [])
+        cost, dependencies = self.rules[rule]
+
+        # Slots first, so a request turned away as overloaded is not charged tokens
+        slots = []
+        ticket = Ticket(self.backend, slots)
+        for dependency in dependencies:
+            limit = self.inflight_limits.get(dependency)
+            if limit is None:
+                continue
+            slot = self.backend.acquire(dependency, limit)
+            if slot is None:
+                ticket.release()
+                return self._reject(rule, f'overloaded:{dependency}', self.overload_retry_after)
+            slots.append((dependency, slot))
+
+        try:
+            wait = self.backend.take(identity, min(cost, self.capacity), self.capacity, self.rate)
+        except BaseException:
+            ticket.release()
+            raise
+        if wait:
+            ticket.release()
+            return self._reject(rule, 'rate_limited', wait)
+        return ticket
+
+    def _reject(self, rule: str, reason: str, retry_after: float):
+        admission_rejected(rule, reason)
+        raise AdmissionRejected(rule, reason, retry_after)
+
+    def stats(self) -> dict:
+        return {'enabled': self.enabled, 'in_flight': self.backend.in_flight(),
+                'limits': self.inflight_limits}
+
+
+def _inflight_limits_from_env() -> dict:
+    limits = {}
+    for dependency, default in DEFAULT_INFLIGHT_LIMITS.items():
+        limits[dependency] = int(os.getenv(f'ADMISSION_MAX_INFLIGHT_{dependency.upper()}', default))
+    return limits
+
+
+_controller = None
+_controller_lock = threading.Lock()
+
+
+def get_admission() -> AdmissionController:
+    """Process-wide controller configured from the environment (see module docstring)."""
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                backend = None
+                if os.getenv('ADMISSION_BACKEND', 'memory').lower() == 'sqlite':
+                    backend = SQLiteAdmissionBackend(os.getenv('ADMISSION_DB_PATH', DEFAULT_DB_PATH))
+                _controller = AdmissionController(
+                    backend=backend,
+                    capacity=float(os.getenv('ADMISSION_TOKENS', '30')),
+                    refill_per_minute=float(os.getenv('ADMISSION_REFILL_PER_MINUTE', '30')),
+                    inflight_limits=_inflight_limits_from_env(),
+                    enabled=os.getenv('ADMISSION_CONTROL', '1') != '0',
+                )
+    return _controller
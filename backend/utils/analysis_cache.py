@@ -0,0 +1,92 @@
+"""
+analysis_cache.py
+─────────────────
+Persistent cache of LLM repo analyses keyed by (owner/repo, pushed_at,
+prompt version).
+
+A repo that has not been pushed since its last analysis reuses the stored
+summary; a new push changes `pushed_at` and therefore the key, so stale
+entries are never served.  Only the newest entry per repo is kept.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_CACHE_PATH = os.path.join(_INSTANCE_DIR, 'analysis_cache.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repo_analysis (
+    repo            TEXT NOT NULL,
+    pushed_at       TEXT NOT NULL,
+    prompt_version  TEXT NOT NULL,
+    analysis        TEXT NOT NULL,
+    created_at      REAL NOT NULL,
+    PRIMARY KEY (repo, pushed_at, prompt_version)
+);
+"""
+
+
+class AnalysisCache:
+    """SQLite store of repo analyses; see module docstring for the key."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, repo: str, pushed_at: str, prompt_version: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT analysis FROM repo_analysis WHERE repo = ? AND pushed_at = ? AND prompt_version = ?',
+                (repo.lower(), pushed_at, str(prompt_version)),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def put(self, repo: str, pushed_at: str, prompt_version: str, analysis: str) -> None:
+        """Store `analysis` and drop any older entries for the same repo."""
+        repo = repo.lower()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.execute('DELETE FROM repo_analysis WHERE repo = ?', (repo,))
+                self._conn.execute(
+                    'INSERT INTO repo_analysis (repo, pushed_at, prompt_version, analysis, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (repo, pushed_at, str(prompt_version), analysis, time.time()),
+                )
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM repo_analysis').fetchone()[0]
+        return {'entries': entries, 'hits': self.hits, 'misses': self.misses}
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Process-wide cache; ANALYSIS_CACHE_PATH overrides the SQLite file."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = AnalysisCache(os.getenv('ANALYSIS_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _default_cache
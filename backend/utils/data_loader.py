@@ -0,0 +1,65 @@
+"""
+data_loader.py
+──────────────
+Process-wide cache of the JSON files under /data (question banks,
+skill_gap_benchmark.json, JobInfo.json).
+
+Routes used to re-read and re-parse these files on every request.  They
+are now parsed once per process, on first use or during warm-up.  The
+returned objects are shared between requests, so callers must treat them
+as read-only.
+
+data_version() is a content hash of the files, for cache validators
+(utils/responses.py) that must change whenever the data does.
+"""
+
+import os
+import json
+import hashlib
+import threading
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data')
+
+_cache = {}
+_versions = {}
+_lock = threading.Lock()
+
+
+def load_data(filename: str):
+    """
+    Parsed contents of data/<filename>.
+    Raises FileNotFoundError / json.JSONDecodeError like a plain json.load.
+    """
+    data = _cache.get(filename)
+    if data is None:
+        with _lock:
+            data = _cache.get(filename)
+            if data is None:
+                with open(os.path.join(DATA_DIR, filename), 'rb') as f:
+                    raw = f.read()
+                data = json.loads(raw.decode('utf-8'))
+                _versions[filename] = hashlib.sha256(raw).hexdigest()[:16]
+                _cache[filename] = data
+    return data
+
+
+def data_version(*filenames: str) -> str:
+    """Combined content hash of data files; a missing file counts as 'missing'."""
+    parts = []
+    for name in filenames:
+        if name not in _versions:
+            try:
+                load_data(name)
+            except (OSError, ValueError):
+                parts.append(f'{name}:missing')
+                continue
+        parts.append(f'{name}:{_versions[name]}')
+    return ','.join(parts)
+
+
+def preload_all() -> list[str]:
+    """Parse every JSON file in data/ and return their names."""
+    names = sorted(n for n in os.listdir(DATA_DIR) if n.endswith('.json'))
+    for name in names:
+        load_data(name)
+    return names
@@ -0,0 +1,99 @@
+"""
+doc_cache.py
+────────────
+Per-process read-through cache for small, hot Firestore documents
+(`users/{email}`, `resumes/{uid}`).
+
+Entries expire after a short TTL, so other workers' writes become visible
+within DOC_CACHE_TTL seconds; writers in this process call `invalidate()`
+to make their own changes visible immediately.  Sensitive fields such as
+`password_hash` are stripped before anything is stored, so code that needs
+them (login, change-password) must keep reading Firestore directly.
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+from utils.metrics import cache_lookup
+
+SENSITIVE_FIELDS = frozenset({'password_hash'})
+
+_MISSING = object()
+
+
+class DocumentCache:
+    """TTL + LRU cache of projected document dicts keyed by (collection, doc_id)."""
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (expires_at, data | None)
+        self._generations = {}          # key -> invalidation count
+        self._lock = threading.Lock()
+
+    def get(self, collection: str, doc_id: str, loader, fields=None) -> dict | None:
+        """
+        Return the cached document, calling `loader()` on a miss.
+        `loader` returns the raw document dict or None when it doesn't exist
+        (a missing document is cached too).  `fields` limits the returned keys.
+        """
+        key = (collection, doc_id)
+        now = time.monotonic()
+        data = _MISSING
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                data = entry[1]
+            else:
+                self.misses += 1
+                generation = self._generations.get(key, 0)
+        cache_lookup('doc', data is not _MISSING)
+
+        if data is _MISSING:
+            raw = loader()
+            data = None if raw is None else {
+                k: v for k, v in raw.items() if k not in SENSITIVE_FIELDS
+            }
+            with self._lock:
+                # Skip the store if the document was invalidated while loading
+                if self._generations.get(key, 0) == generation:
+                    self._entries[key] = (now + self.ttl, data)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+
+        if data is None:
+            return None
+        if fields is not None:
+            return {k: data[k] for k in fields if k in data}
+        return dict(data)
+
+    def invalidate(self, collection: str, doc_id: str) -> None:
+        key = (collection, doc_id)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def invalidate_many(self, keys) -> None:
+        """Invalidate (collection, doc_id) pairs, e.g. after a write-behind commit."""
+        for collection, doc_id in keys:
+            self.invalidate(collection, doc_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+doc_cache = DocumentCache(ttl=float(os.getenv('DOC_CACHE_TTL', '30')))
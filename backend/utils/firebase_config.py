@@ -1,8 +1,28 @@
-import firebase_admin
-from firebase_admin import credentials, firestore
-import os
+import threading
 
-cred = credentials.Certificate("firebase/serviceAccountKey.json")
-firebase_admin.initialize_app(cred)
+_db = None
+_lock = threading.Lock()
 
-db = firestore.client()
\ No newline at end of file
+
+def get_db():
+    """Initialise the Firebase app on first use and return the Firestore client."""
+    global _db
+    if _db is None:
+        with _lock:
+            if _db is None:
+                import firebase_admin
+                from firebase_admin import credentials, firestore
+
+                if not firebase_admin._apps:
+                    cred = credentials.Certificate("firebase/serviceAccountKey.json")
+                    firebase_admin.initialize_app(cred)
+                _db = firestore.client()
+    return _db
+
+
+def __getattr__(name):
+    # Keeps `from utils.firebase_config import db` working, without
+    # touching credentials until someone actually asks for the client.
+    if name == 'db':
+        return get_db()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
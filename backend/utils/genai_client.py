@@ -0,0 +1,173 @@
+"""
+genai_client.py
+───────────────
+Lazy access to the google-genai SDK.
+
+Importing `google.genai` pulls in pydantic models, httpx and the protobuf
+stack, which costs a noticeable slice of worker boot time.  Nothing here
+imports it until a route actually calls Gemini (or warm-up asks for it),
+and clients are reused per API key instead of being rebuilt per request.
+Each client also carries the async API (`client.aio`) used by asgi.py.
+
+Set GEMINI_BASE_URL to point every client at a local stub (load tests).
+GEMINI_MAX_CONNECTIONS (default 512) caps concurrent async calls per
+client; httpx's own default of 100 would queue the rest.
+
+Each call is routed by its operation name (utils/model_router.py): the
+model, max_output_tokens and thinking budget come from the routing table,
+and a 429 / 5xx moves the call on to a fallback model or key.  Identical
+concurrent calls (same operation, key, system instruction and contents)
+are coalesced into one request (utils/single_flight.py).  A reply cut off
+at max_output_tokens raises GeminiTruncated rather than coming back with
+`response.text` None or half a JSON document.
+"""
+
+import os
+import time
+import threading
+
+from utils.metrics import gemini_call, gemini_failover, span
+from utils.model_router import failure_reason, get_router
+from utils.single_flight import SingleFlight, fingerprint
+
+_clients = {}
+_lock = threading.Lock()
+_flights = SingleFlight('gemini')
+
+
+class GeminiTruncated(Exception):
+    """Gemini stopped at max_output_tokens before finishing its reply."""
+
+    def __init__(self, operation: str, model: str, max_output_tokens: int = None):
+        limit = f" ({max_output_tokens} tokens)" if max_output_tokens else ''
+        super().__init__(f"Gemini reply for {operation} on {model} was cut off at max_output_tokens{limit}")
+        self.operation = operation
+        self.model = model
+        self.max_output_tokens = max_output_tokens
+
+
+def genai_available() -> bool:
+    """True when google-genai can be imported (imports it on first call)."""
+    try:
+        genai_types()
+        return True
+    except ImportError:
+        return False
+
+
+def genai_types():
+    """The `google.genai.types` module."""
+    from google.genai import types
+    return types
+
+
+def get_client(api_key: str = None):
+    """
+    Shared `genai.Client` for `api_key` (default: GEMINI_API_KEY).
+    Raises ImportError when google-genai is not installed.
+    """
+    api_key = api_key or os.getenv('GEMINI_API_KEY')
+    client = _clients.get(api_key)
+    if client is None:
+        with _lock:
+            client = _clients.get(api_key)
+            if client is None:
+                import httpx
+                from google import genai
+                limits = httpx.Limits(max_connections=int(os.getenv('GEMINI_MAX_CONNECTIONS', '512')),
+                                      max_keepalive_connections=64)
+                options = genai_types().HttpOptions(
+                    base_url=os.getenv('GEMINI_BASE_URL') or None,
+                    async_client_args={'limits': limits},
+                )
+                client = genai.Client(api_key=api_key, http_options=options)
+                _clients[api_key] = client
+    return client
+
+
+def _config(system_instruction: str = None, config: dict = None):
+    """GenerateContentConfig from a system instruction plus extra fields (max_output_tokens, …)."""
+    if not system_instruction and not config:
+        return None
+    return genai_types().GenerateContentConfig(system_instruction=system_instruction, **(config or {}))
+
+
+def _flight_key(operation, contents, system_instruction, api_key, model, config) -> str:
+    return fingerprint(operation, model, api_key, system_instruction, config, contents)
+
+
+def _attempts(operation: str, api_key: str, model: str):
+    route = get_router().route(operation)
+    return route, get_router().candidates(route, api_key or os.getenv('GEMINI_API_KEY'), model)
+
+
+def _failed(operation: str, model: str, started: float, exc: Exception, last: bool) -> None:
+    """Record a failed attempt; re-raises unless another candidate should be tried."""
+    reason = failure_reason(exc)
+    gemini_call(operation, model, 'retryable' if reason else 'error', time.perf_counter() - started)
+    if reason is None or last:
+        raise exc
+    gemini_failover(operation, reason)
+
+
+def _truncated(response) -> bool:
+    candidates = getattr(response, 'candidates', None) or []
+    reason = getattr(candidates[0], 'finish_reason', None) if candidates else None
+    return getattr(reason, 'name', reason) == 'MAX_TOKENS'
+
+
+def _succeeded(operation: str, model: str, started: float, response, config: dict):
+    """Record a completed attempt; raises GeminiTruncated for a reply cut off by the output cap."""
+    truncated = _truncated(response)
+    gemini_call(operation, model, 'truncated' if truncated else 'ok', time.perf_counter() - started,
+                response.usage_metadata)
+    if truncated:
+        raise GeminiTruncated(operation, model, config.get('max_output_tokens'))
+    return response
+
+
+def generate_content(operation: str, contents, system_instruction: str = None,
+                     api_key: str = None, model: str = None, config: dict = None):
+    """
+    One Gemini call for `operation`, routed and timed (see utils/model_router.py
+    and utils/metrics.py).  `model` pins the primary model and `config` adds
+    GenerateContentConfig fields over the route's.  Returns the SDK response,
+    shared with any identical call already in flight; raises GeminiTruncated
+    when the reply hit max_output_tokens.
+    """
+    route, candidates = _attempts(operation, api_key, model)
+
+    def call():
+        for n, (model_name, key) in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                call_config = route.config(model_name, config)
+                with span('gemini', operation):
+                    response = get_client(key).models.generate_content(
+                        model=model_name, config=_config(system_instruction, call_config), contents=contents)
+            except Exception as e:
+                _failed(operation, model_name, started, e, n == len(candidates) - 1)
+                continue
+            return _succeeded(operation, model_name, started, response, call_config)
+    return _flights.do(_flight_key(operation, contents, system_instruction, candidates[0][1], model, config), call)
+
+
+async def agenerate_content(operation: str, contents, system_instruction: str = None,
+                            api_key: str = None, model: str = None, config: dict = None):
+    """generate_content() on the async client."""
+    route, candidates = _attempts(operation, api_key, model)
+
+    async def call():
+        for n, (model_name, key) in enumerate(candidates):
+            started = time.perf_counter()
+            try:
+                call_config = route.config(model_name, config)
+                with span('gemini', operation):
+                    response = await get_client(key).aio.models.generate_content(
+                        model=model_name, config=_config(system_instruction, call_config), contents=contents)
+            except Exception as e:
+                _failed(operation, model_name, started, e, n == len(candidates) - 1)
+                continue
+            return _succeeded(operation, model_name, started, response, call_config)
+    return await _flights.ado(_flight_key(operation, contents, system_instruction, candidates[0][1], model, config),
+                              call)
@@ -0,0 +1,154 @@
+"""
+http_cache.py
+─────────────
+Persistent conditional-request cache for outbound GET calls (GitHub API).
+
+Bodies are stored in SQLite together with their ETag / Last-Modified
+validators.  Callers send the validators back as If-None-Match /
+If-Modified-Since; a 304 reply is then served from the stored body.
+Total stored size is bounded and the least recently used entries are evicted.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_CACHE_PATH = os.path.join(_INSTANCE_DIR, 'http_cache.db')
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024   # 32MB
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    key            TEXT PRIMARY KEY,
+    etag           TEXT,
+    last_modified  TEXT,
+    headers        TEXT NOT NULL,
+    body           TEXT NOT NULL,
+    size           INTEGER NOT NULL,
+    stored_at      REAL NOT NULL,
+    accessed_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache (accessed_at);
+"""
+
+
+class HTTPCache:
+    """Size-bounded, LRU-evicted store of validated HTTP responses."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    # ── Lookup ────────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> dict | None:
+        """Return {etag, last_modified, headers, body} for `key`, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, headers, body FROM http_cache WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'etag':          row[0],
+            'last_modified': row[1],
+            'headers':       json.loads(row[2]),
+            'body':          row[3],
+        }
+
+    def conditional_headers(self, entry: dict | None) -> dict:
+        """Request headers that revalidate `entry` against the origin."""
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def touch(self, key: str) -> None:
+        """Record a 304 revalidation hit for `key`."""
+        with self._lock:
+            self.hits += 1
+            self._conn.execute('UPDATE http_cache SET accessed_at = ? WHERE key = ?', (time.time(), key))
+
+    # ── Store / evict ─────────────────────────────────────────────────────────
+
+    def store(self, key: str, headers: dict, body: str) -> None:
+        """Store a 200 response if it carries a validator; otherwise ignore it."""
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+            size = len(body.encode('utf-8'))
+            if size > self.max_bytes:
+                return
+            now = time.time()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO http_cache '
+                '(key, etag, last_modified, headers, body, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, json.dumps(headers), body, size, now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM http_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute('SELECT key, size FROM http_cache ORDER BY accessed_at'):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany('DELETE FROM http_cache WHERE key = ?', victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM http_cache')
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_cache'
+            ).fetchone()
+        return {'entries': entries, 'bytes': size, 'max_bytes': self.max_bytes,
+                'hits': self.hits, 'misses': self.misses}
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_http_cache() -> HTTPCache | None:
+    """
+    Process-wide cache configured from the environment:
+      HTTP_CACHE_PATH       SQLite file (default backend/instance/http_cache.db)
+      HTTP_CACHE_MAX_BYTES  size bound; 0 disables caching
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                max_bytes = int(os.getenv('HTTP_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+                if max_bytes <= 0:
+                    return None
+                _default_cache = HTTPCache(os.getenv('HTTP_CACHE_PATH', DEFAULT_CACHE_PATH), max_bytes)
+    return _default_cache
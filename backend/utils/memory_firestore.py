@@ -0,0 +1,161 @@
+"""
+memory_firestore.py
+───────────────────
+In-memory stand-in for the subset of the Firestore client API the backend
+uses: collection/document references, get/set(merge)/update/delete, simple
+equality `where(...).limit(...).get()` queries and write batches.
+
+Select it with STORAGE_BACKEND=memory to run the backend without a
+service account, or construct it directly in benchmarks and local checks.
+`latency` (seconds) is slept once per simulated round trip — document
+get/set/update/delete, query get and batch commit — outside the lock.
+"""
+
+import copy
+import time
+import threading
+
+from utils.write_behind import merge_document
+
+
+class _Snapshot:
+    def __init__(self, doc_id: str, data: dict | None):
+        self.id = doc_id
+        self._data = data
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict | None:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+
+class _DocumentReference:
+    def __init__(self, store: 'InMemoryFirestore', collection: str, doc_id: str):
+        self._store = store
+        self.collection_name = collection
+        self.id = doc_id
+
+    def get(self) -> _Snapshot:
+        self._store._round_trip()
+        with self._store._lock:
+            self._store.reads += 1
+            return _Snapshot(self.id, self._store._docs(self.collection_name).get(self.id))
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._store._round_trip()
+        with self._store._lock:
+            self._store._apply_set(self, data, merge)
+
+    def update(self, data: dict) -> None:
+        self._store._round_trip()
+        with self._store._lock:
+            docs = self._store._docs(self.collection_name)
+            if self.id not in docs:
+                raise KeyError(f"No document to update: {self.collection_name}/{self.id}")
+            self._store._apply_set(self, data, True)
+
+    def delete(self) -> None:
+        self._store._round_trip()
+        with self._store._lock:
+            self._store.writes += 1
+            self._store._docs(self.collection_name).pop(self.id, None)
+
+
+class _Query:
+    def __init__(self, store: 'InMemoryFirestore', collection: str, filters=None, limit=None):
+        self._store = store
+        self._collection = collection
+        self._filters = filters or []
+        self._limit = limit
+
+    def where(self, field: str, op: str, value) -> '_Query':
+        if op != '==':
+            raise NotImplementedError(f"InMemoryFirestore only supports '==' filters, got {op!r}")
+        return _Query(self._store, self._collection, self._filters + [(field, value)], self._limit)
+
+    def limit(self, count: int) -> '_Query':
+        return _Query(self._store, self._collection, self._filters, count)
+
+    def get(self) -> list[_Snapshot]:
+        self._store._round_trip()
+        with self._store._lock:
+            results = []
+            for doc_id, data in self._store._docs(self._collection).items():
+                if all(data.get(f) == v for f, v in self._filters):
+                    results.append(_Snapshot(doc_id, data))
+                    if self._limit is not None and len(results) >= self._limit:
+                        break
+            self._store.reads += max(1, len(results))
+            return results
+
+    stream = get
+
+
+class _CollectionReference(_Query):
+    def document(self, doc_id: str) -> _DocumentReference:
+        return _DocumentReference(self._store, self._collection, doc_id)
+
+
+class _WriteBatch:
+    def __init__(self, store: 'InMemoryFirestore'):
+        self._store = store
+        self._ops = []
+
+    def set(self, ref: _DocumentReference, data: dict, merge: bool = False) -> None:
+        self._ops.append(('set', ref, data, merge))
+
+    def update(self, ref: _DocumentReference, data: dict) -> None:
+        self._ops.append(('set', ref, data, True))
+
+    def delete(self, ref: _DocumentReference) -> None:
+        self._ops.append(('delete', ref, None, False))
+
+    def commit(self) -> None:
+        if len(self._ops) > 500:
+            raise ValueError('A write batch can contain at most 500 operations.')
+        self._store._round_trip()
+        with self._store._lock:
+            self._store.batch_commits += 1
+            for op, ref, data, merge in self._ops:
+                if op == 'set':
+                    self._store._apply_set(ref, data, merge)
+                else:
+                    self._store.writes += 1
+                    self._store._docs(ref.collection_name).pop(ref.id, None)
+        self._ops = []
+
+
+class InMemoryFirestore:
+    """Thread-safe dict-of-dicts Firestore replacement with op counters."""
+
+    def __init__(self, latency: float = 0.0):
+        self._data = {}
+        self._lock = threading.RLock()
+        self.latency = latency
+        self.reads = 0
+        self.writes = 0
+        self.batch_commits = 0
+
+    def collection(self, name: str) -> _CollectionReference:
+        return _CollectionReference(self, name)
+
+    def batch(self) -> _WriteBatch:
+        return _WriteBatch(self)
+
+    def _round_trip(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _docs(self, collection: str) -> dict:
+        return self._data.setdefault(collection, {})
+
+    def _apply_set(self, ref: _DocumentReference, data: dict, merge: bool) -> None:
+        self.writes += 1
+        docs = self._docs(ref.collection_name)
+        new = copy.deepcopy(data)
+        if merge and ref.id in docs:
+            merge_document(docs[ref.id], new)
+        else:
+            docs[ref.id] = new
@@ -0,0 +1,243 @@
+"""
+metrics.py
+──────────
+Prometheus metrics for the API, served as text by GET /api/metrics.
+
+  skillbridge_http_request_duration_seconds   histogram  route, method, status
+  skillbridge_http_requests_in_flight         gauge      route
+  skillbridge_dependency_duration_seconds     histogram  dependency, operation, outcome
+  skillbridge_dependency_in_flight            gauge      dependency
+  skillbridge_cache_lookups_total             counter    cache, result (hit | miss)
+  skillbridge_admission_rejections_total      counter    rule, reason (utils/admission.py)
+  skillbridge_single_flight_total             counter    group, outcome (utils/single_flight.py)
+  skillbridge_gemini_call_duration_seconds    histogram  operation, model, outcome (utils/model_router.py)
+  skillbridge_gemini_tokens_total             counter    operation, model, kind (prompt | output | thinking)
+  skillbridge_gemini_failovers_total          counter    operation, reason
+
+Dependencies are gemini, pymupdf, firestore and github; wrap a call in
+`with span('gemini', 'swot'):` (works around `await` too).  Cache hit rate
+is hits / (hits + misses) of skillbridge_cache_lookups_total.
+
+Multiple workers: set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+directory shared by all workers of one server (and wipe it on restart).
+Each worker then writes its samples to mmap files there and /api/metrics
+sums them across workers; in-flight gauges only count live processes.
+Call mark_process_dead(pid) from the server's worker-exit hook (gunicorn
+`child_exit`).  Without the variable, metrics are per process.
+
+prometheus_client is imported on first use.  When it is not installed,
+recording is a no-op and render() returns None.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_metrics = None
+_lock = threading.Lock()
+
+
+class _Metrics:
+    def __init__(self, prom):
+        self.prom = prom
+        self.request_seconds = prom.Histogram(
+            'skillbridge_http_request_duration_seconds', 'API request latency.',
+            ['route', 'method', 'status'], buckets=LATENCY_BUCKETS)
+        self.requests_in_flight = prom.Gauge(
+            'skillbridge_http_requests_in_flight', 'API requests being handled.',
+            ['route'], multiprocess_mode='livesum')
+        self.dependency_seconds = prom.Histogram(
+            'skillbridge_dependency_duration_seconds', 'Time spent in calls to external dependencies.',
+            ['dependency', 'operation', 'outcome'], buckets=LATENCY_BUCKETS)
+        self.dependency_in_flight = prom.Gauge(
+            'skillbridge_dependency_in_flight', 'External dependency calls in progress.',
+            ['dependency'], multiprocess_mode='livesum')
+        self.cache_lookups = prom.Counter(
+            'skillbridge_cache_lookups', 'Cache lookups by result.', ['cache', 'result'])
+        self.admission_rejections = prom.Counter(
+            'skillbridge_admission_rejections', 'Requests refused by admission control (429).',
+            ['rule', 'reason'])
+        self.single_flight = prom.Counter(
+            'skillbridge_single_flight', 'Coalesced upstream calls by outcome (leader | follower | timeout).',
+            ['group', 'outcome'])
+        self.gemini_seconds = prom.Histogram(
+            'skillbridge_gemini_call_duration_seconds', 'Gemini call attempts by routed model.',
+            ['operation', 'model', 'outcome'], buckets=LATENCY_BUCKETS)
+        self.gemini_tokens = prom.Counter(
+            'skillbridge_gemini_tokens', 'Gemini tokens by routed model.', ['operation', 'model', 'kind'])
+        self.gemini_failovers = prom.Counter(
+            'skillbridge_gemini_failovers', 'Gemini calls retried on another model or key.',
+            ['operation', 'reason'])
+
+
+def _get() -> _Metrics | None:
+    global _metrics
+    if _metrics is None:
+        with _lock:
+            if _metrics is None:
+                try:
+                    import prometheus_client
+                except ImportError:
+                    _metrics = False
+                else:
+                    _metrics = _Metrics(prometheus_client)
+    return _metrics or None
+
+
+def metrics_available() -> bool:
+    return _get() is not None
+
+
+# ─── Recording ────────────────────────────────────────────────────────────────
+
+def request_started(route: str) -> float:
+    """Mark a request in flight; returns the start time for request_finished()."""
+    m = _get()
+    if m:
+        m.requests_in_flight.labels(route).inc()
+    return time.perf_counter()
+
+
+def request_finished(route: str, method: str, status: int, started: float) -> None:
+    m = _get()
+    if m:
+        m.requests_in_flight.labels(route).dec()
+        m.request_seconds.labels(route, method, str(status)).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def span(dependency: str, operation: str):
+    """Time one call to an external dependency; outcome is ok or error."""
+    m = _get()
+    if not m:
+        yield
+        return
+    m.dependency_in_flight.labels(dependency).inc()
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        m.dependency_in_flight.labels(dependency).dec()
+        m.dependency_seconds.labels(dependency, operation, outcome).observe(time.perf_counter() - started)
+
+
+def cache_lookup(cache: str, hit: bool) -> None:
+    m = _get()
+    if m:
+        m.cache_lookups.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def admission_rejected(rule: str, reason: str) -> None:
+    m = _get()
+    if m:
+        m.admission_rejections.labels(rule, reason).inc()
+
+
+def single_flight(group: str, outcome: str) -> None:
+    m = _get()
+    if m:
+        m.single_flight.labels(group, outcome).inc()
+
+
+def gemini_call(operation: str, model: str, outcome: str, seconds: float, usage=None) -> None:
+    """One routed Gemini attempt; `usage` is the response's usage_metadata."""
+    m = _get()
+    if not m:
+        return
+    m.gemini_seconds.labels(operation, model, outcome).observe(seconds)
+    if usage is not None:
+        for kind, field in (('prompt', 'prompt_token_count'), ('output', 'candidates_token_count'),
+                            ('thinking', 'thoughts_token_count')):
+            count = getattr(usage, field, None)
+            if count:
+                m.gemini_tokens.labels(operation, model, kind).inc(count)
+
+
+def gemini_failover(operation: str, reason: str) -> None:
+    m = _get()
+    if m:
+        m.gemini_failovers.labels(operation, reason).inc()
+
+
+# ─── Exposition ───────────────────────────────────────────────────────────────
+
+def render() -> tuple[bytes, str] | None:
+    """(body, content type) in the Prometheus text format, aggregated across workers."""
+    m = _get()
+    if not m:
+        return None
+    prom = m.prom
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        registry = prom.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prom.REGISTRY
+    return prom.generate_latest(registry), prom.CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (multiprocess mode only)."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR') and _get():
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid)
+
+
+# ─── Flask ────────────────────────────────────────────────────────────────────
+
+def instrument_flask(app) -> None:
+    """Record latency and in-flight requests for every Flask route."""
+    from flask import g, request
+
+    def route_label() -> str:
+        return request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+
+    @app.before_request
+    def _metrics_start():
+        g._metrics_route = route_label()
+        g._metrics_started = request_started(g._metrics_route)
+        g._metrics_status = 500
+
+    @app.after_request
+    def _metrics_status(response):
+        g._metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def _metrics_finish(exc):
+        started = g.pop('_metrics_started', None)
+        if started is not None:
+            request_finished(g._metrics_route, request.method, g._metrics_status, started)
+
+
+# ─── ASGI ─────────────────────────────────────────────────────────────────────
+
+class ASGIMetricsMiddleware:
+    """Same request metrics for a plain ASGI app; routes are labelled by path."""
+
+    def __init__(self, app, routes: set[str]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        route = scope['path'] if scope['path'] in self.routes else '<unmatched>'
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        started = request_started(route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_finished(route, scope['method'], status, started)
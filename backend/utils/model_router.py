@@ -0,0 +1,189 @@
+"""
+model_router.py
+───────────────
+Per-task routing for Gemini calls: which model, output cap and thinking
+budget each operation gets, and where a call goes when Gemini refuses it.
+
+  operation         tier    max_output_tokens   thinking_budget
+  repo_analysis     lite    256                 0
+  profile_summary   lite    384                 0
+  resume_parse      flash   8192                0
+  swot              flash   1024                0
+  roadmap           flash   8192                1024
+  (anything else)   flash   model default       model default
+
+Tiers name models (GEMINI_MODEL_<TIER> overrides one):
+
+  lite    gemini-2.5-flash-lite     falls back to flash
+  flash   gemini-2.5-flash          falls back to lite
+  pro     gemini-2.5-pro            falls back to flash
+
+Thinking tokens count against max_output_tokens, so the short-answer tasks
+turn thinking off.  resume_parse gets room for the per-page JSON of a long
+resume; a reply that still hits its cap raises GeminiTruncated
+(utils/genai_client.py).  GEMINI_ROUTES replaces entries of the table, as inline
+JSON or the path of a JSON file:
+
+    {"repo_analysis": {"tier": "flash", "max_output_tokens": 512},
+     "roadmap":       {"model": "gemini-2.5-pro", "fallback": "flash", "thinking_budget": 2048}}
+
+Failover: a call that fails with 429, a 5xx or a connection error is
+retried straight away on the next candidate,
+
+    primary model × each key, then fallback model × each key
+
+where the keys are the caller's key followed by GEMINI_FALLBACK_API_KEYS
+(comma-separated), for at most GEMINI_MAX_ATTEMPTS attempts (default 3).
+Any other error (bad request, invalid key) is raised at once.
+
+Each attempt is recorded per operation and model in
+skillbridge_gemini_call_duration_seconds, with token usage in
+skillbridge_gemini_tokens_total and failovers in
+skillbridge_gemini_failovers_total (utils/metrics.py); tune the table
+against those.
+"""
+
+import os
+import json
+import threading
+
+MODEL_TIERS = {
+    'lite':  'gemini-2.5-flash-lite',
+    'flash': 'gemini-2.5-flash',
+    'pro':   'gemini-2.5-pro',
+}
+FALLBACK_TIERS = {'lite': 'flash', 'flash': 'lite', 'pro': 'flash'}
+
+# operation: (tier, max_output_tokens, thinking_budget); None leaves the model default
+DEFAULT_ROUTES = {
+    'repo_analysis':   ('lite',  256,  0),
+    'profile_summary': ('lite',  384,  0),
+    'resume_parse':    ('flash', 8192, 0),
+    'swot':            ('flash', 1024, 0),
+    'roadmap':         ('flash', 8192, 1024),
+    'default':         ('flash', None, None),
+}
+
+_RETRYABLE_STATUS = (408, 429)
+
+
+class Route:
+    """Models to try for one operation, best first, and the generation limits."""
+
+    def __init__(self, operation: str, model: str, fallback: str = None,
+                 max_output_tokens: int = None, thinking_budget: int = None):
+        self.operation = operation
+        self.model = model
+        self.fallback = fallback if fallback != model else None
+        self.max_output_tokens = max_output_tokens
+        self.thinking_budget = thinking_budget
+
+    def config(self, model: str, extra: dict = None) -> dict:
+        """GenerateContentConfig fields for `model`; `extra` wins over the route's."""
+        config = {}
+        if self.max_output_tokens:
+            config['max_output_tokens'] = self.max_output_tokens
+        # Pro models cannot turn thinking off; leave them their default
+        if self.thinking_budget is not None and not (self.thinking_budget == 0 and '-pro' in model):
+            config['thinking_config'] = {'thinking_budget': self.thinking_budget}
+        config.update(extra or {})
+        return config
+
+
+class ModelRouter:
+    def __init__(self, routes: dict = None, tiers: dict = None, fallback_keys: list[str] = (),
+                 max_attempts: int = 3):
+        self.tiers = {**MODEL_TIERS, **(tiers or {})}
+        self.routes = {}
+        for operation, (tier, max_tokens, thinking) in DEFAULT_ROUTES.items():
+            self.routes[operation] = Route(operation, self.tiers[tier], self.tiers[FALLBACK_TIERS[tier]],
+                                           max_tokens, thinking)
+        for operation, spec in (routes or {}).items():
+            self.routes[operation] = self._override(operation, spec)
+        self.fallback_keys = [k for k in fallback_keys if k]
+        self.max_attempts = max(1, max_attempts)
+
+    def _model(self, name: str) -> str:
+        """Tier name → model id; anything else is taken as a model id."""
+        return self.tiers.get(name, name)
+
+    def _override(self, operation: str, spec: dict) -> Route:
+        if not isinstance(spec, dict):
+            raise ValueError(f'GEMINI_ROUTES[{operation!r}] must be an object')
+        unknown = set(spec) - {'tier', 'model', 'fallback', 'max_output_tokens', 'thinking_budget'}
+        if unknown:
+            raise ValueError(f'GEMINI_ROUTES[{operation!r}]: unknown field(s) {", ".join(sorted(unknown))}')
+        base = self.routes.get(operation) or self.routes['default']
+        tier = spec.get('tier')
+        if tier is not None and tier not in self.tiers:
+            raise ValueError(f'GEMINI_ROUTES[{operation!r}]: unknown tier {tier!r}')
+
+        model = self._model(spec.get('model') or tier or '') or base.model
+        if 'fallback' in spec:
+            fallback = self._model(spec['fallback']) if spec['fallback'] else None
+        elif tier:
+            fallback = self.tiers[FALLBACK_TIERS.get(tier, 'flash')]
+        else:
+            fallback = base.fallback
+        return Route(operation, model, fallback,
+                     spec.get('max_output_tokens', base.max_output_tokens),
+                     spec.get('thinking_budget', base.thinking_budget))
+
+    def route(self, operation: str) -> Route:
+        return self.routes.get(operation) or self.routes['default']
+
+    def candidates(self, route: Route, api_key: str, model: str = None) -> list[tuple[str, str]]:
+        """(model, api key) pairs in failover order; an explicit `model` replaces the primary."""
+        keys = list(dict.fromkeys([api_key] + [k for k in self.fallback_keys if k != api_key]))
+        models = [model or route.model]
+        if route.fallback and route.fallback not in models:
+            models.append(route.fallback)
+        return [(m, k) for m in models for k in keys][:self.max_attempts]
+
+
+def failure_reason(exc: BaseException) -> str | None:
+    """'429', '503', 'connection', … when `exc` is worth retrying elsewhere, else None."""
+    code = getattr(exc, 'code', None)
+    if not isinstance(code, int):
+        code = getattr(getattr(exc, 'response', None), 'status_code', None)
+    if isinstance(code, int):
+        return str(code) if code in _RETRYABLE_STATUS or 500 <= code < 600 else None
+    try:
+        import httpx
+    except ImportError:
+        return None
+    if isinstance(exc, httpx.TimeoutException):
+        return 'timeout'
+    if isinstance(exc, httpx.TransportError):
+        return 'connection'
+    return None
+
+
+def _routes_from_env() -> dict:
+    raw = os.getenv('GEMINI_ROUTES', '').strip()
+    if not raw:
+        return {}
+    if not raw.startswith('{'):
+        with open(raw, encoding='utf-8') as f:
+            raw = f.read()
+    return json.loads(raw)
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter:
+    """Process-wide router configured from the environment (see module docstring)."""
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                tiers = {t: os.getenv(f'GEMINI_MODEL_{t.upper()}') for t in MODEL_TIERS}
+                _router = ModelRouter(
+                    routes=_routes_from_env(),
+                    tiers={t: m for t, m in tiers.items() if m},
+                    fallback_keys=[k.strip() for k in os.getenv('GEMINI_FALLBACK_API_KEYS', '').split(',')],
+                    max_attempts=int(os.getenv('GEMINI_MAX_ATTEMPTS', '3')),
+                )
+    return _router
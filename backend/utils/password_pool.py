@@ -0,0 +1,127 @@
+"""
+password_pool.py
+────────────────
+Bounded worker pool for password hashing and verification.
+
+werkzeug's scrypt / PBKDF2 hashes are deliberately slow (hundreds of ms).
+Here they run on a fixed number of threads (hashlib releases the GIL while
+hashing), with a cap on how many requests may wait.  When the pool is
+saturated callers get HashPoolSaturated immediately and the route answers
+503 + Retry-After.
+
+hash() and verify() still block the calling request thread until the
+result is ready, so a single login is no faster.  What the pool buys is a
+bound: at most `workers` hashes burn CPU at once however many logins
+arrive, so a login burst cannot starve every other endpoint of CPU, and
+excess logins are refused up front instead of piling up.  Only the
+transparent rehash after a login runs without the caller waiting.
+
+Configuration (environment):
+  PASSWORD_HASH_METHOD    werkzeug method string, e.g. "scrypt" or "pbkdf2:sha256:600000"
+  PASSWORD_HASH_WORKERS   worker threads (default: CPU count)
+  PASSWORD_HASH_QUEUE     max requests waiting for a worker (default: 4 × workers)
+"""
+
+import os
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+DEFAULT_METHOD = 'scrypt'
+
+logger = logging.getLogger(__name__)
+
+
+class HashPoolSaturated(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+    retry_after = 1
+
+
+class PasswordHasher:
+    def __init__(self, method: str = DEFAULT_METHOD, workers: int = None, max_queue: int = None):
+        self.method = method
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = self.workers * 4 if max_queue is None else max_queue
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pw-hash')
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self.rejected = 0
+        # The method/params prefix a fresh hash starts with, e.g. "scrypt:32768:8:1"
+        self._prefix = generate_password_hash('probe', method=method).split('$', 1)[0]
+
+    def _submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HashPoolSaturated()
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def hash(self, password: str, timeout: float = 30) -> str:
+        """Hash `password` with the configured method on the pool."""
+        return self._submit(generate_password_hash, password, self.method).result(timeout)
+
+    def verify(self, pw_hash: str, password: str, timeout: float = 30) -> bool:
+        """Check `password` against `pw_hash` on the pool."""
+        if not pw_hash:
+            return False
+        return self._submit(check_password_hash, pw_hash, password).result(timeout)
+
+    def needs_rehash(self, pw_hash: str) -> bool:
+        """True when `pw_hash` was made with different method or parameters."""
+        return bool(pw_hash) and pw_hash.split('$', 1)[0] != self._prefix
+
+    def rehash_async(self, password: str, on_done) -> None:
+        """
+        Compute a fresh hash in the background and pass it to `on_done(new_hash)`.
+        Skipped silently when the pool is saturated; the next login retries.
+        """
+        try:
+            future = self._submit(generate_password_hash, password, self.method)
+        except HashPoolSaturated:
+            return
+
+        def _callback(f):
+            if f.exception() is not None:
+                logger.error('[password_pool] rehash failed', exc_info=f.exception())
+                return
+            try:
+                on_done(f.result())
+            except Exception:
+                logger.exception('[password_pool] rehash save failed')
+
+        future.add_done_callback(_callback)
+
+    def stats(self) -> dict:
+        with self._lock:
+            rejected = self.rejected
+        return {'workers': self.workers, 'max_queue': self.max_queue,
+                'method': self._prefix, 'rejected': rejected}
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_hasher() -> PasswordHasher:
+    """Process-wide hasher configured from the environment."""
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                workers = os.getenv('PASSWORD_HASH_WORKERS')
+                queue = os.getenv('PASSWORD_HASH_QUEUE')
+                _hasher = PasswordHasher(
+                    method=os.getenv('PASSWORD_HASH_METHOD', DEFAULT_METHOD),
+                    workers=int(workers) if workers else None,
+                    max_queue=int(queue) if queue else None,
+                )
+    return _hasher
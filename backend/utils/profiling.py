@@ -0,0 +1,216 @@
+"""
+profiling.py
+────────────
+Opt-in, per-request statistical profiling for the Flask app.
+
+A profiled request has a sampler thread snapshot the handler thread's
+stack every PROFILE_INTERVAL_MS (default 1 ms) of wall-clock time, so time
+blocked on Gemini, GitHub or Firestore shows up next to PyMuPDF, JSON
+loading and the scoring loops.  When the request ends the samples are
+written to PROFILE_DIR (default backend/instance/profiles) as
+
+    <time>-<route>-<request id>.collapsed          flamegraph.pl / speedscope
+    <time>-<route>-<request id>.speedscope.json    https://www.speedscope.app
+
+and the response carries `X-Profile-Id: <time>-<route>-<request id>`.
+The request id is the caller's X-Request-ID header when sent.
+
+A request is profiled when either
+  • it sends `X-Profile: <PROFILE_TOKEN>` (ignored unless PROFILE_TOKEN is set), or
+  • it is picked by PROFILE_SAMPLE_RATE (0–1, default 0).
+
+With neither variable set, install_profiler() registers nothing, so the
+hook costs nothing.  Only Flask routes are covered; under asgi.py that is
+every route except the four native async ones.
+"""
+
+import os
+import re
+import sys
+import hmac
+import json
+import time
+import uuid
+import random
+import sysconfig
+import threading
+from collections import Counter
+from datetime import datetime
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_PROFILE_DIR = os.path.join(_INSTANCE_DIR, 'profiles')
+_BACKEND_DIR = os.path.dirname(_INSTANCE_DIR)
+_STDLIB_DIR = sysconfig.get_paths()['stdlib']
+
+# The sampler needs the GIL to take a sample; while any profiler runs the
+# interpreter's switch interval (5 ms by default) is shortened to match.
+_active = 0
+_saved_switch_interval = None
+_switch_lock = threading.Lock()
+
+
+def _enter_sampling(interval: float) -> None:
+    global _active, _saved_switch_interval
+    with _switch_lock:
+        if _active == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+        _active += 1
+        sys.setswitchinterval(min(sys.getswitchinterval(), interval))
+
+
+def _exit_sampling() -> None:
+    global _active
+    with _switch_lock:
+        _active -= 1
+        if _active == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+
+
+class SamplingProfiler:
+    """Samples one thread's Python stack from a background thread."""
+
+    def __init__(self, thread_id: int = None, interval: float = 0.001):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.frames = []        # (name, file, line)
+        self.samples = []       # stacks as tuples of frame indices, root first
+        self.weights = []       # seconds covered by each sample
+        self.started = None
+        self.elapsed = 0.0
+        self._frame_ids = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='request-profiler', daemon=True)
+
+    def start(self) -> 'SamplingProfiler':
+        _enter_sampling(self.interval)
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self.started
+        _exit_sampling()
+        return self
+
+    def _run(self):
+        last = self.started
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is not None:
+                self._record(frame, now - last)
+            last = now
+
+    def _frame_id(self, code) -> int:
+        key = (code.co_filename, code.co_firstlineno, code.co_name)
+        index = self._frame_ids.get(key)
+        if index is None:
+            index = self._frame_ids[key] = len(self.frames)
+            self.frames.append((code.co_name, _short_path(code.co_filename), code.co_firstlineno))
+        return index
+
+    def _record(self, frame, weight: float) -> None:
+        stack = []
+        while frame is not None:
+            stack.append(self._frame_id(frame.f_code))
+            frame = frame.f_back
+        stack.reverse()
+        self.samples.append(tuple(stack))
+        self.weights.append(weight)
+
+    # ─── Output ───────────────────────────────────────────────────────────────
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded format: `root;…;leaf <sample count>` per line."""
+        names = [f'{name} ({path}:{line})' for name, path, line in self.frames]
+        counts = Counter(self.samples)
+        return ''.join(f"{';'.join(names[i] for i in stack)} {n}\n" for stack, n in counts.most_common())
+
+    def speedscope(self, name: str) -> dict:
+        """Sampled profile in the speedscope file format, weights in milliseconds."""
+        weights = [round(w * 1000, 3) for w in self.weights]
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'skillbridge',
+            'activeProfileIndex': 0,
+            'shared': {'frames': [{'name': n, 'file': p, 'line': l} for n, p, l in self.frames]},
+            'profiles': [{
+                'type': 'sampled', 'name': name, 'unit': 'milliseconds',
+                'startValue': 0, 'endValue': round(sum(weights), 3),
+                'samples': [list(s) for s in self.samples], 'weights': weights,
+            }],
+        }
+
+    def write(self, directory: str, basename: str) -> str:
+        """Write <basename>.collapsed and <basename>.speedscope.json; returns the base path."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, basename)
+        with open(base + '.collapsed', 'w', encoding='utf-8') as f:
+            f.write(self.collapsed())
+        with open(base + '.speedscope.json', 'w', encoding='utf-8') as f:
+            json.dump(self.speedscope(basename), f)
+        return base
+
+
+def _short_path(filename: str) -> str:
+    """Paths inside backend/ relative to it; library paths from site-packages (or the stdlib) on."""
+    if filename.startswith(_BACKEND_DIR + os.sep):
+        return os.path.relpath(filename, _BACKEND_DIR)
+    marker = filename.rfind('site-packages' + os.sep)
+    if marker == -1 and filename.startswith(_STDLIB_DIR + os.sep):
+        return os.path.relpath(filename, _STDLIB_DIR)
+    return filename[marker + len('site-packages') + 1:] if marker != -1 else filename
+
+
+def _slug(text: str, limit: int = 48) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', text).strip('_')[:limit]
+
+
+# ─── Flask ────────────────────────────────────────────────────────────────────
+
+def install_profiler(app) -> bool:
+    """Register the per-request hook if PROFILE_TOKEN or PROFILE_SAMPLE_RATE is set."""
+    from flask import g, request
+
+    token = os.getenv('PROFILE_TOKEN', '')
+    sample_rate = float(os.getenv('PROFILE_SAMPLE_RATE', '0') or 0)
+    if not token and sample_rate <= 0:
+        return False
+    directory = os.getenv('PROFILE_DIR', DEFAULT_PROFILE_DIR)
+    interval = float(os.getenv('PROFILE_INTERVAL_MS', '1')) / 1000
+
+    def wanted() -> bool:
+        sent = request.headers.get('X-Profile')
+        if sent and token and hmac.compare_digest(sent.encode(), token.encode()):
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    @app.before_request
+    def _profile_start():
+        if request.method == 'OPTIONS' or not wanted():
+            return
+        rule = request.url_rule.rule if request.url_rule is not None else request.path
+        request_id = _slug(request.headers.get('X-Request-ID', ''), 36) or uuid.uuid4().hex[:12]
+        g._profile_name = f"{datetime.utcnow():%Y%m%dT%H%M%S}-{_slug(rule) or 'root'}-{request_id}"
+        g._profiler = SamplingProfiler(interval=interval).start()
+
+    @app.after_request
+    def _profile_header(response):
+        if g.get('_profiler') is not None:
+            response.headers['X-Profile-Id'] = g._profile_name
+        return response
+
+    @app.teardown_request
+    def _profile_finish(exc):
+        profiler = g.pop('_profiler', None)
+        if profiler is None:
+            return
+        try:
+            profiler.stop().write(directory, g._profile_name)
+        except OSError as e:
+            app.logger.warning('Could not write profile %s: %s', g._profile_name, e)
+
+    return True
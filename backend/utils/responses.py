@@ -0,0 +1,144 @@
+"""
+responses.py
+────────────
+Response layer for the deterministic compute routes
+(/api/skill-gap/calculate, /api/career/match).
+
+  • JSON is encoded with orjson when installed (stdlib json otherwise),
+    keys sorted like Flask's jsonify.
+  • Bodies of at least COMPRESS_MIN_BYTES (default 1024) are compressed with
+    brotli (if installed) or gzip, per the request's Accept-Encoding.
+  • A strong ETag is derived from the route, its normalised inputs and the
+    content hash of the data files it reads.  A matching If-None-Match is
+    answered with 304 before the route computes anything (these routes are
+POSTs only because they take a body; they are safe and repeatable):
+
+        etag = compute_etag('skill-gap', inputs, 'skill_gap_benchmark.json')
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        ...
+        return json_response(payload, etag=etag)
+
+Compressed representations carry the ETag with an encoding suffix
+("<hash>-br" / "<hash>-gzip"), so each encoding has its own strong
+validator; If-None-Match matches any of them.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+
+from flask import Response, request
+
+from utils.data_loader import data_version
+
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_orjson = None
+_brotli = None
+
+
+def _load_orjson():
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = False
+    return _orjson or None
+
+
+def _load_brotli():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli or None
+
+
+def dumps(obj) -> bytes:
+    """Compact UTF-8 JSON with sorted keys."""
+    orjson = _load_orjson()
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# ─── Validators ───────────────────────────────────────────────────────────────
+
+def compute_etag(route: str, inputs, *data_files: str, version: str = '1') -> str:
+    """
+    Strong ETag (unquoted) for a pure route: same route, inputs, data files
+    and `version` give the same tag.  Bump `version` when the route's output
+    format or formulas change.
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{route}\0{version}\0{data_version(*data_files)}\0'.encode())
+    digest.update(json.dumps(inputs, sort_keys=True, separators=(',', ':'), default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+def _base_tag(tag: str) -> str:
+    for suffix in ('-br', '-gzip'):
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)]
+    return tag
+
+
+def not_modified(etag: str) -> Response | None:
+    """304 response if the request's If-None-Match carries `etag`, else None."""
+    sent = request.if_none_match
+    if not sent:
+        return None
+    matched = next((t for t in sent.as_set(include_weak=True) if _base_tag(t) == etag), None)
+    if matched:
+        resp = Response(status=304)
+        # The representation the client holds (its encoding decided its tag)
+        resp.headers['ETag'] = f'"{matched}"'
+        resp.headers['Cache-Control'] = 'private, no-cache'
+        resp.headers['Vary'] = 'Accept-Encoding'
+        return resp
+    return None
+
+
+# ─── Encoding ─────────────────────────────────────────────────────────────────
+
+def _negotiate() -> str | None:
+    """'br', 'gzip' or None, from the request's Accept-Encoding."""
+    accepted = request.accept_encodings
+    if _load_brotli() and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _encoded_tag(etag: str, encoding: str | None) -> str:
+    return f'{etag}-{encoding}' if encoding else etag
+
+
+def json_response(payload, status: int = 200, etag: str = None) -> Response:
+    """JSON response, compressed when large enough and accepted; with ETag if given."""
+    body = dumps(payload)
+    encoding = _negotiate() if len(body) >= COMPRESS_MIN_BYTES else None
+    if encoding == 'br':
+        body = _load_brotli().compress(body, quality=BROTLI_QUALITY)
+    elif encoding == 'gzip':
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+    resp = Response(body, status=status, mimetype='application/json')
+    resp.headers['Vary'] = 'Accept-Encoding'
+    if encoding:
+        resp.headers['Content-Encoding'] = encoding
+    if etag:
+        resp.headers['ETag'] = f'"{_encoded_tag(etag, encoding)}"'
+        resp.headers['Cache-Control'] = 'private, no-cache'
+    return resp
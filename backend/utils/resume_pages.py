@@ -0,0 +1,104 @@
+"""
+resume_pages.py
+───────────────
+Per-user store of parsed resume pages, for incremental re-parsing of
+re-uploaded resumes (services/resume_parser.py).
+
+Each row is one page of a user's latest upload:
+
+  content_hash    fingerprint of the page's content stream and fonts; a page
+                  whose hash matches reuses the stored text without extraction
+  text_hash       fingerprint of the extracted text; a page whose text matches
+                  reuses the stored fragment without a Gemini call
+  fragment        the page's {skills, experience, projects, continues} from Gemini
+
+Matching is by hash, not page number, so inserting or reordering pages
+still reuses the untouched ones.  Rows written under another prompt
+version are ignored.  Only the newest upload per user is kept.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+_INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_STORE_PATH = os.path.join(_INSTANCE_DIR, 'resume_pages.db')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resume_pages (
+    owner           TEXT NOT NULL,
+    page            INTEGER NOT NULL,
+    content_hash    TEXT NOT NULL,
+    text_hash       TEXT NOT NULL,
+    text            TEXT NOT NULL,
+    fragment        TEXT NOT NULL,
+    prompt_version  TEXT NOT NULL,
+    updated_at      REAL NOT NULL,
+    PRIMARY KEY (owner, page)
+);
+"""
+
+
+class ResumePageStore:
+    """SQLite store of parsed resume pages; see module docstring."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, owner: str, prompt_version: str) -> list[dict]:
+        """Stored pages of `owner`'s last upload, in page order."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT page, content_hash, text_hash, text, fragment FROM resume_pages '
+                'WHERE owner = ? AND prompt_version = ? ORDER BY page',
+                (owner, str(prompt_version)),
+            ).fetchall()
+        return [{'page': page, 'content_hash': content_hash, 'text_hash': text_hash,
+                 'text': text, 'fragment': json.loads(fragment)}
+                for page, content_hash, text_hash, text, fragment in rows]
+
+    def put(self, owner: str, prompt_version: str, pages: list[dict]) -> None:
+        """Replace `owner`'s pages with `pages` (dicts with the get() keys)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.execute('DELETE FROM resume_pages WHERE owner = ?', (owner,))
+                self._conn.executemany(
+                    'INSERT INTO resume_pages (owner, page, content_hash, text_hash, text, fragment, '
+                    'prompt_version, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(owner, p['page'], p['content_hash'], p['text_hash'], p['text'],
+                      json.dumps(p['fragment'], ensure_ascii=False), str(prompt_version), now) for p in pages],
+                )
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+
+    def stats(self) -> dict:
+        with self._lock:
+            owners, pages = self._conn.execute(
+                'SELECT COUNT(DISTINCT owner), COUNT(*) FROM resume_pages').fetchone()
+        return {'owners': owners, 'pages': pages}
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_resume_page_store() -> ResumePageStore:
+    """Process-wide store; RESUME_PAGES_PATH overrides the SQLite file."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                _default_store = ResumePageStore(os.getenv('RESUME_PAGES_PATH', DEFAULT_STORE_PATH))
+    return _default_store
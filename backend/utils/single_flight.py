@@ -0,0 +1,125 @@
+"""
+single_flight.py
+────────────────
+Request coalescing for identical concurrent upstream calls.
+
+When several requests need the same expensive result at the same moment
+(a class of 40 scraping one repo, a double-submitted SWOT form), only the
+first caller — the leader — does the work; callers arriving while it runs
+wait for it and share its result or exception.  Nothing is cached: once
+the leader finishes, the next call with that key starts a new flight.
+
+    group = SingleFlight('github_repo')
+    result = group.do(fingerprint(url, api_base), lambda: scrape(url))
+
+    result = await group.ado(key, lambda: ascrape(url))   # event-loop twin
+
+A follower waits at most SINGLE_FLIGHT_TIMEOUT seconds (default 45).  If
+the leader is still running by then the follower stops waiting and makes
+its own call, so a stuck leader never strands anyone.  Followers get a
+deep copy of a dict / list result, so they may modify it freely.
+SINGLE_FLIGHT=0 turns coalescing off.
+
+Flights are per process (threads and the ASGI event loop each have their
+own table).  Outcomes are counted in skillbridge_single_flight_total.
+"""
+
+import os
+import copy
+import json
+import asyncio
+import hashlib
+import threading
+
+from utils.metrics import single_flight
+
+DEFAULT_TIMEOUT = float(os.getenv('SINGLE_FLIGHT_TIMEOUT', '45'))
+
+
+def fingerprint(*parts) -> str:
+    """Canonical key for a request: key order and whitespace don't matter."""
+    raw = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _shared(result):
+    return copy.deepcopy(result) if isinstance(result, (dict, list)) else result
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key; `name` labels the metrics."""
+
+    def __init__(self, name: str, timeout: float = None, enabled: bool = None):
+        self.name = name
+        self.timeout = DEFAULT_TIMEOUT if timeout is None else timeout
+        self.enabled = os.getenv('SINGLE_FLIGHT', '1') != '0' if enabled is None else enabled
+        self._calls = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def in_flight(self) -> int:
+        return len(self._calls) + len(self._tasks)
+
+    # ─── Threads ──────────────────────────────────────────────────────────────
+
+    def do(self, key: str, fn):
+        """fn() for the leader; followers block (up to `timeout`) and share its outcome."""
+        if not self.enabled:
+            return fn()
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                single_flight(self.name, 'timeout')
+                return fn()
+            single_flight(self.name, 'follower')
+            if call.error is not None:
+                raise call.error
+            return _shared(call.result)
+
+        single_flight(self.name, 'leader')
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    # ─── Event loop ───────────────────────────────────────────────────────────
+
+    async def ado(self, key: str, coro_fn):
+        """Async do(): coro_fn() runs once as a task; every caller awaits it (shielded)."""
+        if not self.enabled:
+            return await coro_fn()
+        task = self._tasks.get(key)
+        if task is None:
+            single_flight(self.name, 'leader')
+            # A task, so a leader whose client disconnects doesn't cancel the followers' call
+            task = self._tasks[key] = asyncio.ensure_future(coro_fn())
+            task.add_done_callback(lambda t, key=key: self._tasks.pop(key, None) if self._tasks.get(key) is t else None)
+            return await asyncio.shield(task)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            single_flight(self.name, 'timeout')
+            return await coro_fn()
+        single_flight(self.name, 'follower')
+        return _shared(result)
@@ -0,0 +1,143 @@
+"""
+warmup.py
+─────────
+Optional warm-up phase run before a worker accepts traffic.
+
+Heavy SDKs and clients are created lazily on first use, which keeps boot
+fast but makes the first few requests slow.  With WARMUP=1, run.py calls
+warm_up(app) at the end of import (i.e. before gunicorn/flask start
+serving from this worker) to pay those costs up front:
+
+  data         parse every JSON file under /data
+  pymupdf      import PyMuPDF and open a scratch document
+  genai        import google-genai and build the shared client (if GEMINI_API_KEY is set)
+  storage      build the storage backend (Firebase init for STORAGE_BACKEND=firestore)
+  database     create SQLAlchemy tables
+  skill_index  load the placement-query index from resumes and history
+  hasher       start the password-hashing pool
+
+`readiness` records the outcome for /api/health/ready.  Without warm-up
+the worker reports ready immediately and everything loads on demand.
+"""
+
+import os
+import time
+import threading
+
+
+class Readiness:
+    """Warm-up state shared by the health endpoints."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = 'lazy'        # lazy | warming | ready | failed
+        self.steps = {}
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ('lazy', 'ready')
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            report = {'state': self.state, 'ready': self.ready, 'steps': dict(self.steps)}
+            if self.started_at and self.finished_at:
+                report['warmup_ms'] = round((self.finished_at - self.started_at) * 1000, 1)
+            return report
+
+
+readiness = Readiness()
+
+
+def _warm_data(app):
+    from utils.data_loader import preload_all
+    return f"{len(preload_all())} files"
+
+
+def _warm_pymupdf(app):
+    from services.resume_parser import load_pymupdf
+    pymupdf = load_pymupdf()
+    pymupdf.open().close()
+    return pymupdf.VersionBind
+
+
+def _warm_genai(app):
+    if not os.getenv('GEMINI_API_KEY'):
+        return 'skipped (no GEMINI_API_KEY)'
+    from utils.genai_client import get_client
+    get_client()
+    return 'client ready'
+
+
+def _warm_storage(app):
+    from storage import get_storage
+    return get_storage().name
+
+
+def _warm_database(app):
+    from models import db
+    with app.app_context():
+        db.create_all()
+    return 'tables ready'
+
+
+def _warm_skill_index(app):
+    from storage import get_storage
+    from services.skill_index import skill_index
+    stats = skill_index.rebuild(get_storage(), app)
+    return f"{stats['students']} students, {stats['skills']} skills"
+
+
+def _warm_hasher(app):
+    from utils.password_pool import get_hasher
+    return f"{get_hasher().workers} workers"
+
+
+STEPS = {
+    'data':        _warm_data,
+    'pymupdf':     _warm_pymupdf,
+    'genai':       _warm_genai,
+    'storage':     _warm_storage,
+    'database':    _warm_database,
+    'skill_index': _warm_skill_index,
+    'hasher':      _warm_hasher,
+}
+
+# Failing these leaves the worker unable to serve its core routes
+REQUIRED_STEPS = ('data', 'storage', 'database')
+
+
+def warm_up(app, steps=None) -> dict:
+    """
+    Run the warm-up `steps` (default: all, or WARMUP_STEPS=comma,list) and
+    return the readiness report.  Failures are recorded, never raised.
+    """
+    if steps is None:
+        configured = os.getenv('WARMUP_STEPS', '')
+        steps = [s.strip() for s in configured.split(',') if s.strip()] or list(STEPS)
+
+    with readiness._lock:
+        readiness.state = 'warming'
+        readiness.started_at = time.perf_counter()
+        readiness.steps = {}
+
+    failed = False
+    for name in steps:
+        start = time.perf_counter()
+        try:
+            detail, ok = STEPS[name](app), True
+        except Exception as exc:
+            detail, ok = f"{type(exc).__name__}: {exc}", False
+            failed = failed or name in REQUIRED_STEPS
+        with readiness._lock:
+            readiness.steps[name] = {
+                'ok': ok,
+                'detail': str(detail),
+                'ms': round((time.perf_counter() - start) * 1000, 1),
+            }
+
+    with readiness._lock:
+        readiness.state = 'failed' if failed else 'ready'
+        readiness.finished_at = time.perf_counter()
+    return readiness.to_dict()
@@ -0,0 +1,220 @@
+"""
+write_behind.py
+───────────────
+Write-behind queue for Firestore document writes.
+
+Routes call `enqueue()` and return immediately; a background thread commits
+the pending writes in Firestore batches (max 500 operations each).  Repeated
+writes to the same document before a flush are coalesced into one operation,
+so a burst of updates to `resumes/{uid}` costs a single write.
+
+A batch that Firestore rejects outright (an invalid document fails the
+whole commit) is split in halves and retried until the bad documents are
+isolated; only those count a failed attempt and are eventually dropped.
+A transient failure (outage, timeout, contention) requeues the batch whole.
+
+Works with any client exposing the Firestore `collection().document()` /
+`batch()` API, including utils.memory_firestore.InMemoryFirestore.
+"""
+
+import atexit
+import logging
+import threading
+
+from utils.metrics import span
+
+FIRESTORE_BATCH_LIMIT = 500
+
+logger = logging.getLogger(__name__)
+
+
+def merge_document(target: dict, patch: dict) -> dict:
+    """Deep-merge `patch` into `target` in place, like Firestore set(..., merge=True)."""
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_document(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def copy_document(value):
+    """
+    Copy of a document's dicts and lists with the leaf values shared.
+    Firestore recognises transforms such as SERVER_TIMESTAMP by identity,
+    so they must reach batch.set() as the very same objects.
+    """
+    if isinstance(value, dict):
+        return {k: copy_document(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_document(v) for v in value]
+    return value
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Whether a failed commit is worth retrying as it is, rather than split up."""
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    try:
+        from google.api_core import exceptions as gexc
+    except ImportError:
+        return False
+    return isinstance(exc, (gexc.ServiceUnavailable, gexc.DeadlineExceeded, gexc.InternalServerError,
+                            gexc.TooManyRequests, gexc.ResourceExhausted, gexc.Aborted))
+
+
+class WriteBehindQueue:
+    """Coalescing, batching, background-flushed document writer."""
+
+    def __init__(self, client, flush_interval: float = 0.5,
+                 max_batch: int = FIRESTORE_BATCH_LIMIT, max_retries: int = 3):
+        self.client = client
+        self.flush_interval = flush_interval
+        self.max_batch = min(max_batch, FIRESTORE_BATCH_LIMIT)
+        self.max_retries = max_retries
+        self.stats = {'enqueued': 0, 'coalesced': 0, 'written': 0, 'batches': 0, 'failed': 0}
+
+        # (collection, doc_id) -> {'data': dict, 'merge': bool, 'attempts': int};
+        # dicts keep insertion order, so the oldest writes are flushed first.
+        self._pending = {}
+        self._commit_listeners = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='firestore-write-behind', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ── Producer API ──────────────────────────────────────────────────────────
+
+    def enqueue(self, collection: str, doc_id: str, data: dict, merge: bool = True) -> None:
+        """
+        Schedule `collection/doc_id` to be written with `data`.
+        A merge write folds into any pending write for the same document;
+        a non-merge write replaces it.
+        """
+        key = (collection, doc_id)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('Write-behind queue is closed')
+            self.stats['enqueued'] += 1
+            existing = self._pending.get(key)
+            if existing is not None:
+                self.stats['coalesced'] += 1
+                if merge:
+                    merge_document(existing['data'], copy_document(data))
+                    existing['attempts'] = 0
+                    return
+                del self._pending[key]
+            self._pending[key] = {'data': copy_document(data), 'merge': merge, 'attempts': 0}
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify()
+
+    def peek(self, collection: str, doc_id: str) -> dict | None:
+        """Pending (not yet committed) data for a document, for read-your-writes."""
+        with self._cond:
+            entry = self._pending.get((collection, doc_id))
+            return copy_document(entry['data']) if entry else None
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def add_commit_listener(self, fn) -> None:
+        """Call `fn(keys)` with the (collection, doc_id) keys of every committed batch."""
+        self._commit_listeners.append(fn)
+
+    # ── Flushing ──────────────────────────────────────────────────────────────
+
+    def flush(self) -> int:
+        """Commit everything pending now.  Returns the number of documents written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._cond:
+                    if not self._pending:
+                        break
+                    keys = list(self._pending)[:self.max_batch]
+                    chunk = [(k, self._pending.pop(k)) for k in keys]
+                committed, failures = self._commit(chunk)
+                for failed, exc in failures:
+                    self._requeue(failed, exc)
+                if committed:
+                    written += len(committed)
+                    with self._cond:
+                        self.stats['written'] += len(committed)
+                    for listener in self._commit_listeners:
+                        try:
+                            listener([key for key, _ in committed])
+                        except Exception:
+                            logger.exception('[write_behind] commit listener failed')
+                if failures:
+                    break
+        return written
+
+    def _commit(self, chunk) -> tuple[list, list]:
+        """
+        Commit `chunk` as one batch, bisecting it when Firestore rejects it.
+        Returns (committed entries, [(failed entries, exception), ...]).
+        """
+        try:
+            batch = self.client.batch()
+            for (collection, doc_id), entry in chunk:
+                ref = self.client.collection(collection).document(doc_id)
+                batch.set(ref, entry['data'], merge=entry['merge'])
+            with span('firestore', 'commit'):
+                batch.commit()
+        except Exception as exc:
+            if len(chunk) == 1 or is_transient(exc):
+                return [], [(chunk, exc)]
+            logger.warning('[write_behind] batch of %d rejected, splitting it: %s', len(chunk), exc)
+            middle = len(chunk) // 2
+            committed, failures = self._commit(chunk[:middle])
+            more_committed, more_failures = self._commit(chunk[middle:])
+            return committed + more_committed, failures + more_failures
+        with self._cond:
+            self.stats['batches'] += 1
+        return chunk, []
+
+    def _requeue(self, chunk, exc) -> None:
+        """Put failed writes back, unless a newer write superseded them."""
+        with self._cond:
+            for key, entry in chunk:
+                entry['attempts'] += 1
+                if entry['attempts'] > self.max_retries:
+                    self.stats['failed'] += 1
+                    logger.error('[write_behind] dropping write to %s/%s after %d attempts: %s',
+                                 key[0], key[1], entry['attempts'] - 1, exc)
+                    continue
+                newer = self._pending.get(key)
+                if newer is None:
+                    self._pending[key] = entry
+                elif newer['merge']:
+                    merge_document(entry['data'], newer['data'])
+                    entry['attempts'] = newer['attempts']
+                    self._pending[key] = entry
+        logger.warning('[write_behind] commit of %d document(s) failed, will retry: %s', len(chunk), exc)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if len(self._pending) < self.max_batch:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('[write_behind] flush failed')
+
+    def close(self) -> None:
+        """Stop the background thread and flush what is left (called at exit)."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+        self.flush()
@@ -396,6 +396,7 @@ function AssessmentTab({ user }) {
     const [current, setCurrent] = useState(0);
     const [answers, setAnswers] = useState({});
     const [results, setResults] = useState(null);
+    const [sessionId, setSessionId] = useState(null);
     const [error, setError] = useState('');
 
     // ── AI Anti-cheating state ──
@@ -518,27 +519,26 @@ function AssessmentTab({ user }) {
             const res = await fetch(url);
             const data = await res.json();
             if (!res.ok) { setError(data.error || 'Failed to load questions.'); setTestState('idle'); return; }
-            if (!data.length) { setError('No questions found for your profile.'); setTestState('idle'); return; }
-            setQuestions(data); setCurrent(0); setAnswers({}); setResults(null);
+            if (!data.questions?.length) { setError('No questions found for your profile.'); setTestState('idle'); return; }
+            setQuestions(data.questions); setSessionId(data.session_id);
+            setCurrent(0); setAnswers({}); setResults(null);
             setTestState('testing');
         } catch (e) { setError(`Network error: ${e.message}`); setTestState('idle'); }
     };
 
-    // ── Submit and calculate scores ───────────────────────────────────────────
+    // ── Submit for server-side grading ────────────────────────────────────────
     const submitTest = async () => {
-        // per-skill score
-        const bySkill = {};
-        questions.forEach((q, i) => {
-            const sk = q.skill;
-            if (!bySkill[sk]) bySkill[sk] = { correct: 0, total: 0 };
-            bySkill[sk].total++;
-            if (answers[i] === q.answer) bySkill[sk].correct++;
-        });
-        const scores = {};
-        for (const [sk, d] of Object.entries(bySkill))
-            scores[sk] = parseFloat((d.correct / d.total).toFixed(2));
-        const vals = Object.values(scores);
-        const total_score = parseFloat((vals.reduce((a, b) => a + b, 0) / vals.length).toFixed(2));
+        let graded;
+        try {
+            const res = await fetch('/api/mcq/submit', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ session_id: sessionId, answers }),
+            });
+            graded = await res.json();
+            if (!res.ok) { setError(graded.error || 'Failed to grade the test.'); setTestState('idle'); return; }
+        } catch (e) { setError(`Network error: ${e.message}`); setTestState('idle'); return; }
+        const { scores, total_score, review } = graded;
 
         // save to Firestore
         let savedOk = false;
@@ -550,7 +550,7 @@ function AssessmentTab({ user }) {
                 savedOk = true;
             } catch (e) { console.warn('Firestore save failed', e); }
         }
-        setResults({ scores, total_score, savedOk });
+        setResults({ scores, total_score, review, savedOk });
         setTestState('results');
     };
 
@@ -762,7 +762,7 @@ function AssessmentTab({ user }) {
 
     // ─── RESULTS ──────────────────────────────────────────────────────────────
     if (testState === 'results' && results) {
-        const { scores, total_score, savedOk } = results;
+        const { scores, total_score, review, savedOk } = results;
         const pct = Math.round(total_score * 100);
         const grade = pct >= 70 ? { label: 'Excellent', color: '#4ade80' } : pct >= 45 ? { label: 'Good', color: '#fbbf24' } : { label: 'Needs Work', color: '#f87171' };
 
@@ -770,7 +770,7 @@ function AssessmentTab({ user }) {
         const getAnswerColor = (qIdx) => {
             const ans = answers[qIdx];
             if (!ans) return 'rgba(255,255,255,0.12)'; // unanswered
-            return ans === questions[qIdx].answer ? '#4ade80' : '#f87171';
+            return review[qIdx]?.correct ? '#4ade80' : '#f87171';
         };
 
         return (
@@ -805,7 +805,7 @@ function AssessmentTab({ user }) {
                 <h3 style={{ color: '#f0ffdf', fontSize: 15, fontWeight: 600, margin: '24px 0 12px' }}>Answer Review</h3>
                 <div style={{ display: 'flex', flexWrap: 'wrap', gap: 8, marginBottom: 24 }}>
                     {questions.map((_, i) => (
-                        <div key={i} title={`Q${i + 1}: ${answers[i] ? (answers[i] === questions[i].answer ? 'Correct' : 'Wrong') : 'Unanswered'}`}
+                        <div key={i} title={`Q${i + 1}: ${answers[i] ? (review[i]?.correct ? 'Correct' : 'Wrong') : 'Unanswered'}`}
                             style={{ width: 32, height: 32, borderRadius: 8, background: getAnswerColor(i), display: 'flex', alignItems: 'center', justifyContent: 'center', fontSize: 12, fontWeight: 700, color: '#0f1a0f', cursor: 'default' }}>
                             {i + 1}
                         </div>
@@ -818,7 +818,7 @@ function AssessmentTab({ user }) {
                 </div>
 
                 {/* Retake */}
-                <button onClick={() => { setTestState('idle'); setResults(null); setAnswers({}); setCurrent(0); }}
+                <button onClick={() => { setTestState('idle'); setResults(null); setSessionId(null); setAnswers({}); setCurrent(0); }}
                     style={{ width: '100%', padding: '13px 0', borderRadius: 10, border: 'none', background: 'linear-gradient(135deg,#3b82f6,#6366f1)', color: '#fff', fontSize: 14, fontWeight: 700, cursor: 'pointer' }}>
                     Retake Assessment
                 </button>
@@ -6,30 +6,27 @@ const MCQTest = () => {
   const [selectedAnswers, setSelectedAnswers] = useState({});
   const [showResult, setShowResult] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [sessionId, setSessionId] = useState(null);
+  const [score, setScore] = useState(null);
 
-  // Fetch Questions From Flask
-  useEffect(() => {
+  // Fetch Questions From Flask (options arrive shuffled, answers stay server-side)
+  const loadQuestions = () => {
+    setLoading(true);
     fetch("http://localhost:5000/api/mcq")
       .then((res) => res.json())
       .then((data) => {
-        const shuffled = data.map((q) => ({
-          ...q,
-          options: shuffleArray(q.options),
-        }));
-        setQuestions(shuffled);
+        setQuestions(data.questions || []);
+        setSessionId(data.session_id);
         setLoading(false);
       })
       .catch((err) => {
         console.error("Error fetching MCQs:", err);
         setLoading(false);
       });
-  }, []);
-
-  // Shuffle Options
-  const shuffleArray = (array) => {
-    return [...array].sort(() => Math.random() - 0.5);
   };
 
+  useEffect(loadQuestions, []);
+
   const handleOptionClick = (option) => {
     setSelectedAnswers({
       ...selectedAnswers,
@@ -37,11 +34,25 @@ const MCQTest = () => {
     });
   };
 
+  const submitAnswers = () => {
+    fetch("http://localhost:5000/api/mcq/submit", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ session_id: sessionId, answers: selectedAnswers }),
+    })
+      .then((res) => res.json())
+      .then((graded) => {
+        setScore(graded.correct ?? 0);
+        setShowResult(true);
+      })
+      .catch((err) => console.error("Error submitting MCQs:", err));
+  };
+
   const handleNext = () => {
     if (currentIndex < questions.length - 1) {
       setCurrentIndex(currentIndex + 1);
     } else {
-      setShowResult(true);
+      submitAnswers();
     }
   };
 
@@ -58,27 +69,7 @@ const MCQTest = () => {
 
   const getOptionStyle = (option) => {
     const selected = selectedAnswers[currentIndex];
-    const correct = currentQuestion.correct_answer;
-
-    if (!showResult) {
-      return selected === option ? styles.selectedOption : styles.option;
-    }
-
-    if (option === correct) return styles.correctOption;
-    if (selected === option && option !== correct)
-      return styles.incorrectOption;
-
-    return styles.option;
-  };
-
-  const calculateScore = () => {
-    let score = 0;
-    questions.forEach((q, index) => {
-      if (selectedAnswers[index] === q.correct_answer) {
-        score++;
-      }
-    });
-    return score;
+    return selected === option ? styles.selectedOption : styles.option;
   };
 
   return (
@@ -123,7 +114,7 @@ const MCQTest = () => {
         <div style={styles.card}>
           <h2>Test Completed 🎉</h2>
           <p>
-            Your Score: {calculateScore()} / {questions.length}
+            Your Score: {score} / {questions.length}
           </p>
 
           <button
@@ -132,6 +123,8 @@ const MCQTest = () => {
               setShowResult(false);
               setCurrentIndex(0);
               setSelectedAnswers({});
+              setScore(null);
+              loadQuestions();
             }}
           >
             Retake Test